@@ -1,3 +1,15 @@
+import os
+import re
+import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+
+import numpy as np
+
+import buffers
+
+
 def generate_vigenere_table():
     """
     Генерує таблицю Віженера.
@@ -12,18 +24,149 @@ def generate_vigenere_table():
     return table
 
 
+# Максимальна кількість скомпільованих планів у LRU-кеші
+PLAN_CACHE_SIZE = 256
+
+# Послідовності неалфавітних байтів (з дужками, щоб split зберігав роздільники)
+_NON_LETTER_RUNS = re.compile(rb"([^A-Za-z]+)")
+
+
+class VigenerePlan:
+    """
+    Скомпільований план шифру Віженера для одного ключа.
+
+    Для кожної фази ключа зберігаються таблиці bytes.translate для шифрування
+    та розшифрування, тому перетворення не потребує таблиці 26x26 і посимвольних пошуків.
+    Працює з ASCII-текстом (str) або байтами.
+    """
+
+    def __init__(self, key):
+        self.key = key.upper()
+        self.key_len = len(self.key)
+        upper = string.ascii_uppercase
+        lower = string.ascii_lowercase
+        source = (upper + lower).encode("ascii")
+        self.encrypt_tables = []
+        self.decrypt_tables = []
+        for char in self.key:
+            shift = (ord(char) - 65) % 26
+            shifted = (upper[shift:] + upper[:shift] + lower[shift:] + lower[:shift]).encode("ascii")
+            self.encrypt_tables.append(bytes.maketrans(source, shifted))
+            self.decrypt_tables.append(bytes.maketrans(shifted, source))
+
+    def _apply(self, text, tables, key_index):
+        """
+        Застосовує таблиці фаз до тексту.
+
+        Літери збираються в один рядок, кожна фаза ключа (кожна key_len-та літера)
+        перетворюється одним викликом translate, після чого літери повертаються
+        на свої місця між неалфавітними фрагментами.
+
+        :param text: ASCII-рядок або байти
+        :param tables: таблиці фаз (шифрування або розшифрування)
+        :param key_index: початкова фаза ключа
+        :return: результат того ж типу, що й text
+        """
+        is_text = isinstance(text, str)
+        data = text.encode("ascii") if is_text else bytes(text)
+        parts = _NON_LETTER_RUNS.split(data)
+        letters = b"".join(parts[0::2])
+        merged = bytearray(letters)
+        key_len = self.key_len
+        for phase in range(min(key_len, len(letters))):
+            merged[phase::key_len] = letters[phase::key_len].translate(tables[(phase + key_index) % key_len])
+
+        position = 0
+        for i in range(0, len(parts), 2):
+            length = len(parts[i])
+            parts[i] = merged[position:position + length]
+            position += length
+        result = b"".join(parts)
+        return result.decode("ascii") if is_text else result
+
+    def encrypt(self, plain_text, key_index=0):
+        """
+        Шифрує текст за скомпільованим планом.
+
+        :param plain_text: ASCII-рядок або байти
+        :param key_index: початкова фаза ключа
+        :return: зашифрований текст того ж типу
+        """
+        return self._apply(plain_text, self.encrypt_tables, key_index)
+
+    def decrypt(self, cipher_text, key_index=0):
+        """
+        Розшифровує текст за скомпільованим планом.
+
+        :param cipher_text: ASCII-рядок або байти
+        :param key_index: початкова фаза ключа
+        :return: розшифрований текст того ж типу
+        """
+        return self._apply(cipher_text, self.decrypt_tables, key_index)
+
+
+def _compile_vigenere_plan(key):
+    """
+    Створює план шифру Віженера для ключа (без кешування).
+
+    :param key: ключ шифрування
+    :return: об'єкт VigenerePlan
+    """
+    return VigenerePlan(key)
+
+
+compile_vigenere_plan = lru_cache(maxsize=PLAN_CACHE_SIZE)(_compile_vigenere_plan)
+
+
+def configure_plan_cache(maxsize):
+    """
+    Змінює розмір LRU-кешу планів (вміст кешу та статистика скидаються).
+
+    :param maxsize: максимальна кількість планів у кеші (None — без обмеження)
+    """
+    global compile_vigenere_plan
+    compile_vigenere_plan = lru_cache(maxsize=maxsize)(_compile_vigenere_plan)
+
+
+def plan_cache_info():
+    """
+    Повертає статистику кешу планів.
+
+    :return: словник з ключами hits, misses, maxsize, currsize
+    """
+    return compile_vigenere_plan.cache_info()._asdict()
+
+
+def can_use_plan(text, key):
+    """
+    Перевіряє, чи дає скомпільований план той самий результат, що й таблиця Віженера.
+
+    План застосовується до ASCII-тексту з ключем з ASCII-літер; інші випадки
+    (наприклад, неанглійські літери) обробляються через таблицю.
+
+    :param text: вхідний текст
+    :param key: ключ шифрування
+    :return: True, якщо можна використати скомпільований план
+    """
+    return isinstance(text, str) and text.isascii() and key.isascii() and key.isalpha()
+
+
 def vigenere_encrypt(plain_text, key):
     """
     Шифрування тексту методом Віженера.
     
     Використовує створену таблицю Віженера. Для кожного символу у вхідному тексті, якщо символ є літерою,
     визначається рядок таблиці згідно з відповідним символом ключа, а стовпець визначається символом з plain_text.
-    При цьому зберігається регістр.
+    При цьому зберігається регістр. ASCII-текст шифрується через скомпільований план
+    з LRU-кешу (compile_vigenere_plan), що дає ідентичний результат.
     
     :param plain_text: текст для шифрування
     :param key: ключ для шифрування
     :return: зашифрований текст
     """
+    if can_use_plan(plain_text, key):
+        return compile_vigenere_plan(key).encrypt(plain_text)
+
     table = generate_vigenere_table()
     key = key.upper()
     encrypted_text = ""
@@ -56,11 +199,15 @@ def vigenere_decrypt(cipher_text, key):
     
     Для кожного символу cipher_text визначається рядок таблиці за ключем, далі знаходиться індекс цього символу в даному
     рядку таблиці, що відповідає вихідному символу (відновлюється англійська літера). Зберігається регістр.
+    ASCII-текст розшифровується через скомпільований план з LRU-кешу.
     
     :param cipher_text: зашифрований текст
     :param key: ключ, який використовувався при шифруванні
     :return: розшифрований текст
     """
+    if can_use_plan(cipher_text, key):
+        return compile_vigenere_plan(key).decrypt(cipher_text)
+
     table = generate_vigenere_table()
     key = key.upper()
     decrypted_text = ""
@@ -84,6 +231,263 @@ def vigenere_decrypt(cipher_text, key):
     return decrypted_text
 
 
+# Розмір блоку (у байтах), яким векторизований рушій обробляє масив,
+# щоб тимчасові масиви не перевищували кількох мегабайт.
+VECTOR_BLOCK_SIZE = 1 << 20
+
+
+def _key_shifts(key):
+    """
+    Перетворює ключ на масив зсувів 0..25.
+
+    Зсув обчислюється так само, як рядок таблиці у vigenere_encrypt: ord(символ) - 65,
+    з урахуванням циклічності таблиці.
+
+    :param key: ключ шифрування
+    :return: масив зсувів типу uint8
+    """
+    key = key.upper()
+    if not key:
+        raise ValueError("Ключ не може бути порожнім")
+    return np.array([(ord(char) - 65) % 26 for char in key], dtype=np.uint8)
+
+
+def vigenere_shift_array(data, key, decrypt=False, key_index=0, out=None):
+    """
+    Векторизоване шифрування/розшифрування масиву байтів методом Віженера.
+
+    Маска літер і маска регістру будуються один раз для кожного блоку, після чого
+    зсуви ключа застосовуються лише до позицій літер за допомогою арифметики масивів.
+    Неалфавітні байти та регістр зберігаються так само, як у vigenere_encrypt.
+    Обробляються лише ASCII-літери; байти поза ASCII залишаються без змін.
+
+    :param data: масив uint8 (або будь-який об'єкт з буферним протоколом)
+    :param key: ключ шифрування
+    :param decrypt: True — розшифрування, False — шифрування
+    :param key_index: кількість літер, уже оброблених цим ключем (фаза ключа)
+    :param out: необов'язковий масив uint8 для результату (може збігатися з data)
+    :return: кортеж (масив результату, нове значення key_index)
+    """
+    data = np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data
+    if out is None:
+        out = np.empty_like(data)
+    shifts = _key_shifts(key)
+    if decrypt:
+        shifts = (26 - shifts) % 26
+    key_len = len(shifts)
+
+    for start in range(0, len(data), VECTOR_BLOCK_SIZE):
+        block = data[start:start + VECTOR_BLOCK_SIZE]
+        # Маска регістру: для ASCII-літер біт 0x20 означає нижній регістр
+        case_mask = block & 0x20
+        upper = block & 0xDF
+        letters = (upper >= 65) & (upper <= 90)
+        # Фаза ключа для кожної літери: кількість літер перед нею
+        phases = np.cumsum(letters, dtype=np.int32)
+        phases += (key_index - 1) % key_len
+        phases %= key_len
+        # Арифметика в uint8: для літер (upper - 65 + зсув) не перевищує 50
+        shifted = upper - 65
+        shifted += shifts[phases]
+        shifted %= 26
+        shifted += 65
+        shifted |= case_mask
+        np.copyto(out[start:start + len(block)], np.where(letters, shifted, block))
+        key_index += int(np.count_nonzero(letters))
+
+    return out, key_index
+
+
+def _vigenere_vectorized(text, key, decrypt):
+    """
+    Обгортка над vigenere_shift_array для рядків і байтів.
+
+    :param text: рядок або об'єкт з буферним протоколом
+    :param key: ключ шифрування
+    :param decrypt: напрям перетворення
+    :return: результат того ж типу, що й вхідний текст (str або bytes)
+    """
+    if isinstance(text, str):
+        data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+        result, _ = vigenere_shift_array(data, key, decrypt)
+        return result.tobytes().decode("utf-8")
+    result, _ = vigenere_shift_array(text, key, decrypt)
+    return result.tobytes()
+
+
+def vigenere_encrypt_vectorized(plain_text, key):
+    """
+    Векторизоване шифрування методом Віженера (NumPy).
+
+    Результат побайтово збігається з vigenere_encrypt для тексту з ASCII-літерами.
+
+    :param plain_text: текст для шифрування (str або bytes)
+    :param key: ключ для шифрування
+    :return: зашифрований текст того ж типу
+    """
+    return _vigenere_vectorized(plain_text, key, decrypt=False)
+
+
+def vigenere_decrypt_vectorized(cipher_text, key):
+    """
+    Векторизоване розшифрування методом Віженера (NumPy).
+
+    Результат побайтово збігається з vigenere_decrypt для тексту з ASCII-літерами.
+
+    :param cipher_text: зашифрований текст (str або bytes)
+    :param key: ключ, який використовувався при шифруванні
+    :return: розшифрований текст того ж типу
+    """
+    return _vigenere_vectorized(cipher_text, key, decrypt=True)
+
+
+def vigenere_encrypt_buffer(data, key, out=None, key_index=0):
+    """
+    Шифрування Віженера для буфера ASCII-байтів без перетворення у str.
+
+    :param data: об'єкт з буферним протоколом (bytes, bytearray, memoryview, mmap)
+    :param key: ключ шифрування
+    :param out: буфер для результату (не менший за data, може збігатися з data) або None
+    :param key_index: початкова фаза ключа
+    :return: масив uint8 з результатом (зріз out)
+    """
+    data = buffers.as_byte_array(data)
+    result, _ = vigenere_shift_array(data, key, False, key_index, buffers.output_byte_array(out, len(data)))
+    return result
+
+
+def vigenere_decrypt_buffer(data, key, out=None, key_index=0):
+    """
+    Розшифрування Віженера для буфера ASCII-байтів (див. vigenere_encrypt_buffer).
+    """
+    data = buffers.as_byte_array(data)
+    result, _ = vigenere_shift_array(data, key, True, key_index, buffers.output_byte_array(out, len(data)))
+    return result
+
+
+def broadcast_batch(messages, keys):
+    """
+    Узгоджує списки повідомлень і ключів для пакетної обробки.
+
+    Одне повідомлення (або список з одного) з багатьма ключами повторюється для кожного
+    ключа, один ключ — для кожного повідомлення; інакше довжини списків мають збігатися.
+
+    :param messages: повідомлення (str або bytes) або їх список
+    :param keys: ключ або список ключів
+    :return: пара списків однакової довжини (повідомлення, ключі)
+    """
+    if isinstance(messages, (str, bytes, bytearray, memoryview)):
+        messages = [messages]
+    if isinstance(keys, str):
+        keys = [keys]
+    messages, keys = list(messages), list(keys)
+    if len(messages) == 1 and len(keys) > 1:
+        messages = messages * len(keys)
+    elif len(keys) == 1:
+        keys = keys * len(messages)
+    elif len(messages) != len(keys):
+        raise ValueError("Кількість повідомлень і ключів має збігатися (або одного з них — одне)")
+    return messages, keys
+
+
+def pack_messages(messages, extra_columns=0):
+    """
+    Пакує повідомлення у двовимірний масив uint8, доповнений нулями.
+
+    :param messages: список повідомлень (str кодується в UTF-8, bytes — без змін)
+    :param extra_columns: кількість додаткових нульових стовпців праворуч
+    :return: кортеж (масив (кількість, ширина), масив довжин int64, маска дійсних байтів)
+    """
+    encoded = [message.encode("utf-8") if isinstance(message, str) else bytes(message) for message in messages]
+    lengths = np.array([len(message) for message in encoded], dtype=np.int64)
+    width = (int(lengths.max()) if len(encoded) else 0) + extra_columns
+    mask = np.arange(width)[None, :] < lengths[:, None]
+    packed = np.zeros((len(encoded), width), dtype=np.uint8)
+    packed[mask] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return packed, lengths, mask
+
+
+def unpack_messages(data, lengths, like, as_buffer=False):
+    """
+    Розбиває суцільний буфер результатів на повідомлення.
+
+    :param data: байти всіх результатів підряд
+    :param lengths: довжини результатів
+    :param like: вхідні повідомлення (визначають тип результату: str або bytes)
+    :param as_buffer: True — повернути (буфер, зсуви) без розбиття
+    :return: список результатів або кортеж (bytes, масив зсувів int64 довжиною n + 1)
+    """
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if as_buffer:
+        return data, offsets
+    bounds = offsets.tolist()
+    return [
+        data[start:end].decode("utf-8") if isinstance(message, str) else data[start:end]
+        for message, start, end in zip(like, bounds, bounds[1:])
+    ]
+
+
+def vigenere_batch(messages, keys, decrypt=False, as_buffer=False):
+    """
+    Пакетне шифрування/розшифрування Віженера: багато повідомлень, багато ключів або пари.
+
+    Повідомлення пакуються в масив (кількість, ширина) з маскою довжин, ключі —
+    у матрицю зсувів з довжинами ключів. Фаза ключа для кожної літери — накопичена сума
+    маски літер уздовж рядка, тому всі повідомлення обробляються однією операцією
+    (по блоках рядків обсягом до VECTOR_BLOCK_SIZE байтів). Результат для кожної пари
+    збігається з vigenere_encrypt_vectorized / vigenere_decrypt_vectorized.
+
+    :param messages: повідомлення або список повідомлень (str або bytes)
+    :param keys: ключ або список ключів (див. broadcast_batch)
+    :param decrypt: True — розшифрування, False — шифрування
+    :param as_buffer: True — повернути один буфер і зсуви замість списку
+    :return: список результатів або кортеж (bytes, зсуви)
+    """
+    messages, keys = broadcast_batch(messages, keys)
+    packed, lengths, mask = pack_messages(messages)
+    key_shifts = [_key_shifts(key) for key in keys]
+    key_lengths = np.array([len(shifts) for shifts in key_shifts], dtype=np.int64)
+    shift_matrix = np.zeros((len(keys), int(key_lengths.max()) if len(keys) else 0), dtype=np.uint8)
+    shift_matrix[np.arange(shift_matrix.shape[1])[None, :] < key_lengths[:, None]] = np.concatenate(
+        key_shifts or [np.empty(0, dtype=np.uint8)]
+    )
+    if decrypt:
+        shift_matrix = (26 - shift_matrix) % 26
+
+    out = packed.copy()
+    step = max(1, VECTOR_BLOCK_SIZE // max(1, packed.shape[1]))
+    for start in range(0, len(packed), step):
+        block = packed[start:start + step]
+        case_mask = block & 0x20
+        upper = block & 0xDF
+        letters = (upper >= 65) & (upper <= 90) & mask[start:start + step]
+        phases = np.cumsum(letters, axis=1, dtype=np.int64)
+        phases -= 1
+        phases %= key_lengths[start:start + step, None]
+        shifted = upper - 65
+        shifted += np.take_along_axis(shift_matrix[start:start + step], phases, axis=1)
+        shifted %= 26
+        shifted += 65
+        shifted |= case_mask
+        out[start:start + step] = np.where(letters, shifted, block)
+    return unpack_messages(out[mask].tobytes(), lengths, messages, as_buffer)
+
+
+def vigenere_encrypt_batch(messages, keys, as_buffer=False):
+    """
+    Пакетне шифрування Віженера (див. vigenere_batch).
+    """
+    return vigenere_batch(messages, keys, decrypt=False, as_buffer=as_buffer)
+
+
+def vigenere_decrypt_batch(messages, keys, as_buffer=False):
+    """
+    Пакетне розшифрування Віженера (див. vigenere_batch).
+    """
+    return vigenere_batch(messages, keys, decrypt=True, as_buffer=as_buffer)
+
+
 def read_plain_text(filename):
     """
     Зчитування тексту з файлу.
@@ -117,6 +521,181 @@ def write_decrypted_text(filename, decrypted_text):
         file.write(decrypted_text)
 
 
+# Розмір фрагмента (у байтах) для потокового шифрування великих файлів
+STREAM_CHUNK_SIZE = 1 << 24
+
+
+def vigenere_stream(source, destination, key, decrypt=False, chunk_size=STREAM_CHUNK_SIZE, key_index=0):
+    """
+    Потокове шифрування/розшифрування методом Віженера.
+
+    Читає з source фрагменти фіксованого розміру, перетворює кожен на місці та записує
+    у destination перед читанням наступного. Між фрагментами переноситься індекс ключа,
+    який (як і у vigenere_encrypt) збільшується лише на літерах, тому результат
+    ідентичний обробці всього тексту за один раз. Пам'ять обмежена розміром фрагмента.
+
+    :param source: двійковий файловий об'єкт для читання (з методом readinto)
+    :param destination: двійковий файловий об'єкт для запису
+    :param key: ключ шифрування
+    :param decrypt: True — розшифрування, False — шифрування
+    :param chunk_size: розмір фрагмента в байтах
+    :param key_index: початкова фаза ключа
+    :return: фаза ключа після обробки всього потоку
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        size = source.readinto(buffer)
+        if not size:
+            break
+        chunk = np.frombuffer(buffer, dtype=np.uint8, count=size)
+        _, key_index = vigenere_shift_array(chunk, key, decrypt, key_index, out=chunk)
+        destination.write(view[:size])
+    return key_index
+
+
+def _check_distinct_files(input_filename, output_filename):
+    """
+    Перевіряє, що вихідний файл не є вхідним: відкриття виходу на запис обрізало б
+    вхід ще до того, як його прочитано.
+
+    :param input_filename: шлях до вхідного файлу
+    :param output_filename: шлях до вихідного файлу
+    """
+    if os.path.exists(output_filename) and os.path.samefile(input_filename, output_filename):
+        raise ValueError(f"Вхідний і вихідний файли збігаються: {output_filename}")
+
+
+def encrypt_file_streaming(input_filename, output_filename, key, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Потокове шифрування файлу, розмір якого може перевищувати обсяг пам'яті.
+
+    :param input_filename: шлях до файлу з відкритим текстом
+    :param output_filename: шлях до файлу для запису шифротексту
+    :param key: ключ для шифрування
+    :param chunk_size: розмір фрагмента в байтах
+    """
+    _check_distinct_files(input_filename, output_filename)
+    with open(input_filename, "rb") as source, open(output_filename, "wb") as destination:
+        vigenere_stream(source, destination, key, decrypt=False, chunk_size=chunk_size)
+
+
+def decrypt_file_streaming(input_filename, output_filename, key, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Потокове розшифрування файлу, розмір якого може перевищувати обсяг пам'яті.
+
+    :param input_filename: шлях до файлу з шифротекстом
+    :param output_filename: шлях до файлу для запису розшифрованого тексту
+    :param key: ключ, який використовувався при шифруванні
+    :param chunk_size: розмір фрагмента в байтах
+    """
+    _check_distinct_files(input_filename, output_filename)
+    with open(input_filename, "rb") as source, open(output_filename, "wb") as destination:
+        vigenere_stream(source, destination, key, decrypt=True, chunk_size=chunk_size)
+
+
+# Розмір шарда (у байтах) для паралельної обробки великих файлів
+SHARD_SIZE = 1 << 26
+
+
+def _read_chunks(filename, start, size, chunk_size):
+    """
+    Генератор фрагментів шарда файлу.
+
+    :param filename: шлях до файлу
+    :param start: зміщення початку шарда
+    :param size: розмір шарда
+    :param chunk_size: максимальний розмір фрагмента
+    :return: генератор пар (зміщення фрагмента, bytearray з даними)
+    """
+    with open(filename, "rb") as file:
+        file.seek(start)
+        end = start + size
+        position = start
+        while position < end:
+            chunk = bytearray(file.read(min(chunk_size, end - position)))
+            if not chunk:
+                break
+            yield position, chunk
+            position += len(chunk)
+
+
+def _count_shard_letters(task):
+    """
+    Перший прохід: підраховує кількість ASCII-літер у шарді.
+
+    :param task: кортеж (шлях до файлу, зміщення, розмір, розмір фрагмента)
+    :return: кількість літер у шарді
+    """
+    filename, start, size, chunk_size = task
+    count = 0
+    for _, chunk in _read_chunks(filename, start, size, chunk_size):
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        count += int(np.count_nonzero((data & 0xDF) - 65 < 26))
+    return count
+
+
+def _transform_shard(task):
+    """
+    Другий прохід: шифрує/розшифровує шард з відомої фази ключа
+    і записує результат на ту саму позицію у вихідному файлі.
+
+    :param task: кортеж (вхідний файл, вихідний файл, зміщення, розмір,
+                 розмір фрагмента, ключ, напрям, початкова фаза ключа)
+    """
+    input_filename, output_filename, start, size, chunk_size, key, decrypt, key_index = task
+    with open(output_filename, "r+b") as destination:
+        for position, chunk in _read_chunks(input_filename, start, size, chunk_size):
+            data = np.frombuffer(chunk, dtype=np.uint8)
+            _, key_index = vigenere_shift_array(data, key, decrypt, key_index, out=data)
+            destination.seek(position)
+            destination.write(chunk)
+
+
+def vigenere_file_parallel(input_filename, output_filename, key, decrypt=False, workers=None,
+                           shard_size=SHARD_SIZE, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Багатопроцесне шифрування/розшифрування файлу методом Віженера.
+
+    Фаза ключа залежить від кількості літер перед кожною позицією, тому обробка
+    виконується у два проходи: спочатку паралельно підраховуються літери в кожному шарді,
+    префіксна сума цих кількостей дає початкову фазу ключа для кожного шарда, після чого
+    шарди перетворюються у пулі процесів і записуються одразу на свої позиції у вихідному файлі.
+    Результат ідентичний послідовним функціям vigenere_encrypt / vigenere_decrypt.
+
+    :param input_filename: шлях до вхідного файлу
+    :param output_filename: шлях до вихідного файлу
+    :param key: ключ шифрування
+    :param decrypt: True — розшифрування, False — шифрування
+    :param workers: кількість процесів (за замовчуванням — кількість ядер)
+    :param shard_size: розмір шарда в байтах
+    :param chunk_size: розмір фрагмента, яким процес читає свій шард
+    """
+    _key_shifts(key)  # Перевіряємо ключ до запуску пулу
+    _check_distinct_files(input_filename, output_filename)
+    file_size = os.path.getsize(input_filename)
+    shards = [(start, min(shard_size, file_size - start)) for start in range(0, file_size, shard_size)]
+
+    # Створюємо вихідний файл потрібного розміру, щоб шарди писалися на свої позиції
+    with open(output_filename, "wb") as destination:
+        destination.truncate(file_size)
+    if not shards:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        counts = pool.map(
+            _count_shard_letters,
+            [(input_filename, start, size, chunk_size) for start, size in shards],
+        )
+        offsets = accumulate(counts, initial=0)
+        tasks = [
+            (input_filename, output_filename, start, size, chunk_size, key, decrypt, offset)
+            for (start, size), offset in zip(shards, offsets)
+        ]
+        for _ in pool.map(_transform_shard, tasks):
+            pass
+
+
 # Основний блок виконання
 if __name__ == "__main__":
     # Шляхи до файлів: початковий текст, зашифрований текст і розшифрований текст.
@@ -1,5 +1,21 @@
 from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import argparse
+import importlib
+import json
+import math
+import os
 import re
+import sys
+import time
+
+import numpy as np
+
+import ngram_fitness
+
+# Модуль 1_1.py (ім'я починається з цифри, тому імпортуємо через importlib):
+# з нього беремо скомпільовані плани шифру Віженера з LRU-кешем
+vigenere = importlib.import_module("1_1")
 
 def kasiski_examination(cipher_text):
     """
@@ -39,6 +55,69 @@ def kasiski_examination(cipher_text):
     ]
     return likely_key_lengths
 
+def text_to_letter_codes(text):
+    """
+    Перетворює текст на потік лише літер у вигляді кодів 0..25.
+
+    Регістр не враховується, пробіли, розділові знаки та символи поза ASCII відкидаються.
+
+    :param text: рядок або байти
+    :return: масив uint8 з кодами літер (A=0, ..., Z=25)
+    """
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    data = np.frombuffer(text, dtype=np.uint8)
+    codes = (data & 0xDF) - 65
+    return codes[codes < 26]
+
+
+def kasiski_ranked(cipher_text, ngram_length=3, max_key_length=40):
+    """
+    Метод Касіскі з майже лінійним часом роботи.
+
+    Працює з потоком лише літер. Кожна n-грама кодується точним хешем за основою 26,
+    повтори знаходяться стабільним сортуванням хешів (сусідні однакові хеші — це сусідні
+    появи тієї самої n-грами). Відстані між повтореннями зводяться в гістограму, а кількість
+    відстаней, кратних кожній довжині ключа від 2 до max_key_length, рахується ситом
+    за кратними (без перебору дільників кожної відстані).
+
+    :param cipher_text: зашифрований текст
+    :param ngram_length: довжина n-грам (від 2 до 13)
+    :param max_key_length: максимальна довжина ключа, що розглядається
+    :return: список пар (довжина ключа, частка відстаней, кратних їй),
+             відсортований за спаданням частки
+    """
+    if not 2 <= ngram_length <= 13:
+        raise ValueError("Довжина n-грами має бути від 2 до 13")
+    codes = text_to_letter_codes(cipher_text).astype(np.int64)
+    count = len(codes) - ngram_length + 1
+    if count < 2:
+        return []
+
+    # Точний хеш n-грами за основою 26 (26**13 < 2**63)
+    hashes = np.zeros(count, dtype=np.int64)
+    for offset in range(ngram_length):
+        hashes *= 26
+        hashes += codes[offset:offset + count]
+
+    positions = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[positions]
+    repeated = sorted_hashes[1:] == sorted_hashes[:-1]
+    distances = (positions[1:] - positions[:-1])[repeated]
+    if not len(distances):
+        return []
+
+    # Сито: для кожної довжини ключа сумуємо гістограму на кратних їй відстанях
+    histogram = np.bincount(distances)
+    total = len(distances)
+    scores = [
+        (key_length, int(histogram[key_length::key_length].sum()) / total)
+        for key_length in range(2, max_key_length + 1)
+    ]
+    scores = [item for item in scores if item[1] > 0]
+    return sorted(scores, key=lambda item: (-item[1], item[0]))
+
+
 def calculate_ic(text):
     """
     Обчислює індекс співпадань (Index of Coincidence, IC) для заданого тексту.
@@ -72,6 +151,295 @@ def friedman_test(cipher_text):
     key_length_estimate = (expected_ic_english - expected_ic_random) / (ic - expected_ic_random)
     return round(key_length_estimate)
 
+# Частоти літер англійської мови (A..Z) для критерію хі-квадрат
+ENGLISH_LETTER_FREQUENCIES = np.array([
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966,
+    0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987,
+    0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+])
+
+
+def column_histograms(codes, key_length):
+    """
+    Обчислює 26-бінні гістограми літер для кожного стовпця (позиції ключа).
+
+    :param codes: масив кодів літер 0..25 (див. text_to_letter_codes)
+    :param key_length: довжина ключа
+    :return: матриця розміром (key_length, 26) з кількостями літер
+    """
+    phases = np.arange(len(codes)) % key_length
+    return np.bincount(phases * 26 + codes, minlength=key_length * 26).reshape(key_length, 26)
+
+
+def average_column_ic(histograms):
+    """
+    Обчислює середній індекс співпадань стовпців за їхніми гістограмами.
+
+    :param histograms: матриця (кількість стовпців, 26)
+    :return: середній IC (стовпці з менш ніж двома літерами не враховуються)
+    """
+    sizes = histograms.sum(axis=1)
+    valid = sizes > 1
+    if not valid.any():
+        return 0.0
+    coincidences = (histograms * (histograms - 1)).sum(axis=1)
+    return float((coincidences[valid] / (sizes[valid] * (sizes[valid] - 1))).mean())
+
+
+def ic_sweep(cipher_text, max_key_length=40):
+    """
+    Обчислює середній IC стовпців для кожної довжини ключа від 1 до max_key_length.
+
+    Текст перетворюється на потік кодів літер один раз, після чого гістограми стовпців
+    усіх довжин ключа будуються за один прохід по тексту (див. _ic_sweep_codes).
+
+    :param cipher_text: зашифрований текст
+    :param max_key_length: максимальна довжина ключа
+    :return: масив довжиною max_key_length, де елемент i — середній IC для довжини i + 1
+    """
+    codes = text_to_letter_codes(cipher_text).astype(np.int64)
+    return _ic_sweep_codes(codes, max_key_length)
+
+
+# Скільки літер обробляти за крок _ic_sweep_codes (матриця індексів — max_key_length * крок)
+IC_SWEEP_CHUNK = 1 << 16
+
+
+def _ic_sweep_codes(codes, max_key_length):
+    """
+    Те саме, що й ic_sweep, але для вже підготовленого масиву кодів літер.
+
+    Стовпці всіх довжин пронумеровані підряд (довжина 1 — стовпець 0, довжина 2 — стовпці 1..2
+    тощо), тож кожна ділянка тексту дає гістограми всіх M * (M + 1) / 2 стовпців одним
+    викликом bincount, а середні IC для всіх довжин обчислюються без циклу за довжинами.
+
+    :param codes: масив кодів літер типу int64
+    :param max_key_length: максимальна довжина ключа
+    :return: масив середніх IC для довжин 1..max_key_length
+    """
+    lengths = np.arange(1, max_key_length + 1)
+    first_column = np.cumsum(lengths) - lengths
+    columns = int(lengths.sum())
+    counts = np.zeros(columns * 26, dtype=np.int64)
+    for start in range(0, len(codes), IC_SWEEP_CHUNK):
+        chunk = codes[start:start + IC_SWEEP_CHUNK]
+        positions = np.arange(start, start + len(chunk))
+        column = first_column[:, None] + positions[None, :] % lengths[:, None]
+        counts += np.bincount((column * 26 + chunk[None, :]).ravel(), minlength=columns * 26)
+
+    histograms = counts.reshape(columns, 26)
+    sizes = histograms.sum(axis=1)
+    valid = sizes > 1
+    pairs = np.maximum(sizes * (sizes - 1), 1)
+    column_ics = np.where(valid, (histograms * (histograms - 1)).sum(axis=1) / pairs, 0.0)
+    # Середнє по стовпцях кожної довжини (стовпці з менш ніж двома літерами не враховуються)
+    length_index = np.repeat(lengths - 1, lengths)
+    totals = np.bincount(length_index, weights=column_ics, minlength=max_key_length)
+    valid_columns = np.bincount(length_index, weights=valid, minlength=max_key_length)
+    return np.where(valid_columns > 0, totals / np.maximum(valid_columns, 1), 0.0)
+
+
+def chi_squared_key(histograms):
+    """
+    Відновлює ключ за критерієм хі-квадрат.
+
+    Для кожного стовпця перевіряються всі 26 зсувів одночасно: очікувані частоти англійської
+    мови зсуваються матрицею індексів, і для кожного зсуву обчислюється статистика хі-квадрат.
+    Обирається зсув з найменшим значенням.
+
+    :param histograms: матриця гістограм стовпців (довжина ключа, 26)
+    :return: пара (ключ, масив мінімальних значень хі-квадрат для кожного стовпця)
+    """
+    letters = np.arange(26)
+    # expected[s, c] — частота відкритої літери (c - s) для шифролітери c при зсуві s
+    expected = ENGLISH_LETTER_FREQUENCIES[(letters[None, :] - letters[:, None]) % 26]
+    sizes = np.maximum(histograms.sum(axis=1), 1)
+    expected_counts = sizes[:, None, None] * expected[None, :, :]
+    chi_squared = ((histograms[:, None, :] - expected_counts) ** 2 / expected_counts).sum(axis=2)
+    shifts = chi_squared.argmin(axis=1)
+    key = "".join(chr(65 + shift) for shift in shifts)
+    return key, chi_squared.min(axis=1)
+
+
+# Частка перевищення IC над випадковим текстом, яку має зберегти дільник довжини,
+# щоб кратна довжина звелася до нього (кратні періоду мають такий самий IC, як і період)
+IC_FOLD_TOLERANCE = 0.9
+
+
+def fold_key_length(ics, key_length):
+    """
+    Зводить довжину ключа до найменшого дільника з майже таким самим IC стовпців.
+
+    :param ics: масив середніх IC для довжин 1..N (див. ic_sweep)
+    :param key_length: довжина ключа
+    :return: найменший дільник key_length, IC якого перевищує IC випадкового тексту
+        щонайменше на IC_FOLD_TOLERANCE від перевищення для key_length
+    """
+    expected_ic_random = 1 / 26
+    required = expected_ic_random + IC_FOLD_TOLERANCE * (ics[key_length - 1] - expected_ic_random)
+    for divisor in range(1, key_length):
+        if key_length % divisor == 0 and ics[divisor - 1] >= required:
+            return divisor
+    return key_length
+
+
+def minimal_period(key):
+    """
+    Найкоротший період ключа: ключ "ABCABC" еквівалентний ключу "ABC".
+
+    :param key: ключ
+    :return: найкоротший ключ, повторення якого дає key
+    """
+    for length in range(1, len(key)):
+        if len(key) % length == 0 and key[:length] * (len(key) // length) == key:
+            return key[:length]
+    return key
+
+
+def analyze_vigenere(cipher_text, max_key_length=40, top=3):
+    """
+    Аналіз шифротексту: IC для всіх довжин ключа та відновлення ключа хі-квадратом.
+
+    Довжини ранжуються за середнім IC стовпців, але кратна довжина зводиться до дільника
+    з майже таким самим IC (fold_key_length), а відновлений ключ — до найкоротшого періоду
+    (minimal_period), тому результат містить період ключа, а не його повторення.
+
+    :param cipher_text: зашифрований текст
+    :param max_key_length: максимальна довжина ключа
+    :param top: кількість найкращих довжин, для яких відновлюється ключ
+    :return: список кортежів (довжина ключа, середній IC, ключ) різних довжин,
+        відсортований за спаданням IC
+    """
+    codes = text_to_letter_codes(cipher_text).astype(np.int64)
+    max_key_length = max(1, min(max_key_length, len(codes) // 2))
+    ics = _ic_sweep_codes(codes, max_key_length)
+    results = {}
+    for key_length in sorted(range(1, max_key_length + 1), key=lambda length: -ics[length - 1]):
+        key_length = fold_key_length(ics, key_length)
+        if key_length in results:
+            continue
+        key = minimal_period(chi_squared_key(column_histograms(codes, key_length))[0])
+        results.setdefault(len(key), (len(key), float(ics[len(key) - 1]), key))
+        if len(results) == top:
+            break
+    return list(results.values())
+
+
+class IncrementalKeyLengthAnalyzer:
+    """
+    Потокова оцінка довжини ключа, що оновлюється з кожним фрагментом шифротексту.
+
+    Для кожної довжини ключа від 1 до max_key_length зберігаються поточні кількості літер
+    у кожному стовпці, тому текст не потрібно тримати в пам'яті чи перераховувати.
+    Фрагменти подаються методом feed(), поточна оцінка доступна будь-коли через estimate().
+    """
+
+    def __init__(self, max_key_length=40, min_letters=200, patience=3):
+        """
+        :param max_key_length: максимальна довжина ключа
+        :param min_letters: мінімальна кількість літер, після якої оцінка може вважатися стабільною
+        :param patience: скільки поспіль викликів feed() найкраща довжина має не змінюватися
+        """
+        self.max_key_length = max_key_length
+        self.min_letters = min_letters
+        self.patience = patience
+        # counts[length - 1] — гістограми стовпців для довжини length (зайві рядки нульові)
+        self.counts = np.zeros((max_key_length, max_key_length, 26), dtype=np.int64)
+        self.letters = 0
+        self._best = None
+        self._unchanged = 0
+
+    def feed(self, chunk):
+        """
+        Додає фрагмент шифротексту до статистики.
+
+        :param chunk: рядок або байти
+        :return: поточна оцінка (див. estimate)
+        """
+        codes = text_to_letter_codes(chunk).astype(np.int64)
+        if len(codes):
+            positions = np.arange(self.letters, self.letters + len(codes))
+            for key_length in range(1, self.max_key_length + 1):
+                phases = positions % key_length
+                self.counts[key_length - 1, :key_length] += np.bincount(
+                    phases * 26 + codes, minlength=key_length * 26
+                ).reshape(key_length, 26)
+            self.letters += len(codes)
+
+        ranking = self.estimate()
+        best = ranking[0][0] if ranking else None
+        self._unchanged = self._unchanged + 1 if best == self._best else 0
+        self._best = best
+        return ranking
+
+    def column_ics(self):
+        """
+        :return: масив середніх IC стовпців для довжин 1..max_key_length
+        """
+        return np.array([
+            average_column_ic(self.counts[key_length - 1, :key_length])
+            for key_length in range(1, self.max_key_length + 1)
+        ])
+
+    def estimate(self, top=5):
+        """
+        Поточна ранжована оцінка довжини ключа.
+
+        Серед довжин, IC яких схожий на англійський текст, найкращою вважається найменша
+        (кратні справжньої довжини мають такий самий IC). Впевненість — частка, на яку IC
+        найкращої довжини перевищує IC випадкового тексту, відносно англійського.
+
+        :param top: кількість довжин у результаті
+        :return: список пар (довжина ключа, впевненість 0..1), від найкращої
+        """
+        if self.letters < 2:
+            return []
+        ics = self.column_ics()
+        expected_ic_random = 1 / 26
+        expected_ic_english = 0.068
+        confidence = np.clip(
+            (ics - expected_ic_random) / (expected_ic_english - expected_ic_random), 0.0, 1.0
+        )
+        english_like = [length for length in range(1, self.max_key_length + 1)
+                        if ics[length - 1] >= ENGLISH_IC_THRESHOLD]
+        ranked = sorted(range(1, self.max_key_length + 1), key=lambda length: -ics[length - 1])
+        if english_like:
+            best = english_like[0]
+            ranked.remove(best)
+            ranked.insert(0, best)
+        return [(length, float(confidence[length - 1])) for length in ranked[:top]]
+
+    def is_stable(self):
+        """
+        Чи можна зупинити читання: літер достатньо, і найкраща довжина
+        не змінювалася протягом patience викликів feed().
+
+        :return: True, якщо оцінка стабільна
+        """
+        return self.letters >= self.min_letters and self._unchanged >= self.patience
+
+
+def estimate_key_length_stream(source, chunk_size=4096, max_key_length=40):
+    """
+    Оцінює довжину ключа з потоку, зупиняючи читання, щойно оцінка стабілізується.
+
+    :param source: текстовий або двійковий файловий об'єкт
+    :param chunk_size: розмір фрагмента для читання
+    :param max_key_length: максимальна довжина ключа
+    :return: пара (ранжована оцінка, кількість прочитаних літер)
+    """
+    analyzer = IncrementalKeyLengthAnalyzer(max_key_length)
+    ranking = []
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        ranking = analyzer.feed(chunk)
+        if analyzer.is_stable():
+            break
+    return ranking, analyzer.letters
+
+
 def split_text_by_key_length(text, key_length):
     """
     Розбиває текст на блоки, де кожен блок містить символи, що відповідають певній позиції в ключі.
@@ -96,25 +464,105 @@ def get_most_frequent_letter(text):
     most_common_letter, _ = frequency.most_common(1)[0]
     return most_common_letter
 
-def find_key(cipher_text, key_length):
+# Скільки перших літер шифротексту розшифровувати при квадграмній оцінці кандидатів-ключів
+# і максимальна кількість проходів уточнення ключа в find_key
+FITNESS_SAMPLE_LETTERS = 2000
+FIND_KEY_PASSES = 4
+
+
+def decrypt_letter_codes(codes, shifts):
+    """
+    Розшифровує потік кодів літер одразу для багатьох ключів однакової довжини.
+
+    Результат збігається з літерами vigenere_decrypt (ключ зсувається лише на літерах).
+
+    :param codes: масив кодів літер 0..25
+    :param shifts: матриця (кількість ключів, довжина ключа) зсувів 0..25
+    :return: матриця (кількість ключів, len(codes)) кодів відкритого тексту
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    shifts = np.asarray(shifts, dtype=np.int64)
+    phases = np.arange(len(codes)) % shifts.shape[1]
+    return (codes[None, :] - shifts[:, phases]) % 26
+
+
+def rank_keys(cipher_text, keys, table=None):
+    """
+    Впорядковує кандидатів-ключів за тим, наскільки розшифрування схоже на англійський текст.
+
+    Ключі групуються за довжиною, і кожна група оцінюється одним пакетним викликом
+    ngram_fitness.score_batch над першими FITNESS_SAMPLE_LETTERS літерами.
+
+    :param cipher_text: зашифрований текст
+    :param keys: список ключів (рядки з літер)
+    :param table: таблиця квадграм (за замовчуванням — ngram_fitness.load_quadgram_table())
+    :return: список пар (ключ, оцінка), відсортований за спаданням оцінки
+    """
+    if table is None:
+        table = ngram_fitness.load_quadgram_table()
+    codes = text_to_letter_codes(cipher_text)[:FITNESS_SAMPLE_LETTERS]
+    groups = {}
+    for key in keys:
+        groups.setdefault(len(key), []).append(key)
+    ranked = []
+    for group in groups.values():
+        shifts = [[ord(letter) - 65 for letter in key.upper()] for key in group]
+        scores = ngram_fitness.score_batch(decrypt_letter_codes(codes, shifts), table)
+        ranked.extend(zip(group, scores.tolist()))
+    return sorted(ranked, key=lambda item: -item[1])
+
+
+def find_key(cipher_text, key_length, table=None):
     """
     Визначає ключ для розшифрування тексту методом Vigenère.
     
-    Текст розбивається на блоки за позиціями символів ключа, і для кожного блоку визначається 
-    найчастіше зустрічаючася літера. Припускаючи, що ця літера відповідає "E" у відкритому тексті,
-    обчислюється зсув, і на його основі формується ключ.
+    Потік усіх літер розбивається на стовпці за позиціями ключа, і для кожного стовпця
+    визначається найчастіша літера. Припускаючи, що ця літера відповідає "E" у відкритому тексті,
+    обчислюється початковий ключ. Далі ключ уточнюється за квадграмною оцінкою перших
+    FITNESS_SAMPLE_LETTERS літер: для кожної позиції перевіряються всі 26 літер (усі
+    key_length * 26 кандидатів оцінюються одним пакетом), і ключ змінюється, поки
+    розшифрування стає більш схожим на англійський текст.
     
     :param cipher_text: зашифрований текст
     :param key_length: припущена довжина ключа
+    :param table: таблиця квадграм (за замовчуванням — ngram_fitness.load_quadgram_table())
     :return: знайдений ключ (рядок)
     """
-    cipher_text_split = split_text_by_key_length(cipher_text, key_length)
-    key = ""
-    for part in cipher_text_split:
-        most_common_letter = get_most_frequent_letter(part)
-        shift = (ord(most_common_letter) - ord("E")) % 26
-        key += chr(65 + shift)
-    return key
+    if table is None:
+        table = ngram_fitness.load_quadgram_table()
+    codes = text_to_letter_codes(cipher_text).astype(np.int64)
+    shifts = (column_histograms(codes, key_length).argmax(axis=1) - (ord("E") - 65)) % 26
+    shifts, _ = refine_key(codes[:FITNESS_SAMPLE_LETTERS], shifts, table)
+    return "".join(chr(65 + shift) for shift in shifts)
+
+
+def refine_key(codes, shifts, table):
+    """
+    Уточнює ключ за квадграмною оцінкою: на кожному проході для кожної позиції ключа
+    перевіряються всі 26 літер (key_length * 26 кандидатів — один пакет score_batch),
+    і ключ замінюється найкращим, поки оцінка зростає.
+
+    :param codes: масив кодів літер шифротексту (зазвичай перші FITNESS_SAMPLE_LETTERS)
+    :param shifts: початковий ключ як масив зсувів 0..25
+    :param table: таблиця квадграм
+    :return: пара (масив зсувів, оцінка розшифрування)
+    """
+    shifts = np.asarray(shifts, dtype=np.int64)
+    key_length = len(shifts)
+    score = ngram_fitness.score_batch(decrypt_letter_codes(codes, shifts[None, :]), table)[0]
+
+    positions = np.repeat(np.arange(key_length), 26)
+    letters = np.tile(np.arange(26), key_length)
+    for _ in range(FIND_KEY_PASSES):
+        candidates = np.repeat(shifts[None, :], key_length * 26, axis=0)
+        candidates[np.arange(key_length * 26), positions] = letters
+        scores = ngram_fitness.score_batch(decrypt_letter_codes(codes, candidates), table)
+        improved = scores.reshape(key_length, 26).argmax(axis=1)
+        improved_score = ngram_fitness.score_batch(decrypt_letter_codes(codes, improved[None, :]), table)[0]
+        if improved_score <= score:
+            break
+        shifts, score = improved, improved_score
+    return shifts, float(score)
 
 def generate_vigenere_table():
     """
@@ -136,6 +584,10 @@ def vigenere_decrypt(cipher_text, key):
     :param key: ключ для розшифрування
     :return: розшифрований текст
     """
+    # ASCII-текст розшифровуємо через кешований план з 1_1.py (результат ідентичний)
+    if vigenere.can_use_plan(cipher_text, key):
+        return vigenere.compile_vigenere_plan(key).decrypt(cipher_text)
+
     table = generate_vigenere_table()
     key = key.upper()
     decrypted_text = ""
@@ -156,6 +608,19 @@ def vigenere_decrypt(cipher_text, key):
 
     return decrypted_text
 
+def vigenere_decrypt_buffer(cipher_data, key, out=None):
+    """
+    Розшифровує буфер ASCII-байтів (bytes, bytearray, memoryview, mmap) без перетворення у str.
+
+    Результат збігається з vigenere_decrypt для ASCII-тексту.
+
+    :param cipher_data: зашифровані дані
+    :param key: ключ для розшифрування
+    :param out: буфер для результату або None
+    :return: масив uint8 з розшифрованими даними
+    """
+    return vigenere.vigenere_decrypt_buffer(cipher_data, key, out)
+
 def read_cipher_text(filename):
     """
     Зчитує зашифрований текст із файлу.
@@ -166,7 +631,274 @@ def read_cipher_text(filename):
     with open(filename, "r") as file:
         return file.read()
 
+# Мінімальний середній IC стовпців, за якого довжина ключа вважається правильною
+# (між IC випадкового тексту ~0.038 та англійського ~0.066)
+ENGLISH_IC_THRESHOLD = 0.06
+
+
+def break_vigenere(cipher_text, max_key_length=40):
+    """
+    Повний конвеєр злому шифру Віженера: Касіскі, Фрідман, відновлення ключа.
+
+    Аналіз виконується над потоком лише літер. З кандидатів Касіскі (у порядку їхньої оцінки)
+    обирається перша довжина, для якої середній IC стовпців схожий на англійський текст;
+    якщо такої немає, використовується оцінка Фрідмана. Ключ відновлюється за критерієм
+    хі-квадрат (chi_squared_key), який на коротких повідомленнях надійніший за припущення
+    find_key, що найчастіша літера стовпця — це "E".
+
+    :param cipher_text: зашифрований текст
+    :param max_key_length: максимальна довжина ключа
+    :return: словник з ключем, довжиною ключа, кандидатами Касіскі та оцінкою Фрідмана
+    """
+    codes = text_to_letter_codes(cipher_text)
+    letters = (codes + 65).tobytes().decode("ascii")
+    if len(letters) < 2:
+        raise ValueError("Шифротекст не містить достатньо літер для аналізу")
+
+    kasiski_candidates = kasiski_ranked(letters, max_key_length=max_key_length)
+    estimated_key_length = max(1, friedman_test(letters))
+
+    key_length = estimated_key_length
+    int_codes = codes.astype(np.int64)
+    for candidate, _ in kasiski_candidates:
+        if average_column_ic(column_histograms(int_codes, candidate)) >= ENGLISH_IC_THRESHOLD:
+            key_length = candidate
+            break
+
+    return {
+        "key": chi_squared_key(column_histograms(int_codes, key_length))[0],
+        "key_length": key_length,
+        "kasiski": [length for length, _ in kasiski_candidates[:10]],
+        "friedman": estimated_key_length,
+    }
+
+
+# Скільки кандидатів Касіскі перевіряти і найбільший НСК довжин, для якого
+# гістограми всіх стовпців ще рахуються однією спільною матрицею
+VERIFY_TOP = 5
+SHARED_COUNTS_LIMIT = 4096
+
+# Стан процесу перевірки: таблиця квадграм
+_verify_table = None
+
+
+def _init_verify(table):
+    """
+    Ініціалізатор робочого процесу перевірки довжин ключа.
+
+    :param table: посилання на таблицю квадграм (ngram_fitness.table_reference)
+    """
+    global _verify_table
+    _verify_table = ngram_fitness.resolve_table(table)
+
+
+def shared_column_histograms(codes, key_lengths, limit=SHARED_COUNTS_LIMIT):
+    """
+    Гістограми стовпців для кількох довжин ключа з мінімальної кількості проходів по тексту.
+
+    Довжини об'єднуються в групи, для кожної групи один раз рахується матриця для НСК
+    довжин групи (не більшого за limit). Гістограма для довжини L виводиться з матриці
+    для кратної їй довжини M підсумовуванням стовпців j з однаковим j % L.
+
+    :param codes: масив кодів літер типу int64
+    :param key_lengths: довжини ключа
+    :param limit: максимальний НСК групи
+    :return: словник довжина -> матриця (довжина, 26)
+    """
+    bases = []
+    for key_length in sorted(set(key_lengths), reverse=True):
+        for index, base in enumerate(bases):
+            combined = math.lcm(base, key_length)
+            if combined <= limit:
+                bases[index] = combined
+                break
+        else:
+            bases.append(key_length)
+
+    histograms = {}
+    for base in bases:
+        counts = column_histograms(codes, base)
+        for key_length in key_lengths:
+            if base % key_length == 0:
+                histograms[key_length] = counts.reshape(base // key_length, key_length, 26).sum(axis=0)
+    return histograms
+
+
+def _verify_length(task):
+    """
+    Відновлює й оцінює ключ однієї довжини: хі-квадрат як початок, далі refine_key.
+
+    :param task: пара (коди літер, гістограма стовпців)
+    :return: трійка (довжина, ключ, оцінка)
+    """
+    codes, histograms = task
+    key, _ = chi_squared_key(histograms)
+    shifts, score = refine_key(codes, [ord(letter) - 65 for letter in key], _verify_table)
+    return len(shifts), "".join(chr(65 + shift) for shift in shifts), score
+
+
+def verify_key_lengths(cipher_text, top=VERIFY_TOP, max_key_length=40, workers=None, table=None):
+    """
+    Перевірка кількох кандидатів довжини ключа замість першого кандидата Касіскі.
+
+    Кандидати — top найкращих довжин Касіскі та оцінка Фрідмана. Гістограми стовпців для
+    всіх кандидатів виводяться зі спільних матриць (shared_column_histograms), ключі
+    відновлюються й оцінюються квадграмною оцінкою паралельно в пулі процесів
+    (workers=1 — без пулу). Кратна довжина дає той самий ключ, повторений кілька разів,
+    тому ключі зводяться до найкоротшого періоду, і збіглі кандидати об'єднуються —
+    справжній період не поступається своїм кратним.
+
+    :param cipher_text: зашифрований текст
+    :param top: кількість кандидатів Касіскі
+    :param max_key_length: максимальна довжина ключа
+    :param workers: кількість процесів
+    :param table: таблиця квадграм (за замовчуванням — ngram_fitness.load_quadgram_table())
+    :return: список трійок (довжина, ключ, оцінка), відсортований за спаданням оцінки
+    """
+    if table is None:
+        table = ngram_fitness.load_quadgram_table()
+    codes = text_to_letter_codes(cipher_text).astype(np.int64)
+    if len(codes) < 2:
+        raise ValueError("Шифротекст не містить достатньо літер для аналізу")
+    letters = (codes + 65).astype(np.uint8).tobytes().decode("ascii")
+    candidates = [length for length, _ in kasiski_ranked(letters, max_key_length=max_key_length)[:top]]
+    candidates.append(min(max(1, friedman_test(letters)), max_key_length))
+    candidates = list(dict.fromkeys(candidates))
+
+    histograms = shared_column_histograms(codes, candidates)
+    sample = codes[:FITNESS_SAMPLE_LETTERS]
+    tasks = [(sample, histograms[length]) for length in candidates]
+    if workers == 1:
+        _init_verify(table)
+        results = [_verify_length(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_verify,
+                                 initargs=(ngram_fitness.table_reference(table),)) as pool:
+            results = list(pool.map(_verify_length, tasks))
+
+    folded = {}
+    for _, key, score in results:
+        key = minimal_period(key)
+        if key not in folded or score > folded[key]:
+            folded[key] = score
+    ranked = [(len(key), key, score) for key, score in folded.items()]
+    return sorted(ranked, key=lambda item: (-item[2], item[0]))
+
+
+def iter_batch_messages(source):
+    """
+    Генератор повідомлень для пакетного аналізу.
+
+    Джерелом може бути каталог (кожен файл — окреме повідомлення, ідентифікатор — ім'я файлу)
+    або файл JSON Lines, де кожен рядок — об'єкт з полями "text" та необов'язковим "id".
+    Замість некоректного рядка JSON Lines видається готовий запис про помилку
+    (словник з полями "id", "line" та "error"), і читання триває з наступного рядка.
+
+    :param source: шлях до каталогу або файлу .jsonl
+    :return: генератор пар (ідентифікатор, шифротекст) або словників з помилкою
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path):
+                yield name, read_cipher_text(path)
+        return
+
+    with open(source, "r") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+                    raise ValueError('очікується об\'єкт з рядковим полем "text"')
+            except ValueError as error:  # json.JSONDecodeError — підклас ValueError
+                yield {"id": line_number, "line": line_number, "error": f"рядок {line_number}: {error}"}
+                continue
+            yield record.get("id", line_number), record["text"]
+
+
+def _break_message(message):
+    """
+    Обробляє одне повідомлення в процесі пулу.
+
+    :param message: пара (ідентифікатор, шифротекст)
+    :return: словник з результатом або повідомленням про помилку та часом обробки
+    """
+    message_id, cipher_text = message
+    started = time.perf_counter()
+    try:
+        result = break_vigenere(cipher_text)
+    except Exception as error:  # Помилка одного повідомлення не зупиняє пакет
+        result = {"error": str(error)}
+    result["id"] = message_id
+    result["seconds"] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def run_batch(source, output=sys.stdout, workers=None):
+    """
+    Пакетний злам тисяч шифротекстів у пулі процесів.
+
+    Результати записуються у форматі JSON Lines одразу після завершення кожного
+    повідомлення (не в порядку надходження), тому повільні повідомлення не затримують інші.
+    Кількість одночасно поставлених задач обмежена, щоб не читати весь пакет у пам'ять.
+
+    :param source: каталог або файл .jsonl (див. iter_batch_messages)
+    :param output: текстовий потік для запису результатів
+    :param workers: кількість процесів (за замовчуванням — кількість ядер)
+    :return: кількість оброблених повідомлень
+    """
+    workers = workers or os.cpu_count() or 1
+    processed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for message in iter_batch_messages(source):
+            if isinstance(message, dict):
+                # Некоректний рядок входу: запис про помилку без передачі в пул
+                output.write(json.dumps(message, ensure_ascii=False) + "\n")
+                processed += 1
+                continue
+            pending.add(pool.submit(_break_message, message))
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                processed += _write_results(done, output)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            processed += _write_results(done, output)
+    return processed
+
+
+def _write_results(futures, output):
+    """
+    Записує готові результати у потік JSON Lines.
+
+    :param futures: множина завершених задач
+    :param output: текстовий потік
+    :return: кількість записаних результатів
+    """
+    for future in futures:
+        output.write(json.dumps(future.result(), ensure_ascii=False) + "\n")
+    output.flush()
+    return len(futures)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Злам шифру Віженера")
+    parser.add_argument("--batch", help="каталог або файл .jsonl з шифротекстами для пакетного аналізу")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів")
+    parser.add_argument("--output", help="файл для результатів JSON Lines (за замовчуванням stdout)")
+    args = parser.parse_args()
+
+    # Пакетний режим: результати JSON Lines у файл або stdout
+    if args.batch:
+        if args.output:
+            with open(args.output, "w") as results_file:
+                run_batch(args.batch, results_file, args.workers)
+        else:
+            run_batch(args.batch, sys.stdout, args.workers)
+        sys.exit(0)
+
     # Вказуємо шлях до файлу з зашифрованим текстом
     cipher_text_filename = "encrypted.txt"
     
@@ -181,16 +913,13 @@ if __name__ == "__main__":
     estimated_key_length = friedman_test(cipher_text)
     print(f"Estimated key length (Фрідман): {estimated_key_length}")
     
-    # Визначення ключа: якщо є результати Касіскі, беремо перший, інакше – оцінку Фрідмана
-    if likely_key_lengths:
-        key_length = likely_key_lengths[0]
-    else:
-        key_length = estimated_key_length
-
-    # Пошук ключа за допомогою аналізу частоти символів
-    key = find_key(cipher_text, key_length)
+    # Перевірка кількох кандидатів довжини: ключ для кожного оцінюється за квадграмами
+    ranked = verify_key_lengths(cipher_text, workers=args.workers)
+    for key_length, candidate_key, score in ranked:
+        print(f"Candidate: length={key_length} key={candidate_key} score={score:.1f}")
+    key = ranked[0][1]
     print(f"Secret key: {key}")
     
     # Розшифровуємо текст за знайденим ключем
     decrypted_text = vigenere_decrypt(cipher_text, key)
-    print(f"Plain text:\n{decrypted_text}")
\ No newline at end of file
+    print(f"Plain text:\n{decrypted_text}")
@@ -1,4 +1,15 @@
-import numpy as np  # npm: імпорт, хоча в даному коді бібліотека не використовується
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice, permutations
+from multiprocessing import shared_memory
+import mmap
+import os
+import struct
+
+import numpy as np
+
+import buffers
+import ngram_fitness
 
 def get_permutation_order(keyword):
     """
@@ -75,6 +86,609 @@ def decrypt_transposition(ciphertext, keyword):
     return decrypted_text.rstrip("@").replace("~", " ")
 
 
+# Розмір блоку для заміни символів у великих масивах (обмежує тимчасову пам'ять)
+REPLACE_BLOCK_SIZE = 1 << 22
+
+
+def _replace_byte(array, old, new):
+    """
+    Замінює на місці всі байти old на new, обробляючи масив блоками.
+
+    :param array: масив uint8
+    :param old: код символу, який замінюємо
+    :param new: код нового символу
+    """
+    for start in range(0, len(array), REPLACE_BLOCK_SIZE):
+        block = array[start:start + REPLACE_BLOCK_SIZE]
+        block[block == old] = new
+
+
+def transposition_encrypt_array(data, keyword, out=None):
+    """
+    Шифрування простою перестановкою через арифметику індексів (без матриці).
+
+    Стовпець col матриці — це зріз data[col::key_length], тому j-й блок шифротексту
+    (довжиною num_rows) копіюється одним кроковим зрізом зі стовпця order[j].
+    Відсутні клітинки останнього рядка заповнюються '@', пробіли замінюються на '~'.
+
+    :param data: масив uint8 з відкритим текстом
+    :param keyword: ключ перестановки
+    :param out: необов'язковий масив uint8 довжиною num_rows * key_length для результату;
+        якщо він перекривається з data, вхід спершу копіюється (buffers.separate_input)
+    :return: масив із шифротекстом
+    """
+    key_length = len(keyword)
+    order = get_permutation_order(keyword)
+    num_rows = -(-len(data) // key_length)
+    if out is None:
+        out = np.empty(num_rows * key_length, dtype=np.uint8)
+    data = buffers.separate_input(data, out)
+
+    for j, col in enumerate(order):
+        column = data[col::key_length]
+        destination = out[j * num_rows:(j + 1) * num_rows]
+        destination[:len(column)] = column
+        destination[len(column):] = ord("@")
+
+    _replace_byte(out, ord(" "), ord("~"))
+    return out
+
+
+def transposition_decrypt_array(data, keyword, out=None, strip_padding=True):
+    """
+    Розшифрування простої перестановки через арифметику індексів (без матриці).
+
+    Блок шифротексту j записується кроковим зрізом у стовпець order[j] результату.
+    Після цього відкидаються кінцеві заповнювачі '@', а '~' повертаються у пробіли.
+
+    :param data: масив uint8 із шифротекстом
+    :param keyword: ключ перестановки
+    :param out: необов'язковий масив uint8 довжиною не менше num_rows * key_length;
+        якщо він перекривається з data, вхід спершу копіюється (buffers.separate_input)
+    :param strip_padding: False — не відкидати '@' (коли довжина тексту відома заздалегідь)
+    :return: масив (зріз out) з розшифрованим текстом
+    """
+    key_length = len(keyword)
+    order = get_permutation_order(keyword)
+    num_rows = len(data) // key_length
+    total = num_rows * key_length
+    if out is None:
+        out = np.empty(total, dtype=np.uint8)
+    data = buffers.separate_input(data, out)
+
+    for j, col in enumerate(order):
+        out[col:total:key_length] = data[j * num_rows:(j + 1) * num_rows]
+
+    # Шукаємо кінець тексту без заповнювачів '@', переглядаючи масив блоками з кінця
+    length = total
+    while strip_padding and length:
+        start = max(0, length - REPLACE_BLOCK_SIZE)
+        not_padding = np.flatnonzero(out[start:length] != ord("@"))
+        if len(not_padding):
+            length = start + int(not_padding[-1]) + 1
+            break
+        length = start
+
+    result = out[:length]
+    _replace_byte(result, ord("~"), ord(" "))
+    return result
+
+
+def encrypt_transposition_buffer(data, keyword, out=None):
+    """
+    Шифрування простою перестановкою для буфера байтів без перетворення у str.
+
+    :param data: об'єкт з буферним протоколом (bytes, bytearray, memoryview, mmap)
+    :param keyword: ключ перестановки
+    :param out: буфер для результату (не менший за довжину, доповнену до кратної ключу) або None;
+        може збігатися з data чи перекриватися з ним — тоді вхід спершу копіюється
+    :return: масив uint8 із шифротекстом (зріз out)
+    """
+    data = buffers.as_byte_array(data)
+    size = -(-len(data) // len(keyword)) * len(keyword)
+    return transposition_encrypt_array(data, keyword, buffers.output_byte_array(out, size))
+
+
+def decrypt_transposition_buffer(data, keyword, out=None):
+    """
+    Розшифрування простої перестановки для буфера байтів без перетворення у str.
+
+    :param data: об'єкт з буферним протоколом
+    :param keyword: ключ перестановки
+    :param out: буфер для результату (не менший за data) або None; може збігатися з data
+        чи перекриватися з ним — тоді вхід спершу копіюється
+    :return: масив uint8 з відкритим текстом без кінцевих заповнювачів '@' (зріз out)
+    """
+    data = buffers.as_byte_array(data)
+    size = len(data) // len(keyword) * len(keyword)
+    return transposition_decrypt_array(data, keyword, buffers.output_byte_array(out, size))
+
+
+def _check_distinct_files(input_filename, output_filename):
+    """
+    Перевіряє, що вихідний файл не є вхідним: відкриття виходу на запис обрізало б
+    вхід ще до того, як його відображено в пам'ять.
+
+    :param input_filename: шлях до вхідного файлу
+    :param output_filename: шлях до вихідного файлу
+    """
+    if os.path.exists(output_filename) and os.path.samefile(input_filename, output_filename):
+        raise ValueError(f"Вхідний і вихідний файли збігаються: {output_filename}")
+
+
+def encrypt_transposition_file(input_filename, output_filename, keyword):
+    """
+    Шифрування файлу простою перестановкою через відображення файлів у пам'ять (mmap).
+
+    Вхідний файл читається через mmap, результат пишеться у відображений вихідний файл
+    кроковими копіюваннями, тому пікове використання пам'яті — приблизно розмір входу та виходу.
+
+    :param input_filename: шлях до файлу з відкритим текстом
+    :param output_filename: шлях до файлу для шифротексту
+    :param keyword: ключ перестановки
+    """
+    _check_distinct_files(input_filename, output_filename)
+    key_length = len(keyword)
+    size = os.path.getsize(input_filename)
+    output_size = -(-size // key_length) * key_length
+    with open(input_filename, "rb") as source, open(output_filename, "w+b") as destination:
+        destination.truncate(output_size)
+        if not output_size:
+            return
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as source_map, \
+                mmap.mmap(destination.fileno(), output_size) as destination_map:
+            data = np.frombuffer(source_map, dtype=np.uint8)
+            out = np.frombuffer(destination_map, dtype=np.uint8)
+            transposition_encrypt_array(data, keyword, out=out)
+            # Масиви мають звільнити буфери до закриття mmap
+            del data, out
+
+
+def decrypt_transposition_file(input_filename, output_filename, keyword):
+    """
+    Розшифрування файлу простої перестановки через mmap.
+
+    :param input_filename: шлях до файлу з шифротекстом
+    :param output_filename: шлях до файлу для розшифрованого тексту
+    :param keyword: ключ перестановки
+    """
+    _check_distinct_files(input_filename, output_filename)
+    key_length = len(keyword)
+    size = os.path.getsize(input_filename)
+    output_size = size // key_length * key_length
+    length = 0
+    with open(input_filename, "rb") as source, open(output_filename, "w+b") as destination:
+        destination.truncate(output_size)
+        if output_size:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as source_map, \
+                    mmap.mmap(destination.fileno(), output_size) as destination_map:
+                data = np.frombuffer(source_map, dtype=np.uint8)
+                out = np.frombuffer(destination_map, dtype=np.uint8)
+                length = len(transposition_decrypt_array(data, keyword, out=out))
+                del data, out
+        # Відкидаємо заповнювачі '@' у кінці файлу
+        destination.truncate(length)
+
+
+# Блоковий режим: кожен блок фіксованого розміру шифрується окремо.
+# Потік починається сигнатурою BLOCK_MAGIC (щоб його не сплутати зі звичайним шифротекстом),
+# останній блок має заголовок з довжиною відкритого тексту (8 байтів, big-endian),
+# тому заповнювачі видаляються точно, а не через rstrip.
+BLOCK_MAGIC = b"TBLK\x01"
+BLOCK_HEADER = struct.Struct(">Q")
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+
+def is_block_stream(prefix):
+    """
+    Перевіряє, чи дані починаються сигнатурою блокового формату.
+
+    :param prefix: початок потоку (bytes-подібний об'єкт, достатньо len(BLOCK_MAGIC) байтів)
+    :return: True для потоку з stream_encrypt_blocks
+    """
+    return bytes(prefix[:len(BLOCK_MAGIC)]) == BLOCK_MAGIC
+
+
+def align_block_size(block_size, key_length):
+    """
+    Округлює розмір блоку вниз до кратного довжині ключа (щоб повні блоки не мали заповнювачів).
+
+    :param block_size: бажаний розмір блоку
+    :param key_length: довжина ключа (кількість стовпців)
+    :return: розмір блоку, кратний key_length
+    """
+    return max(key_length, block_size - block_size % key_length)
+
+
+def _read_exact(source, size):
+    """
+    Читає рівно size байтів (менше — лише в кінці потоку).
+
+    :param source: двійковий файловий об'єкт
+    :param size: кількість байтів
+    :return: прочитані байти
+    """
+    data = source.read(size)
+    while len(data) < size:
+        more = source.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+
+def _read_plain_blocks(source, block_size):
+    """
+    Генератор блоків відкритого тексту з випередженням на один блок.
+
+    :param source: двійковий файловий об'єкт
+    :param block_size: розмір блоку
+    :return: генератор пар (блок, ознака останнього блоку)
+    """
+    current = _read_exact(source, block_size)
+    while True:
+        following = _read_exact(source, block_size) if len(current) == block_size else b""
+        if not following:
+            yield current, True
+            return
+        yield current, False
+        current = following
+
+
+def _read_cipher_blocks(source, block_size):
+    """
+    Генератор блоків шифротексту.
+
+    Останній фрейм (заголовок + шифротекст) не довший за block_size + заголовок,
+    тому якщо після поточної позиції у потоці більше байтів, поточний блок — повний.
+
+    :param source: двійковий файловий об'єкт
+    :param block_size: розмір блоку
+    :return: генератор пар (блок, довжина відкритого тексту для останнього блоку або None)
+    """
+    limit = block_size + BLOCK_HEADER.size
+    buffer = bytearray()
+    while True:
+        buffer += _read_exact(source, limit + 1 - len(buffer))
+        if len(buffer) > limit:
+            yield bytes(buffer[:block_size]), None
+            del buffer[:block_size]
+            continue
+        if len(buffer) < BLOCK_HEADER.size:
+            raise ValueError("Пошкоджений потік: відсутній заголовок останнього блоку")
+        (length,) = BLOCK_HEADER.unpack_from(buffer)
+        yield bytes(buffer[BLOCK_HEADER.size:]), length
+        return
+
+
+def _map_blocks(transform, blocks, workers):
+    """
+    Застосовує transform до блоків послідовно або у пулі процесів, зберігаючи порядок.
+
+    У пулі одночасно обробляється не більше workers * 2 блоків, тому пам'ять обмежена.
+
+    :param transform: функція bytes -> bytes (має серіалізуватися pickle)
+    :param blocks: ітератор пар (блок, метадані)
+    :param workers: кількість процесів (None або 1 — без пулу)
+    :return: генератор пар (результат, метадані)
+    """
+    if not workers or workers <= 1:
+        for block, meta in blocks:
+            yield transform(block), meta
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            window = list(islice(blocks, workers * 2))
+            if not window:
+                return
+            results = pool.map(transform, [block for block, _ in window])
+            yield from zip(results, [meta for _, meta in window])
+
+
+def stream_encrypt_blocks(source, destination, encrypt_block, block_size, workers=None):
+    """
+    Блокове шифрування потоку з обмеженим використанням пам'яті.
+
+    :param source: двійковий файловий об'єкт для читання
+    :param destination: двійковий файловий об'єкт для запису
+    :param encrypt_block: функція шифрування одного блоку (bytes -> bytes)
+    :param block_size: розмір блоку (кратний довжині ключа)
+    :param workers: кількість процесів для паралельної обробки блоків
+    """
+    blocks = ((block, (len(block), final)) for block, final in _read_plain_blocks(source, block_size))
+    destination.write(BLOCK_MAGIC)
+    for cipher_block, (length, final) in _map_blocks(encrypt_block, blocks, workers):
+        if final:
+            destination.write(BLOCK_HEADER.pack(length))
+        destination.write(cipher_block)
+
+
+def stream_decrypt_blocks(source, destination, decrypt_block, block_size, workers=None):
+    """
+    Блокове розшифрування потоку, створеного stream_encrypt_blocks.
+
+    :param source: двійковий файловий об'єкт для читання
+    :param destination: двійковий файловий об'єкт для запису
+    :param decrypt_block: функція розшифрування одного блоку без видалення заповнювачів
+    :param block_size: розмір блоку (той самий, що й при шифруванні)
+    :param workers: кількість процесів для паралельної обробки блоків
+    :raises ValueError: якщо потік не починається сигнатурою BLOCK_MAGIC
+    """
+    if not is_block_stream(_read_exact(source, len(BLOCK_MAGIC))):
+        raise ValueError("Вхід не у блоковому форматі (немає сигнатури BLOCK_MAGIC)")
+    for plain_block, length in _map_blocks(decrypt_block, _read_cipher_blocks(source, block_size), workers):
+        destination.write(plain_block if length is None else plain_block[:length])
+
+
+def _encrypt_block(keyword, block):
+    """
+    Шифрує один блок простою перестановкою.
+
+    :param keyword: ключ перестановки
+    :param block: байти відкритого тексту
+    :return: байти шифротексту
+    """
+    return transposition_encrypt_array(np.frombuffer(block, dtype=np.uint8), keyword).tobytes()
+
+
+def _decrypt_block(keyword, block):
+    """
+    Розшифровує один блок простої перестановки, не видаляючи заповнювачі.
+
+    :param keyword: ключ перестановки
+    :param block: байти шифротексту
+    :return: байти відкритого тексту
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    return transposition_decrypt_array(data, keyword, strip_padding=False).tobytes()
+
+
+def encrypt_transposition_blocks(source, destination, keyword, block_size=DEFAULT_BLOCK_SIZE, workers=None):
+    """
+    Шифрування простою перестановкою в блоковому режимі.
+
+    Кожен блок фіксованого розміру переставляється окремо, тому результат можна
+    записувати, не дочитавши вхід, а пам'ять не залежить від розміру файлу.
+    Блоки можна обробляти паралельно в пулі процесів.
+
+    :param source: двійковий файловий об'єкт з відкритим текстом
+    :param destination: двійковий файловий об'єкт для шифротексту
+    :param keyword: ключ перестановки
+    :param block_size: розмір блоку (округлюється до кратного довжині ключа)
+    :param workers: кількість процесів
+    """
+    block_size = align_block_size(block_size, len(keyword))
+    stream_encrypt_blocks(source, destination, partial(_encrypt_block, keyword), block_size, workers)
+
+
+def decrypt_transposition_blocks(source, destination, keyword, block_size=DEFAULT_BLOCK_SIZE, workers=None):
+    """
+    Розшифрування простої перестановки в блоковому режимі.
+
+    :param source: двійковий файловий об'єкт з шифротекстом
+    :param destination: двійковий файловий об'єкт для відкритого тексту
+    :param keyword: ключ перестановки
+    :param block_size: розмір блоку (той самий, що й при шифруванні)
+    :param workers: кількість процесів
+    """
+    block_size = align_block_size(block_size, len(keyword))
+    stream_decrypt_blocks(source, destination, partial(_decrypt_block, keyword), block_size, workers)
+
+
+# Криптоаналіз: пошук ключа перестановки за квадграмною оцінкою.
+# Для ширин до EXHAUSTIVE_MAX_WIDTH перебираються всі перестановки стовпців,
+# для більших — сходження на пагорб з випадковими перезапусками.
+EXHAUSTIVE_MAX_WIDTH = 8
+HILL_CLIMB_RESTARTS = 8
+
+# Стан процесу пошуку: коди шифротексту (у спільній пам'яті) і таблиця квадграм
+_search_codes = None
+_search_table = None
+_search_memory = None
+
+
+def _init_key_search(memory_name, length, table):
+    """
+    Ініціалізатор робочого процесу: підключає шифротекст зі спільної пам'яті без копіювання.
+
+    :param memory_name: ім'я блоку shared_memory
+    :param length: довжина шифротексту
+    :param table: посилання на таблицю квадграм (ngram_fitness.table_reference)
+    """
+    global _search_codes, _search_table, _search_memory
+    _search_memory = shared_memory.SharedMemory(name=memory_name)
+    _search_codes = np.ndarray((length,), dtype=np.uint8, buffer=_search_memory.buf)
+    _search_table = ngram_fitness.resolve_table(table)
+
+
+def candidate_widths(length, max_width):
+    """
+    Можливі довжини ключа: шифрування доповнює матрицю до повної, тому довжина
+    шифротексту кратна кількості стовпців.
+
+    :param length: довжина шифротексту
+    :param max_width: максимальна довжина ключа
+    :return: список довжин ключа
+    """
+    return [width for width in range(2, max_width + 1) if length % width == 0]
+
+
+def arrangement_gather_indices(arrangement, rows):
+    """
+    Індекси, що переводять шифротекст у відкритий текст.
+
+    arrangement[c] — номер стовпця шифротексту (у порядку зчитування), що стоїть на місці
+    стовпця c відкритого тексту; символ у рядку r стовпця c береться з позиції
+    arrangement[c] * rows + r, тому матриця не будується.
+
+    :param arrangement: розстановка стовпців шифротексту
+    :param rows: кількість рядків матриці
+    :return: масив індексів int64 довжини rows * len(arrangement)
+    """
+    arrangement = np.asarray(arrangement, dtype=np.int64)
+    return (arrangement[None, :] * rows + np.arange(rows)[:, None]).ravel()
+
+
+def invert_order(order):
+    """
+    Перетворює порядок зчитування стовпців (get_permutation_order) на розстановку і навпаки
+    (обидві перестановки взаємно обернені).
+
+    :param order: перестановка
+    :return: обернена перестановка (список)
+    """
+    inverse = [0] * len(order)
+    for index, column in enumerate(order):
+        inverse[column] = index
+    return inverse
+
+
+def _score_arrangement(arrangement, rows):
+    """
+    Оцінка розшифрування шифротексту процесу для розстановки стовпців.
+    """
+    gathered = _search_codes[arrangement_gather_indices(arrangement, rows)]
+    return ngram_fitness.score_letters(ngram_fitness.letters_only(gathered), _search_table)
+
+
+def _search_exhaustive(width, first):
+    """
+    Перебирає всі розстановки стовпців, у яких першим стоїть стовпець шифротексту first.
+
+    :return: (оцінка, ширина, порядок зчитування)
+    """
+    rows = len(_search_codes) // width
+    rest = [column for column in range(width) if column != first]
+    best_score, best = float("-inf"), None
+    for tail in permutations(rest):
+        arrangement = (first,) + tail
+        score = _score_arrangement(arrangement, rows)
+        if score > best_score:
+            best_score, best = score, arrangement
+    return best_score, width, invert_order(best)
+
+
+def _random_move(arrangement, rng):
+    """
+    Випадкова сусідня розстановка: обмін двох стовпців або перенесення фрагмента
+    (одного чи кількох сусідніх стовпців відкритого тексту) в іншу позицію.
+    Перенесення зберігає вже знайдені ланцюжки сусідніх стовпців.
+    """
+    width = len(arrangement)
+    i, j = sorted(int(index) for index in rng.choice(width, size=2, replace=False))
+    if rng.random() < 0.5:
+        candidate = list(arrangement)
+        candidate[i], candidate[j] = candidate[j], candidate[i]
+        return candidate
+    block, rest = arrangement[i:j + 1], arrangement[:i] + arrangement[j + 1:]
+    position = int(rng.integers(0, len(rest) + 1))
+    return rest[:position] + block + rest[position:]
+
+
+def _search_hill_climb(width, seed, patience=None):
+    """
+    Стохастичне сходження на пагорб з випадкової розстановки: приймається будь-який
+    випадковий хід, що не погіршує оцінку; зупинка після patience ходів без покращення.
+
+    :return: (оцінка, ширина, порядок зчитування)
+    """
+    rows = len(_search_codes) // width
+    rng = np.random.default_rng(seed)
+    patience = patience or 50 * width
+    arrangement = [int(column) for column in rng.permutation(width)]
+    score = _score_arrangement(arrangement, rows)
+    stale = 0
+    while stale < patience:
+        candidate = _random_move(arrangement, rng)
+        candidate_score = _score_arrangement(candidate, rows)
+        stale = 0 if candidate_score > score else stale + 1
+        if candidate_score >= score:
+            arrangement, score = candidate, candidate_score
+    return score, width, invert_order(arrangement)
+
+
+def _run_search_task(task):
+    """
+    Виконує одне завдання пошуку в робочому процесі.
+
+    :param task: ("exhaustive", ширина, перший стовпець) або ("climb", ширина, зерно генератора)
+    :return: (оцінка, ширина, порядок зчитування)
+    """
+    kind, width, argument = task
+    if kind == "exhaustive":
+        return _search_exhaustive(width, argument)
+    return _search_hill_climb(width, argument)
+
+
+def order_to_keyword(order):
+    """
+    Будує ключове слово, для якого get_permutation_order повертає order.
+
+    :param order: порядок зчитування стовпців
+    :return: ключ (рядок різних символів)
+    """
+    keyword = [""] * len(order)
+    for rank, column in enumerate(order):
+        keyword[column] = chr(ord("A") + rank)
+    return "".join(keyword)
+
+
+def break_transposition(ciphertext, max_width=12, workers=None, restarts=HILL_CLIMB_RESTARTS,
+                        seed=0, table=None):
+    """
+    Пошук ключа простої перестановки без знання ключа.
+
+    Для кожної можливої ширини ключа кандидати оцінюються квадграмною таблицею:
+    розшифрування — це лише вибірка за індексами з масиву кодів шифротексту, який
+    розміщується у спільній пам'яті та не копіюється в робочі процеси.
+
+    :param ciphertext: шифротекст (результат encrypt_transposition)
+    :param max_width: максимальна довжина ключа
+    :param workers: кількість процесів (1 — без пулу)
+    :param restarts: кількість перезапусків сходження на пагорб для кожної великої ширини
+    :param seed: початкове значення генератора випадкових чисел
+    :param table: таблиця квадграм (за замовчуванням — ngram_fitness.load_quadgram_table())
+    :return: словник з ключами keyword, width, order, score, plaintext
+    """
+    global _search_codes, _search_table
+    if table is None:
+        table = ngram_fitness.load_quadgram_table()
+    codes = ngram_fitness.text_to_codes(ciphertext)
+    tasks = []
+    for width in candidate_widths(len(codes), max_width):
+        if width <= EXHAUSTIVE_MAX_WIDTH:
+            tasks.extend(("exhaustive", width, first) for first in range(width))
+        else:
+            tasks.extend(("climb", width, seed * restarts + restart) for restart in range(restarts))
+    if not tasks:
+        raise ValueError("Довжина шифротексту не кратна жодній довжині ключа до max_width")
+
+    if workers == 1:
+        _search_codes, _search_table = codes, table
+        results = [_run_search_task(task) for task in tasks]
+    else:
+        memory = shared_memory.SharedMemory(create=True, size=max(1, len(codes)))
+        try:
+            np.ndarray(codes.shape, dtype=np.uint8, buffer=memory.buf)[:] = codes
+            initargs = (memory.name, len(codes), ngram_fitness.table_reference(table))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_key_search,
+                                     initargs=initargs) as pool:
+                results = list(pool.map(_run_search_task, tasks))
+        finally:
+            memory.close()
+            memory.unlink()
+
+    score, width, order = max(results, key=lambda result: result[0])
+    keyword = order_to_keyword(order)
+    return {
+        "keyword": keyword,
+        "width": width,
+        "order": order,
+        "score": score,
+        "plaintext": decrypt_transposition(ciphertext, keyword),
+    }
+
+
 def read_plain_text(filename):
     """
     Зчитування тексту з файлу.
@@ -1,3 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache, partial
+import heapq
+import importlib
+
+import numpy as np
+
+import buffers
+import ngram_fitness
+
+# Модуль 2_1.py (ім'я починається з цифри, тому імпортуємо через importlib):
+# з нього беремо потокове читання/запис блоків для блокового режиму
+transposition = importlib.import_module("2_1")
+
+
 def get_permutation_order(keyword):
     """
     Отримуємо порядок перестановки для ключа.
@@ -106,6 +121,470 @@ def decrypt_double_transposition(ciphertext, key1, key2):
     return decrypted_text.rstrip("^").replace("~", " ")
 
 
+# Максимальна кількість скомпільованих планів у кеші
+PLAN_CACHE_SIZE = 128
+
+
+def _to_array(text):
+    """
+    Перетворює текст на масив кодів символів без втрат.
+
+    Рядок кодується в UTF-32, тому кожен символ (зокрема не ASCII) — один елемент uint32;
+    байти подаються як uint8.
+
+    :param text: рядок або байти
+    :return: масив кодів символів
+    """
+    if isinstance(text, str):
+        return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    return np.frombuffer(text, dtype=np.uint8)
+
+
+def _from_array(array, as_text):
+    """
+    Зворотне перетворення до _to_array.
+
+    :param array: масив кодів символів
+    :param as_text: True — повернути рядок, False — байти
+    :return: рядок або байти
+    """
+    data = array.tobytes()
+    return data.decode("utf-32-le") if as_text else data
+
+
+class DoubleTranspositionPlan:
+    """
+    Скомпільований план подвійної перестановки для (key1, key2, кількість рядків).
+
+    Перестановка стовпців за key1 і рядків за key2 об'єднуються в один плаский
+    індекс gather: i-й символ шифротексту — це символ gather[i] доповненого тексту.
+    Шифрування — одна операція take, розшифрування — take за оберненим індексом.
+    """
+
+    def __init__(self, key1, key2, rows):
+        key1_order = get_permutation_order(key1)
+        key2_order = get_permutation_order(key2)
+        self.cols = len(key1)
+        self.rows = rows
+        # Той самий порядок рядків, що й в encrypt_double_transposition
+        sorted_row_indices = sorted(range(rows), key=lambda x: key2_order[x % len(key2_order)])
+        self.gather = (
+            np.array(sorted_row_indices, dtype=np.intp)[:, None] * self.cols
+            + np.array(key1_order, dtype=np.intp)[None, :]
+        ).ravel()
+        self.inverse = np.empty_like(self.gather)
+        self.inverse[self.gather] = np.arange(len(self.gather))
+
+    def encrypt(self, text):
+        """
+        Шифрує текст, довжина якого дає self.rows рядків.
+
+        :param text: відкритий текст (рядок або байти)
+        :return: шифротекст того ж типу
+        """
+        as_text = isinstance(text, str)
+        text = text.replace(" ", "~") if as_text else bytes(text).replace(b" ", b"~")
+        data = _to_array(text)
+        padded = np.full(self.rows * self.cols, ord("^"), dtype=data.dtype)
+        padded[:len(data)] = data
+        return _from_array(padded.take(self.gather), as_text)
+
+    def decrypt(self, ciphertext, strip_padding=True):
+        """
+        Розшифровує шифротекст довжиною rows * cols.
+
+        :param ciphertext: шифротекст (рядок або байти)
+        :param strip_padding: False — не відкидати '^' (коли довжина тексту відома заздалегідь)
+        :return: відкритий текст того ж типу
+        """
+        as_text = isinstance(ciphertext, str)
+        data = _to_array(ciphertext)
+        if len(data) != len(self.gather):
+            raise ValueError("Довжина шифротексту не відповідає плану")
+        decrypted = _from_array(data.take(self.inverse), as_text)
+        if as_text:
+            if strip_padding:
+                decrypted = decrypted.rstrip("^")
+            return decrypted.replace("~", " ")
+        if strip_padding:
+            decrypted = decrypted.rstrip(b"^")
+        return decrypted.replace(b"~", b" ")
+
+    def encrypt_into(self, data, out):
+        """
+        Шифрує масив байтів одразу в масив результату (без проміжного доповненого тексту).
+
+        :param data: масив uint8 довжиною, що дає self.rows рядків
+        :param out: масив uint8 довжиною rows * cols (не може збігатися з data)
+        :return: out
+        """
+        if len(self.gather):
+            np.take(data, self.gather, out=out, mode="clip")
+            out[self.gather >= len(data)] = ord("^")
+            out[out == ord(" ")] = ord("~")
+        return out
+
+    def decrypt_into(self, data, out, strip_padding=True):
+        """
+        Розшифровує масив байтів одразу в масив результату.
+
+        :param data: масив uint8 довжиною rows * cols
+        :param out: масив uint8 тієї ж довжини (не може збігатися з data)
+        :param strip_padding: False — не відкидати '^'
+        :return: зріз out з відкритим текстом
+        """
+        if len(data) != len(self.gather):
+            raise ValueError("Довжина шифротексту не відповідає плану")
+        np.take(data, self.inverse, out=out)
+        size = len(out)
+        if strip_padding:
+            kept = np.flatnonzero(out != ord("^"))
+            size = kept[-1] + 1 if len(kept) else 0
+        out = out[:size]
+        out[out == ord("~")] = ord(" ")
+        return out
+
+
+def _compile_plan(key1, key2, rows):
+    """
+    Створює план подвійної перестановки (без кешування).
+
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :param rows: кількість рядків матриці
+    :return: об'єкт DoubleTranspositionPlan
+    """
+    return DoubleTranspositionPlan(key1, key2, rows)
+
+
+compile_double_transposition_plan = lru_cache(maxsize=PLAN_CACHE_SIZE)(_compile_plan)
+
+
+def configure_plan_cache(maxsize):
+    """
+    Змінює розмір кешу планів (вміст кешу та статистика скидаються).
+
+    :param maxsize: максимальна кількість планів у кеші (None — без обмеження)
+    """
+    global compile_double_transposition_plan
+    compile_double_transposition_plan = lru_cache(maxsize=maxsize)(_compile_plan)
+
+
+def plan_cache_info():
+    """
+    Повертає статистику кешу планів.
+
+    :return: словник з ключами hits, misses, maxsize, currsize
+    """
+    return compile_double_transposition_plan.cache_info()._asdict()
+
+
+def encrypt_with_plan(text, key1, key2):
+    """
+    Шифрування подвійною перестановкою через кешований план.
+
+    План залежить лише від ключів і кількості рядків, тому повідомлення однакової
+    довжини повторно використовують той самий план. Результат збігається
+    з encrypt_double_transposition.
+
+    :param text: відкритий текст (рядок або байти)
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :return: зашифрований текст
+    """
+    rows = -(-len(text) // len(key1))
+    return compile_double_transposition_plan(key1, key2, rows).encrypt(text)
+
+
+def decrypt_with_plan(ciphertext, key1, key2):
+    """
+    Розшифрування подвійної перестановки через кешований план.
+
+    :param ciphertext: зашифрований текст (рядок або байти)
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :return: розшифрований текст
+    """
+    rows = -(-len(ciphertext) // len(key1))
+    return compile_double_transposition_plan(key1, key2, rows).decrypt(ciphertext)
+
+
+def encrypt_double_transposition_buffer(data, key1, key2, out=None):
+    """
+    Шифрування подвійною перестановкою для буфера байтів без перетворення у str.
+
+    Результат збігається з encrypt_with_plan для того самого тексту в байтах.
+
+    :param data: об'єкт з буферним протоколом (bytes, bytearray, memoryview, mmap)
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :param out: буфер для результату (не менший за довжину, доповнену до кратної key1) або None;
+        якщо він перекривається з data, вхід спершу копіюється
+    :return: масив uint8 із шифротекстом (зріз out)
+    """
+    data = buffers.as_byte_array(data)
+    rows = -(-len(data) // len(key1))
+    out = buffers.output_byte_array(out, rows * len(key1))
+    plan = compile_double_transposition_plan(key1, key2, rows)
+    return plan.encrypt_into(buffers.separate_input(data, out), out)
+
+
+def decrypt_double_transposition_buffer(data, key1, key2, out=None):
+    """
+    Розшифрування подвійної перестановки для буфера байтів без перетворення у str.
+
+    :param data: об'єкт з буферним протоколом
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :param out: буфер для результату (не менший за data) або None;
+        якщо він перекривається з data, вхід спершу копіюється
+    :return: масив uint8 з відкритим текстом без кінцевих '^' (зріз out)
+    """
+    data = buffers.as_byte_array(data)
+    rows = -(-len(data) // len(key1))
+    out = buffers.output_byte_array(out, len(data))
+    plan = compile_double_transposition_plan(key1, key2, rows)
+    return plan.decrypt_into(buffers.separate_input(data, out), out)
+
+
+def _encrypt_block(key1, key2, block):
+    """
+    Шифрує один блок подвійною перестановкою.
+
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :param block: байти відкритого тексту
+    :return: байти шифротексту
+    """
+    return encrypt_with_plan(block, key1, key2)
+
+
+def _decrypt_block(key1, key2, block):
+    """
+    Розшифровує один блок подвійної перестановки, не видаляючи заповнювачі.
+
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :param block: байти шифротексту
+    :return: байти відкритого тексту
+    """
+    rows = len(block) // len(key1)
+    return compile_double_transposition_plan(key1, key2, rows).decrypt(block, strip_padding=False)
+
+
+def encrypt_double_transposition_blocks(source, destination, key1, key2,
+                                        block_size=transposition.DEFAULT_BLOCK_SIZE, workers=None):
+    """
+    Шифрування подвійною перестановкою в блоковому режимі.
+
+    Кожен блок фіксованого розміру шифрується окремо (повні блоки мають однакову кількість
+    рядків і тому один кешований план), останній блок має заголовок з довжиною,
+    тому заповнювачі '^' видаляються точно. Пам'ять не залежить від розміру файлу.
+
+    :param source: двійковий файловий об'єкт з відкритим текстом
+    :param destination: двійковий файловий об'єкт для шифротексту
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :param block_size: розмір блоку (округлюється до кратного довжині key1)
+    :param workers: кількість процесів
+    """
+    block_size = transposition.align_block_size(block_size, len(key1))
+    transposition.stream_encrypt_blocks(
+        source, destination, partial(_encrypt_block, key1, key2), block_size, workers
+    )
+
+
+def decrypt_double_transposition_blocks(source, destination, key1, key2,
+                                        block_size=transposition.DEFAULT_BLOCK_SIZE, workers=None):
+    """
+    Розшифрування подвійної перестановки в блоковому режимі.
+
+    :param source: двійковий файловий об'єкт з шифротекстом
+    :param destination: двійковий файловий об'єкт для відкритого тексту
+    :param key1: ключ перестановки стовпців
+    :param key2: ключ перестановки рядків
+    :param block_size: розмір блоку (той самий, що й при шифруванні)
+    :param workers: кількість процесів
+    """
+    block_size = transposition.align_block_size(block_size, len(key1))
+    transposition.stream_decrypt_blocks(
+        source, destination, partial(_decrypt_block, key1, key2), block_size, workers
+    )
+
+
+# Криптоаналіз подвійної перестановки. Розшифрування — gather за складеним індексом:
+# символ у рядку r і стовпці c відкритого тексту береться з позиції
+# row_position[r] * cols + column_position[c] шифротексту, де column_position обернена
+# до порядку key1, а row_position — до порядку рядків за key2. Тому обидві перестановки
+# шукаються разом сходженням на пагорб з випадковими перезапусками.
+DOUBLE_RESTARTS = 4
+DOUBLE_TOP = 5
+
+# Стан процесу пошуку: коди шифротексту і таблиця квадграм
+_search_codes = None
+_search_table = None
+
+
+def _init_double_search(codes, table):
+    """
+    Ініціалізатор робочого процесу пошуку.
+
+    :param codes: коди шифротексту (ngram_fitness.text_to_codes)
+    :param table: посилання на таблицю квадграм (ngram_fitness.table_reference)
+    """
+    global _search_codes, _search_table
+    _search_codes, _search_table = codes, ngram_fitness.resolve_table(table)
+
+
+def row_positions(key2_order, rows):
+    """
+    Номер рядка шифротексту для кожного рядка відкритого тексту (без сортування рядків
+    у Python: той самий стабільний порядок, що й в encrypt_double_transposition).
+
+    :param key2_order: порядок ключа key2 (get_permutation_order)
+    :param rows: кількість рядків матриці
+    :return: масив int64 довжини rows
+    """
+    key2_order = np.asarray(key2_order, dtype=np.int64)
+    sorted_row_indices = np.argsort(key2_order[np.arange(rows) % len(key2_order)], kind="stable")
+    positions = np.empty(rows, dtype=np.int64)
+    positions[sorted_row_indices] = np.arange(rows)
+    return positions
+
+
+def composed_gather_indices(column_position, key2_order, rows):
+    """
+    Складений індекс, що переводить шифротекст у доповнений відкритий текст.
+
+    :param column_position: column_position[c] — стовпець шифротексту для стовпця c відкритого тексту
+    :param key2_order: порядок ключа key2
+    :param rows: кількість рядків матриці
+    :return: масив int64 довжини rows * len(column_position)
+    """
+    column_position = np.asarray(column_position, dtype=np.int64)
+    cols = len(column_position)
+    return (row_positions(key2_order, rows)[:, None] * cols + column_position[None, :]).ravel()
+
+
+def _score_double(column_position, key2_order, rows):
+    """
+    Оцінка розшифрування шифротексту процесу для пари перестановок.
+    """
+    gathered = _search_codes[composed_gather_indices(column_position, key2_order, rows)]
+    return ngram_fitness.score_letters(ngram_fitness.letters_only(gathered), _search_table)
+
+
+def _climb_double(cols, key2_length, seed, patience=None):
+    """
+    Стохастичне сходження на пагорб з випадкової пари перестановок: кожен хід змінює
+    перестановку стовпців або рядків (transposition._random_move), приймається хід,
+    що не погіршує оцінку; зупинка після patience ходів без покращення.
+
+    :return: (оцінка, cols, key2_length, key1_order, key2_order)
+    """
+    rows = len(_search_codes) // cols
+    rng = np.random.default_rng(seed)
+    patience = patience or 50 * (cols + key2_length)
+    column_position = [int(column) for column in rng.permutation(cols)]
+    key2_order = [int(row) for row in rng.permutation(key2_length)]
+    score = _score_double(column_position, key2_order, rows)
+    stale = 0
+    while stale < patience:
+        if rng.random() < cols / (cols + key2_length):
+            candidate = transposition._random_move(column_position, rng), key2_order
+        else:
+            candidate = column_position, transposition._random_move(key2_order, rng)
+        candidate_score = _score_double(*candidate, rows)
+        stale = 0 if candidate_score > score else stale + 1
+        if candidate_score >= score:
+            (column_position, key2_order), score = candidate, candidate_score
+    return score, cols, key2_length, transposition.invert_order(column_position), key2_order
+
+
+def _run_double_task(task):
+    """
+    Виконує одне сходження на пагорб у робочому процесі.
+
+    :param task: (cols, key2_length, зерно генератора) — аргументи _climb_double
+    :return: (оцінка, cols, key2_length, key1_order, key2_order)
+    """
+    return _climb_double(*task)
+
+
+def _double_candidate(result):
+    """
+    Перетворює результат сходження на словник з ключами.
+
+    :param result: (оцінка, cols, key2_length, key1_order, key2_order) з _climb_double
+    :return: словник {"key1", "key2", "score"}
+    """
+    score, cols, key2_length, key1_order, key2_order = result
+    return {
+        "key1": transposition.order_to_keyword(key1_order),
+        "key2": transposition.order_to_keyword(key2_order),
+        "score": score,
+    }
+
+
+def break_double_transposition(ciphertext, max_key1_length=10, max_key2_length=10,
+                               restarts=DOUBLE_RESTARTS, workers=None, top=DOUBLE_TOP,
+                               progress=None, seed=0, table=None):
+    """
+    Пошук ключів подвійної перестановки без їх знання.
+
+    Для кожної довжини key1, що ділить довжину шифротексту, і кожної довжини key2
+    (не більшої за кількість рядків) виконується restarts незалежних сходжень на пагорб.
+    Завдання розподіляються між процесами; після кожного завершеного завдання
+    викликається progress(виконано, усього, найкращі кандидати).
+
+    :param ciphertext: шифротекст (результат encrypt_double_transposition)
+    :param max_key1_length: максимальна довжина key1
+    :param max_key2_length: максимальна довжина key2
+    :param restarts: кількість перезапусків для кожної пари довжин
+    :param workers: кількість процесів (1 — без пулу)
+    :param top: скільки найкращих кандидатів повертати і передавати в progress
+    :param progress: функція зворотного виклику або None
+    :param seed: початкове значення генератора випадкових чисел
+    :param table: таблиця квадграм (за замовчуванням — ngram_fitness.load_quadgram_table())
+    :return: словник з ключами key1, key2, score, plaintext, candidates
+    """
+    if table is None:
+        table = ngram_fitness.load_quadgram_table()
+    codes = ngram_fitness.text_to_codes(ciphertext)
+    tasks = []
+    for cols in transposition.candidate_widths(len(codes), max_key1_length):
+        rows = len(codes) // cols
+        for key2_length in range(2, min(max_key2_length, rows) + 1):
+            tasks.extend((cols, key2_length, seed * restarts + restart) for restart in range(restarts))
+    if not tasks:
+        raise ValueError("Довжина шифротексту не кратна жодній довжині key1 до max_key1_length")
+
+    best = []
+
+    def collect(result, completed):
+        best.append(result)
+        best[:] = heapq.nlargest(top, best, key=lambda item: item[0])
+        if progress is not None:
+            progress(completed, len(tasks), [_double_candidate(item) for item in best])
+
+    if workers == 1:
+        _init_double_search(codes, table)
+        for completed, task in enumerate(tasks, 1):
+            collect(_run_double_task(task), completed)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_double_search,
+                                 initargs=(codes, ngram_fitness.table_reference(table))) as pool:
+            futures = [pool.submit(_run_double_task, task) for task in tasks]
+            for completed, future in enumerate(as_completed(futures), 1):
+                collect(future.result(), completed)
+
+    candidates = [_double_candidate(item) for item in best]
+    result = dict(candidates[0])
+    result["plaintext"] = decrypt_double_transposition(ciphertext, result["key1"], result["key2"])
+    result["candidates"] = candidates
+    return result
+
+
 # Основний блок виконання
 if __name__ == "__main__":
     # Ключі для подвійної перестановки
@@ -1,4 +1,21 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+import importlib
+import math
+import multiprocessing
+import os
+import re
 import string
+import time
+
+import numpy as np
+
+import buffers
+import ngram_fitness
+
+# Модуль 1_1.py (ім'я починається з цифри, тому імпортуємо через importlib):
+# з нього беремо пакування повідомлень для пакетного режиму
+vigenere = importlib.import_module("1_1")
 
 # Генерує шифрувальну таблицю (матрицю 5x5) для Playfair шифру
 def generate_cipher_table(keyword):
@@ -39,9 +56,204 @@ def split_text(text):
 
     return pairs
 
+# Перетворює пару літер за таблицею: step=1 — шифрування, step=-1 — дешифрування
+def transform_pair(cipher_table, a, b, step):
+    row_a, col_a = divmod(cipher_table.index(a), 5)
+    row_b, col_b = divmod(cipher_table.index(b), 5)
+
+    if row_a == row_b:
+        return (cipher_table[row_a * 5 + (col_a + step) % 5]
+                + cipher_table[row_b * 5 + (col_b + step) % 5])
+    if col_a == col_b:
+        return (cipher_table[((row_a + step) % 5) * 5 + col_a]
+                + cipher_table[((row_b + step) % 5) * 5 + col_b])
+    return cipher_table[row_a * 5 + col_b] + cipher_table[row_b * 5 + col_a]
+
+# Чи є таблиця коректним квадратом 5x5 з 25 різних великих літер
+def is_square_table(cipher_table):
+    return len(cipher_table) == 25 and len(set(cipher_table)) == 25 and cipher_table.isupper()
+
+# Токени так само, як у split_text: пара різних літер, одиночна літера
+# (доповнюється "X") або нелітерний символ. Пари різних літер перелічені явно
+# (без груп і зворотних посилань), тому re.findall одразу повертає список рядків
+_TOKEN_RE = re.compile(
+    "|".join(
+        a + "[" + string.ascii_uppercase.replace(a, "") + "]" for a in string.ascii_uppercase
+    )
+    + "|[A-Z]|[^A-Z]"
+)
+
+# Розмір фрагмента для векторизованої обробки та максимальна кількість проходів
+# формування пар (кожен прохід фіксує одну подвоєну літеру в кожному слові)
+VECTOR_CHUNK_SIZE = 1 << 20
+MAX_PAIRING_PASSES = 16
+
+# Векторизоване формування пар для масиву кодів великих ASCII-літер.
+# Сегмент — ділянка літер, у якій пари йдуть підряд від її початку. Сегменти починаються
+# з початку слова та після кожної подвоєної літери на початку пари (вона стає одиночною),
+# тому за кожен прохід фіксуємо першу таку літеру в кожному сегменті.
+# Одиночна літера в кінці слова на наступні пари не впливає і визначається в останньому проході.
+# Повертає (маску літер, маску початків пар, маску одиночних літер)
+# або None, якщо проходів забагато
+def _pair_masks(data):
+    size = len(data)
+    index = np.arange(size, dtype=np.int32)
+    letter = (data >= 65) & (data <= 90)
+    next_letter = np.zeros(size, dtype=bool)
+    next_letter[:-1] = letter[1:]
+    doubled = np.zeros(size, dtype=bool)
+    doubled[:-1] = (data[:-1] == data[1:]) & letter[:-1]
+
+    segment_mark = letter.copy()
+    segment_mark[1:] &= ~letter[:-1]
+    single = np.zeros(size, dtype=bool)
+    for _ in range(MAX_PAIRING_PASSES):
+        segment_start = np.maximum.accumulate(np.where(segment_mark, index, 0))
+        pair_start = ((index - segment_start) & 1) == 0
+        pair_start &= letter
+        candidates = np.flatnonzero(pair_start & doubled & ~single)
+        if not len(candidates):
+            single |= pair_start & ~next_letter
+            return letter, pair_start & ~single, single
+        segments = segment_start[candidates]
+        first = candidates[np.r_[True, segments[1:] != segments[:-1]]]
+        single[first] = True
+        segment_mark[first + 1] = True
+    return None
+
+# Застосовує таблицю диграм (256, 256, 2) до масиву великих ASCII-символів.
+# Кожен токен дає два байти; для нелітерних токенів другий байт відкидається маскою.
+# Повертає (масив результату, чи є останній символ одиночною літерою) або None
+def _apply_digraphs(data, lookup):
+    masks = _pair_masks(data)
+    if masks is None:
+        return None
+    letter, pairs, single = masks
+    letter_token = pairs | single
+    positions = np.flatnonzero(letter_token | ~letter)
+    second = data[np.minimum(positions + 1, len(data) - 1)]
+    second[single[positions]] = ord("X")
+    digraphs = lookup[data[positions], second]
+    keep = np.ones((len(positions), 2), dtype=bool)
+    keep[:, 1] = letter_token[positions]
+    return digraphs[keep], bool(single[-1])
+
+# Довжина префікса вікна з самих літер, що закінчується на межі пари. Пари в слові
+# йдуть від його початку, тому всі токени (пари й одиночні літери перед подвоєною),
+# крім останнього, визначені вже всередині вікна; останній може залежати від літер
+# за межею вікна, тож з нього починається наступний фрагмент
+def _paired_prefix(window):
+    masks = _pair_masks(window)
+    if masks is not None:
+        _, pairs, single = masks
+        last = int(np.flatnonzero(pairs | single)[-1])
+    else:
+        # Забагато подвоєних літер для векторизованого формування пар — прохід циклом
+        position = last = 0
+        while position < len(window):
+            last = position
+            doubled = position + 1 < len(window) and window[position] == window[position + 1]
+            position += 1 if doubled else 2
+    return last or len(window)
+
+# Ділить масив на фрагменти, що закінчуються нелітерою (пара ніколи не перетинає межу),
+# а якщо у вікні немає нелітер — межею пари (_paired_prefix): обрізання посеред слова
+# зсунуло б парність пар після подвоєної літери.
+# З таблицею translate (256 кодів) кожен фрагмент перекодовується окремо, тож копія
+# має розмір фрагмента, а не всього масиву
+def _vector_chunks(data, translate=None):
+    start = 0
+    while start < len(data):
+        end = min(len(data), start + VECTOR_CHUNK_SIZE)
+        window = data[start:end] if translate is None else translate[data[start:end]]
+        if end < len(data):
+            breaks = np.flatnonzero((window < 65) | (window > 90))
+            if len(breaks):
+                window = window[:int(breaks[-1]) + 1]
+            else:
+                window = window[:_paired_prefix(window)]
+        yield window
+        start += len(window)
+
+# Скомпільований ключ Playfair: усі 625 відповідностей диграм для шифрування
+# та дешифрування обчислюються один раз, основний цикл — лише пошук у таблиці
+class PlayfairKey:
+    def __init__(self, keyword):
+        self.cipher_table = generate_cipher_table(keyword)
+        self.encrypt_map = {}
+        self.decrypt_map = {}
+        for a in self.cipher_table:
+            for b in self.cipher_table:
+                self.encrypt_map[a + b] = transform_pair(self.cipher_table, a, b, 1)
+                self.decrypt_map[a + b] = transform_pair(self.cipher_table, a, b, -1)
+        # Одиночна літера доповнюється "X", як у split_text
+        for a in string.ascii_uppercase:
+            self.encrypt_map[a] = self.encrypt_map.get(a + "X", a + "X")
+            self.decrypt_map[a] = self.decrypt_map.get(a + "X", a + "X")
+        self.encrypt_lookup = self._lookup(self.encrypt_map)
+        self.decrypt_lookup = self._lookup(self.decrypt_map)
+
+    # Таблиця (256, 256, 2) кодів диграм для векторизованого шляху: для пари літер —
+    # зашифрована диграма (пари з J — без змін), для нелітери — сам символ
+    @staticmethod
+    def _lookup(mapping):
+        codes = np.arange(256, dtype=np.uint8)
+        lookup = np.empty((256, 256, 2), dtype=np.uint8)
+        lookup[:, :, 0] = codes[:, None]
+        lookup[:, :, 1] = codes[None, :]
+        for a in string.ascii_uppercase:
+            for b in string.ascii_uppercase:
+                digraph = mapping.get(a + b, a + b)
+                lookup[ord(a), ord(b)] = (ord(digraph[0]), ord(digraph[1]))
+        return lookup
+
+    # Підставляє диграми в текст, уже приведений до верхнього регістру із заміною J -> I.
+    # ASCII-текст обробляється векторизовано (NumPy), інакше — через токени регулярного
+    # виразу та словник; невідомі токени (нелітери, пари з J) без змін.
+    # Повертає (результат, чи закінчується текст одиночною літерою, доповненою "X")
+    def substitute(self, text, decrypt=False):
+        mapping = self.decrypt_map if decrypt else self.encrypt_map
+        lookup = self.decrypt_lookup if decrypt else self.encrypt_lookup
+        if text.isascii():
+            data = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+            parts = []
+            ends_with_single = False
+            for chunk in _vector_chunks(data):
+                applied = _apply_digraphs(chunk, lookup)
+                if applied is None:
+                    break
+                out, ends_with_single = applied
+                parts.append(out.tobytes())
+            else:
+                return b"".join(parts).decode("ascii"), ends_with_single
+        tokens = _TOKEN_RE.findall(text)
+        ends_with_single = bool(tokens) and tokens[-1] in string.ascii_uppercase and len(tokens[-1]) == 1
+        return "".join(map(mapping.get, tokens, tokens)), ends_with_single
+
+    def _apply(self, text, decrypt):
+        text = text.replace("J", "I").upper()
+        result, _ = self.substitute(text, decrypt)
+        # Останній нелітерний символ доповнюється "X", як у split_text
+        if text and text[-1] not in string.ascii_uppercase:
+            result += "X"
+        return result
+
+    def encrypt(self, text):
+        return self._apply(text, decrypt=False)
+
+    def decrypt(self, encrypted_text):
+        return self._apply(encrypted_text, decrypt=True).replace("X", "")
+
+# Кеш скомпільованих ключів за ключовим словом
+PLAN_CACHE_SIZE = 128
+compile_playfair_key = lru_cache(maxsize=PLAN_CACHE_SIZE)(PlayfairKey)
+
 # Шифрування Playfair
 def playfair_encrypt(text, keyword):
     cipher_table = generate_cipher_table(keyword)
+    if is_square_table(cipher_table):
+        return compile_playfair_key(keyword).encrypt(text)
+
     pairs = split_text(text)
     encrypted = ""
 
@@ -55,24 +267,16 @@ def playfair_encrypt(text, keyword):
             encrypted += a + b
             continue
 
-        row_a, col_a = divmod(cipher_table.index(a), 5)
-        row_b, col_b = divmod(cipher_table.index(b), 5)
-
-        if row_a == row_b:
-            encrypted += cipher_table[row_a * 5 + (col_a + 1) % 5]
-            encrypted += cipher_table[row_b * 5 + (col_b + 1) % 5]
-        elif col_a == col_b:
-            encrypted += cipher_table[((row_a + 1) % 5) * 5 + col_a]
-            encrypted += cipher_table[((row_b + 1) % 5) * 5 + col_b]
-        else:
-            encrypted += cipher_table[row_a * 5 + col_b]
-            encrypted += cipher_table[row_b * 5 + col_a]
+        encrypted += transform_pair(cipher_table, a, b, 1)
 
     return encrypted
 
 # Дешифрування Playfair
 def playfair_decrypt(encrypted_text, keyword):
     cipher_table = generate_cipher_table(keyword)
+    if is_square_table(cipher_table):
+        return compile_playfair_key(keyword).decrypt(encrypted_text)
+
     pairs = split_text(encrypted_text)
     decrypted = ""
 
@@ -86,20 +290,358 @@ def playfair_decrypt(encrypted_text, keyword):
             decrypted += a + b
             continue
 
-        row_a, col_a = divmod(cipher_table.index(a), 5)
-        row_b, col_b = divmod(cipher_table.index(b), 5)
+        decrypted += transform_pair(cipher_table, a, b, -1)
+
+    return decrypted.replace("X", "")
+
+# Пакетний Playfair: багато повідомлень, багато ключів або пари (див. vigenere.broadcast_batch).
+# Повідомлення пакуються в масив (кількість, ширина + 1): нульовий стовпець праворуч
+# відокремлює рядки, тому формування пар (_pair_masks) виконується одним проходом
+# по всьому плаский масиву так само, як для кожного повідомлення окремо. Диграми беруться
+# зі стеку таблиць 26x26 скомпільованих ключів за номером ключа рядка.
+# Повідомлення не з ASCII та ключі, що не дають квадрат 5x5, обробляються поодинці.
+# Повертає список рядків або (буфер, зсуви) при as_buffer=True
+def playfair_batch(messages, keywords, decrypt=False, as_buffer=False):
+    messages, keywords = vigenere.broadcast_batch(messages, keywords)
+    fast = [
+        index for index, (message, keyword) in enumerate(zip(messages, keywords))
+        if message.isascii() and is_square_table(generate_cipher_table(keyword))
+    ]
+    results = _playfair_batch_fast([messages[i] for i in fast], [keywords[i] for i in fast], decrypt)
+    if results is None:
+        fast = []
+    elif len(fast) == len(messages):
+        data, lengths = results
+        return vigenere.unpack_messages(data, lengths, messages, as_buffer)
+    else:
+        data, lengths = results
+        fast_results = vigenere.unpack_messages(data, lengths, [messages[i] for i in fast])
+
+    transform = playfair_decrypt if decrypt else playfair_encrypt
+    output = [None] * len(messages)
+    for index, result in zip(fast, fast_results if fast else []):
+        output[index] = result
+    for index, (message, keyword) in enumerate(zip(messages, keywords)):
+        if output[index] is None:
+            output[index] = transform(message, keyword)
+    if not as_buffer:
+        return output
+    encoded = [result.encode("utf-8") for result in output]
+    return vigenere.unpack_messages(b"".join(encoded), [len(item) for item in encoded], output, True)
+
+# Векторизована частина playfair_batch для ASCII-повідомлень і квадратних ключів.
+# Повертає (байти всіх результатів підряд, довжини результатів) або None,
+# якщо формування пар потребує забагато проходів
+def _playfair_batch_fast(messages, keywords, decrypt):
+    if not messages:
+        return b"", np.zeros(0, dtype=np.int64)
+    prepared = [message.replace("J", "I").upper() for message in messages]
+    packed, lengths, mask = vigenere.pack_messages(prepared, extra_columns=1)
+    width = packed.shape[1]
+    flat = packed.ravel()
+    masks = _pair_masks(flat)
+    if masks is None:
+        return None
+    letter, pairs, single = masks
+    letter_token = pairs | single
+    positions = np.flatnonzero(letter_token | (~letter & mask.ravel()))
+    rows = positions // width
+    token_letter = letter_token[positions]
+
+    unique = {}
+    key_of_row = np.array([unique.setdefault(keyword, len(unique)) for keyword in keywords], dtype=np.int64)
+    compiled = [compile_playfair_key(keyword) for keyword in unique]
+    lookups = np.stack([
+        (key.decrypt_lookup if decrypt else key.encrypt_lookup)[65:91, 65:91] for key in compiled
+    ])
+
+    digraphs = np.zeros((len(positions), 2), dtype=np.uint8)
+    digraphs[:, 0] = flat[positions]
+    letter_positions = positions[token_letter]
+    second = flat[letter_positions + 1]
+    second[single[letter_positions]] = ord("X")
+    digraphs[token_letter] = lookups[
+        key_of_row[rows[token_letter]], flat[letter_positions] - 65, second - 65
+    ]
+    keep = np.ones((len(positions), 2), dtype=bool)
+    keep[:, 1] = token_letter
+    result = digraphs[keep]
+    result_rows = np.repeat(rows, 1 + token_letter)
+
+    # Останній нелітерний символ повідомлення доповнюється "X", як у split_text
+    last = packed[np.arange(len(packed)), np.maximum(lengths - 1, 0)]
+    padded = (lengths > 0) & ~((last >= 65) & (last <= 90))
+    if decrypt:
+        kept = result != ord("X")
+        result, result_rows = result[kept], result_rows[kept]
+    else:
+        ends = np.cumsum(np.bincount(result_rows, minlength=len(packed)))
+        result = np.insert(result, ends[padded], ord("X"))
+        result_rows = np.insert(result_rows, ends[padded], np.flatnonzero(padded))
+    return result.tobytes(), np.bincount(result_rows, minlength=len(packed))
+
+# Підготовка байтів як у PlayfairKey._apply (replace("J", "I"), потім upper()):
+# малі літери -> великі, J -> I (мала j стає J, як і в рядковій версії)
+PREPARE_BYTES = np.arange(256, dtype=np.uint8)
+PREPARE_BYTES[97:123] -= 32
+PREPARE_BYTES[ord("J")] = ord("I")
+
+# Playfair для буфера ASCII-байтів (bytes, bytearray, memoryview, mmap) без перетворення у str.
+# Вхід не копіюється: кожен фрагмент (_vector_chunks) приводиться PREPARE_BYTES окремо,
+# обробляється векторизовано й одразу дописується в out; результат збігається
+# з playfair_encrypt / playfair_decrypt для ASCII-тексту. Лише фрагмент, для якого
+# векторизоване формування пар потребує забагато проходів (довгі ряди подвоєних літер),
+# обробляється через PlayfairKey.substitute з проміжним рядком (latin-1, байт = символ).
+# Довжина результату наперед невідома: для шифрування out має вміщати до 2 * len(data) + 1 байтів.
+# out не може перекриватися з data. Повертає масив uint8 з результатом (зріз out)
+def _playfair_buffer(data, keyword, out, decrypt):
+    if not is_square_table(generate_cipher_table(keyword)):
+        raise ValueError("Ключове слово має давати таблицю 5x5 з різних великих літер")
+    key = compile_playfair_key(keyword)
+    lookup = key.decrypt_lookup if decrypt else key.encrypt_lookup
+    data = buffers.as_byte_array(data)
+    writer = buffers.ByteWriter(out)
+    for chunk in _vector_chunks(data, PREPARE_BYTES):
+        applied = _apply_digraphs(chunk, lookup)
+        if applied is None:
+            result, _ = key.substitute(chunk.tobytes().decode("latin-1"), decrypt)
+            part = np.frombuffer(result.encode("latin-1"), dtype=np.uint8)
+        else:
+            part, _ = applied
+        writer.write(part[part != ord("X")] if decrypt else part)
+    # Останній нелітерний символ доповнюється "X" (при дешифруванні він однаково видаляється)
+    if not decrypt and len(data) and not 65 <= PREPARE_BYTES[data[-1]] <= 90:
+        writer.write(np.array([ord("X")], dtype=np.uint8))
+    return writer.result()
+
+def playfair_encrypt_buffer(data, keyword, out=None):
+    return _playfair_buffer(data, keyword, out, decrypt=False)
+
+def playfair_decrypt_buffer(data, keyword, out=None):
+    return _playfair_buffer(data, keyword, out, decrypt=True)
+
+# Розмір фрагмента для потокової обробки
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Потоковий Playfair: генератор, що отримує фрагменти тексту та видає результат частинами.
+# Стан між фрагментами — лише одна непарна літера в кінці фрагмента (вона може утворити
+# пару з першим символом наступного), тому пам'ять не залежить від розміру входу.
+# Результат збігається з playfair_encrypt / playfair_decrypt для всього тексту
+def playfair_stream(chunks, keyword, decrypt=False):
+    cipher_table = generate_cipher_table(keyword)
+    if not is_square_table(cipher_table):
+        raise ValueError("Ключове слово має давати таблицю 5x5 з різних великих літер")
+    key = compile_playfair_key(keyword)
+    pending = ""
+    last_char = ""
+    for chunk in chunks:
+        text = pending + chunk.replace("J", "I").upper()
+        if not text:
+            continue
+        result, ends_with_single = key.substitute(text, decrypt)
+        pending = ""
+        if ends_with_single:
+            # Остання літера ще не має пари: відкладаємо її до наступного фрагмента
+            result = result[:-2]
+            pending = text[-1]
+        last_char = text[-1]
+        yield result.replace("X", "") if decrypt else result
+
+    if pending:
+        result, _ = key.substitute(pending, decrypt)
+        yield result.replace("X", "") if decrypt else result
+    # Останній нелітерний символ доповнюється "X" (при дешифруванні він однаково видаляється)
+    if not decrypt and last_char and last_char not in string.ascii_uppercase:
+        yield "X"
 
-        if row_a == row_b:
-            decrypted += cipher_table[row_a * 5 + (col_a - 1) % 5]
-            decrypted += cipher_table[row_b * 5 + (col_b - 1) % 5]
-        elif col_a == col_b:
-            decrypted += cipher_table[((row_a - 1) % 5) * 5 + col_a]
-            decrypted += cipher_table[((row_b - 1) % 5) * 5 + col_b]
+# Потокове шифрування/дешифрування файлу Playfair з обмеженим використанням пам'яті
+def playfair_file_stream(input_filename, output_filename, keyword, decrypt=False,
+                         chunk_size=STREAM_CHUNK_SIZE):
+    # Відкриття виходу на запис обрізало б вхід ще до читання
+    if os.path.exists(output_filename) and os.path.samefile(input_filename, output_filename):
+        raise ValueError(f"Вхідний і вихідний файли збігаються: {output_filename}")
+    with open(input_filename, "r") as source, open(output_filename, "w") as destination:
+        chunks = iter(lambda: source.read(chunk_size), "")
+        for part in playfair_stream(chunks, keyword, decrypt):
+            destination.write(part)
+
+# Криптоаналіз: пошук квадрата 5x5 імітацією відпалу з квадграмною оцінкою.
+# Квадрат — масив 25 кодів літер (0..25 без J), шифротекст — масив кодів диграм.
+# Кандидат розшифровується векторно за позиціями літер у квадраті, без рядків.
+# Успішний запуск відпалу знаходить ключ за перші десятки тисяч кроків, невдалий застигає
+# у чужому мінімумі, тому замість кількох довгих запусків — багато коротших, а пошук
+# зупиняється, щойно оцінка досягла ANNEALING_TARGET
+SQUARE_LETTERS = np.array([ord(c) - 65 for c in string.ascii_uppercase if c != "J"], dtype=np.int64)
+ANNEALING_RESTARTS = 64
+ANNEALING_STEPS = 100000
+# Початкова температура на 100 квадграм шифротексту (знижується лінійно до нуля)
+ANNEALING_TEMPERATURE = 1.0
+# Середня оцінка на квадграму (таблиця playfair_quadgram_table), вище якої текст уже
+# англійський: правильний ключ дає близько -0.95, частково правильний квадрат — -1.2,
+# випадковий — нижче -1.5
+ANNEALING_TARGET = -1.0
+# Частка ходів, що міняють місцями рядки або стовпці (решта — обмін двох літер)
+ROW_COLUMN_MOVE_RATE = 0.1
+# Як часто (у кроках) перевіряти бюджет часу та сигнал дострокової зупинки
+CHECK_INTERVAL = 256
+
+# Стан процесу пошуку: коди шифротексту, таблиця квадграм, подія зупинки
+_search_cipher = None
+_search_table = None
+_search_stop = None
+
+# Ініціалізатор робочого процесу (table — посилання ngram_fitness.table_reference)
+def _init_annealing(cipher, table, stop):
+    global _search_cipher, _search_table, _search_stop
+    _search_cipher, _search_table, _search_stop = cipher, ngram_fitness.resolve_table(table), stop
+
+# Таблиця квадграм для оцінки розшифрувань Playfair. Відкритий текст після розшифрування
+# містить вставлені X (між подвоєними літерами, перед нелітерами, у кінці) і I замість J,
+# тому таблиця будується з корпусу, підготовленого так само: шифрування квадратом
+# алфавіту й розшифрування тим самим квадратом дає корпус саме з такими вставками.
+# Будується в пам'яті один раз на процес для кожного корпусу
+@lru_cache(maxsize=4)
+def playfair_quadgram_table(corpus_path=None):
+    corpus = read_text_from_file(corpus_path or ngram_fitness.default_corpus_path())
+    prepared = decrypt_codes(cipher_letter_codes(playfair_encrypt(corpus, "")), SQUARE_LETTERS)
+    table = ngram_fitness.build_quadgram_table((prepared + 65).astype(np.uint8).tobytes())
+    table.flags.writeable = False
+    return table
+
+# Літерні коди шифротексту парної довжини (нелітери відкидаються, J -> I)
+def cipher_letter_codes(ciphertext):
+    codes = ngram_fitness.letters_only(ngram_fitness.text_to_codes(ciphertext)).astype(np.int64)
+    codes[codes == 9] = 8
+    return codes[: len(codes) & ~1]
+
+# Для кожної пари позицій квадрата (i, j), i * 25 + j — позиції розшифрованих літер.
+# Залежить лише від геометрії 5x5, тому обчислюється один раз для всіх квадратів
+def _digraph_positions():
+    row, column = np.divmod(np.arange(25), 5)
+    row_a, row_b = np.meshgrid(row, row, indexing="ij")
+    column_a, column_b = np.meshgrid(column, column, indexing="ij")
+    same_row = row_a == row_b
+    same_column = (column_a == column_b) & ~same_row
+    # Прямокутник: рядок власний, стовпець партнера; у рядку — зсув ліворуч, у стовпці — вгору
+    first = np.where(same_row, row_a * 5 + (column_a - 1) % 5,
+                     np.where(same_column, (row_a - 1) % 5 * 5 + column_a, row_a * 5 + column_b))
+    second = np.where(same_row, row_b * 5 + (column_b - 1) % 5,
+                      np.where(same_column, (row_b - 1) % 5 * 5 + column_b, row_b * 5 + column_a))
+    return first.ravel(), second.ravel()
+
+DECRYPT_FIRST, DECRYPT_SECOND = _digraph_positions()
+
+# Розшифрування масиву літерних кодів квадратом square: позиції літер у квадраті
+# дають індекс пари позицій, за яким беруться готові позиції відкритого тексту.
+# Повертає масив літерних кодів тієї ж довжини
+def decrypt_codes(cipher, square):
+    position = np.zeros(26, dtype=np.int64)
+    position[square] = np.arange(25)
+    pair = position[cipher[0::2]] * 25 + position[cipher[1::2]]
+    plain = np.empty_like(cipher)
+    plain[0::2] = square[DECRYPT_FIRST[pair]]
+    plain[1::2] = square[DECRYPT_SECOND[pair]]
+    return plain
+
+# Оцінка квадрата для шифротексту процесу
+def _score_square(square):
+    return ngram_fitness.score_letters(decrypt_codes(_search_cipher, square), _search_table)
+
+# Випадковий сусідній квадрат: обмін двох літер, двох рядків або двох стовпців
+def _random_square_move(square, rng):
+    candidate = square.copy()
+    move = rng.random()
+    if move < ROW_COLUMN_MOVE_RATE:
+        first, second = rng.integers(5, size=2)
+        grid = candidate.reshape(5, 5)
+        if move < ROW_COLUMN_MOVE_RATE / 2:
+            grid[[first, second]] = grid[[second, first]]
         else:
-            decrypted += cipher_table[row_a * 5 + col_b]
-            decrypted += cipher_table[row_b * 5 + col_a]
+            grid[:, [first, second]] = grid[:, [second, first]]
+    else:
+        first, second = rng.integers(25, size=2)
+        candidate[[first, second]] = candidate[[second, first]]
+    return candidate
 
-    return decrypted.replace("X", "")
+# Один запуск імітації відпалу з випадкового квадрата. Гірший хід приймається з
+# імовірністю exp(delta / T), температура лінійно спадає до нуля за steps кроків.
+# Зупинка — після steps кроків, після deadline (time.monotonic()) або коли оцінка
+# на квадграму досягла target (тоді виставляється спільна подія зупинки).
+# Повертає (оцінка, квадрат як рядок літер)
+def _anneal(seed, steps, deadline, target):
+    rng = np.random.default_rng(seed)
+    square = rng.permutation(SQUARE_LETTERS)
+    score = _score_square(square)
+    best_score, best = score, square
+    quadgrams = max(1, len(_search_cipher) - 3)
+    initial_temperature = ANNEALING_TEMPERATURE * quadgrams / 100
+    for step in range(steps):
+        if step % CHECK_INTERVAL == 0 and (time.monotonic() > deadline or _search_stop.is_set()):
+            break
+        candidate = _random_square_move(square, rng)
+        candidate_score = _score_square(candidate)
+        delta = candidate_score - score
+        temperature = initial_temperature * (1 - step / steps)
+        if delta >= 0 or (temperature > 0 and rng.random() < math.exp(delta / temperature)):
+            square, score = candidate, candidate_score
+            if score > best_score:
+                best_score, best = score, square
+                if target is not None and best_score / quadgrams >= target:
+                    _search_stop.set()
+                    break
+    return best_score, "".join(chr(65 + code) for code in best)
+
+# Пошук ключа Playfair без знання ключового слова.
+# restarts незалежних запусків відпалу розподіляються між процесами (workers=1 — без пулу).
+# time_budget — обмеження часу в секундах на весь пошук; target — середня оцінка на
+# квадграму, після досягнення якої всі запуски зупиняються (None — виконати всі запуски).
+# table за замовчуванням — playfair_quadgram_table().
+# Реалістичний бюджет: запуск (100 тис. кроків) на одному ядрі триває 4-5 с і знаходить
+# ключ для plaintext.txt (~1800 літер) приблизно в кожному десятому випадку, тож на 1 CPU
+# пошук зазвичай займає 20-120 с (усі 64 запуски — до ~5 хв); time_budget менше
+# за ~2 хв на ядро ключ не гарантує.
+# Повертає словник з ключами keyword (квадрат 5x5 рядком — придатний як ключ
+# playfair_decrypt), score, plaintext
+def break_playfair(ciphertext, restarts=ANNEALING_RESTARTS, steps=ANNEALING_STEPS, workers=None,
+                   time_budget=None, target=ANNEALING_TARGET, seed=0, table=None):
+    global _search_cipher, _search_table, _search_stop
+    if table is None:
+        table = playfair_quadgram_table()
+    cipher = cipher_letter_codes(ciphertext)
+    if len(cipher) < 4:
+        raise ValueError("Шифротекст закороткий для пошуку ключа")
+    deadline = time.monotonic() + time_budget if time_budget is not None else math.inf
+    tasks = [(seed * restarts + restart, steps, deadline, target) for restart in range(restarts)]
+
+    if workers == 1:
+        _init_annealing(cipher, table, multiprocessing.Event())
+        results = []
+        for task in tasks:
+            results.append(_anneal(*task))
+            if _search_stop.is_set() or time.monotonic() > deadline:
+                break
+    else:
+        stop = multiprocessing.Event()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_annealing,
+                                 initargs=(cipher, ngram_fitness.table_reference(table), stop)) as pool:
+            pending = {pool.submit(_anneal, *task) for task in tasks}
+            results = []
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+                # Запуски, що ще не стартували, після зупинки не потрібні
+                if stop.is_set() or time.monotonic() > deadline:
+                    for future in pending:
+                        future.cancel()
+                    results.extend(future.result() for future in pending if not future.cancelled())
+                    break
+
+    score, keyword = max(results)
+    return {
+        "keyword": keyword,
+        "score": score,
+        "plaintext": playfair_decrypt(ciphertext, keyword),
+    }
 
 # Зчитування тексту з файлу
 def read_text_from_file(filename):
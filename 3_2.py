@@ -1,5 +1,17 @@
+from functools import lru_cache
+import importlib
+import os
+import re
 import string
 
+import numpy as np
+
+import buffers
+
+# Модуль 2_1.py (ім'я починається з цифри, тому імпортуємо через importlib):
+# з нього беремо просту перестановку для етапу TranspositionStage
+transposition = importlib.import_module("2_1")
+
 
 # Зчитування тексту з файлу
 def read_plain_text(filename):
@@ -71,6 +83,267 @@ def playfair_encrypt(text, table):
     return encrypted
 
 
+# Розмір фрагмента для потокового конвеєра
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Символи, які видаляє попереднє очищення в playfair_encrypt
+CLEANUP_DELETE = " .',-"
+
+
+# Етап Віженера (як vigenere_encrypt: індекс ключа — позиція символу в усьому тексті).
+# Для кожної фази ключа є таблиця str.translate; фаза кожного символу визначається
+# його абсолютною позицією, тому між фрагментами зберігається лише лічильник позицій
+class VigenereStage:
+    def __init__(self, key):
+        self.key = key
+        self.position = 0
+        upper = string.ascii_uppercase
+        lower = string.ascii_lowercase
+        self.tables = []
+        for char in key:
+            shift = (ord(char.upper()) - ord("A")) % 26
+            self.tables.append(str.maketrans(
+                upper + lower, upper[shift:] + upper[:shift] + lower[shift:] + lower[:shift]
+            ))
+
+    def process(self, chunk):
+        key_length = len(self.key)
+        offset = self.position
+        self.position += len(chunk)
+        if not chunk.isascii():
+            # Не ASCII-літери обробляємо так само, як vigenere_encrypt
+            return vigenere_encrypt_from(chunk, self.key, offset)
+        result = list(chunk)
+        for phase in range(min(key_length, len(chunk))):
+            result[phase::key_length] = chunk[phase::key_length].translate(
+                self.tables[(offset + phase) % key_length]
+            )
+        return "".join(result)
+
+    def finish(self):
+        return ""
+
+
+# Шифрування Віженера, що починається з позиції offset (для потокової обробки)
+def vigenere_encrypt_from(plaintext, key, offset):
+    encrypted = ""
+    key_length = len(key)
+    for i, char in enumerate(plaintext, start=offset):
+        if char.isalpha():
+            shift = ord(key[i % key_length].upper()) - ord("A")
+            if char.isupper():
+                encrypted += chr((ord(char) - ord("A") + shift) % 26 + ord("A"))
+            else:
+                encrypted += chr((ord(char) - ord("a") + shift) % 26 + ord("a"))
+        else:
+            encrypted += char
+    return encrypted
+
+
+# Етап очищення (як у playfair_encrypt): верхній регістр, J -> I, видалення " .',-"
+class CleanupStage:
+    table = str.maketrans({"J": "I", **{char: None for char in CLEANUP_DELETE}})
+
+    def process(self, chunk):
+        return chunk.upper().translate(self.table)
+
+    def finish(self):
+        return ""
+
+
+# Таблиця диграм для таблиці Playfair з 3_2.py (пари без обробки подвоєних літер)
+@lru_cache(maxsize=128)
+def compile_digraphs(table):
+    digraphs = {}
+    for a in table:
+        for b in table:
+            row_a, col_a = divmod(table.index(a), 5)
+            row_b, col_b = divmod(table.index(b), 5)
+            if row_a == row_b:
+                digraphs[a + b] = table[row_a * 5 + (col_a + 1) % 5] + table[row_b * 5 + (col_b + 1) % 5]
+            elif col_a == col_b:
+                digraphs[a + b] = table[((row_a + 1) % 5) * 5 + col_a] + table[((row_b + 1) % 5) * 5 + col_b]
+            else:
+                digraphs[a + b] = table[row_a * 5 + col_b] + table[row_b * 5 + col_a]
+    return digraphs
+
+
+_PAIRS_RE = re.compile(".{2}", re.DOTALL)
+
+
+# Етап Playfair (як playfair_encrypt після очищення): текст ділиться на пари підряд,
+# непарний символ фрагмента переноситься до наступного, в кінці доповнюється "X".
+# ASCII-текст обробляється векторизовано: код символу -> позиція в таблиці ->
+# індекс диграми -> два байти результату
+class PlayfairStage:
+    def __init__(self, table):
+        self.digraphs = compile_digraphs(tuple(table))
+        self.pending = ""
+        self.positions = np.full(256, -1, dtype=np.int16)
+        for index, char in enumerate(table):
+            if ord(char) < 128:
+                self.positions[ord(char)] = index
+        self.digraph_codes = np.array(
+            [[ord(c) for c in self.digraphs[a + b]] for a in table for b in table], dtype=np.uint32
+        )
+        self.size = len(table)
+        self.ascii_table = "".join(table).isascii()
+
+    def _substitute(self, text):
+        if text.isascii() and self.ascii_table:
+            positions = self.positions[np.frombuffer(text.encode("ascii"), dtype=np.uint8)]
+            if (positions < 0).any():
+                missing = text[int(np.argmax(positions < 0))]
+                raise ValueError(f"Символу немає в таблиці Playfair: {missing!r}")
+            pairs = positions[0::2].astype(np.intp) * self.size + positions[1::2]
+            return self.digraph_codes[pairs].astype(np.uint8).tobytes().decode("ascii")
+        try:
+            return "".join(map(self.digraphs.__getitem__, _PAIRS_RE.findall(text)))
+        except KeyError as error:
+            raise ValueError(f"Символу немає в таблиці Playfair: {error}") from None
+
+    def process(self, chunk):
+        text = self.pending + chunk
+        if len(text) % 2:
+            text, self.pending = text[:-1], text[-1]
+        else:
+            self.pending = ""
+        return self._substitute(text)
+
+    def finish(self):
+        if not self.pending:
+            return ""
+        text, self.pending = self.pending + "X", ""
+        return self._substitute(text)
+
+
+# Етап простої перестановки (2_1.py) блоками фіксованого розміру:
+# кожен повний блок переставляється окремо, останній доповнюється символом padding
+# (за замовчуванням '@', як у 2_1.py; перед Playfair варто обрати літеру, наприклад "X")
+class TranspositionStage:
+    def __init__(self, keyword, block_size=STREAM_CHUNK_SIZE, padding="@"):
+        self.keyword = keyword
+        self.block_size = transposition.align_block_size(block_size, len(keyword))
+        self.padding = padding
+        self.buffer = ""
+
+    def _encrypt(self, block):
+        if block.isascii():
+            data = np.frombuffer(block.encode("ascii"), dtype=np.uint8)
+            return transposition.transposition_encrypt_array(data, self.keyword).tobytes().decode("ascii")
+        return transposition.encrypt_transposition(block, self.keyword)
+
+    def process(self, chunk):
+        self.buffer += chunk
+        full = len(self.buffer) - len(self.buffer) % self.block_size
+        blocks, self.buffer = self.buffer[:full], self.buffer[full:]
+        return "".join(
+            self._encrypt(blocks[i:i + self.block_size]) for i in range(0, full, self.block_size)
+        )
+
+    def finish(self):
+        block, self.buffer = self.buffer, ""
+        if not block:
+            return ""
+        block += self.padding * (-len(block) % len(self.keyword))
+        return self._encrypt(block)
+
+
+# Потоковий конвеєр етапів: кожен фрагмент проходить усі етапи підряд,
+# тому проміжні результати мають розмір фрагмента, а не всього тексту.
+# Етапи можна переставляти та комбінувати (наприклад, Віженер + перестановка + Playfair)
+def run_pipeline(stages, chunks):
+    for chunk in chunks:
+        for stage in stages:
+            chunk = stage.process(chunk)
+        if chunk:
+            yield chunk
+    # Завершення: залишок кожного етапу проходить через наступні етапи
+    for i, stage in enumerate(stages):
+        chunk = stage.finish()
+        for following in stages[i + 1:]:
+            chunk = following.process(chunk)
+        if chunk:
+            yield chunk
+
+
+# Етапи каскаду з основного блоку: Віженер -> очищення -> Playfair
+def cascade_stages(vigenere_key, playfair_key):
+    return [VigenereStage(vigenere_key), CleanupStage(), PlayfairStage(create_playfair_table(playfair_key))]
+
+
+# Розмір фрагмента для каскаду над буфером байтів
+BUFFER_CHUNK_SIZE = 1 << 20
+
+# Байти, які видаляє попереднє очищення (CLEANUP_DELETE)
+CLEANUP_DELETE_BYTES = np.zeros(256, dtype=bool)
+CLEANUP_DELETE_BYTES[np.frombuffer(CLEANUP_DELETE.encode("ascii"), dtype=np.uint8)] = True
+
+
+# Каскад Віженер -> очищення -> Playfair для буфера ASCII-байтів (bytes, bytearray,
+# memoryview, mmap) без перетворення у str; результат збігається з cascade_encrypt.
+# Фрагменти обробляються векторизовано: зсув Віженера за абсолютною позицією байта
+# (одразу у верхньому регістрі), J -> I, видалення " .',-", пари через PlayfairStage;
+# непарний байт фрагмента переноситься до наступного. Результат дописується в out
+# (щонайбільше len(data) + 1 байтів, out не може перекриватися з data).
+# Повертає масив uint8 з результатом (зріз out)
+def cascade_encrypt_buffer(data, vigenere_key, playfair_key, out=None, chunk_size=BUFFER_CHUNK_SIZE):
+    data = buffers.as_byte_array(data)
+    stage = PlayfairStage(create_playfair_table(playfair_key))
+    if not stage.ascii_table:
+        raise ValueError("Таблиця Playfair має складатися з ASCII-символів")
+    shifts = np.array([(ord(char.upper()) - ord("A")) % 26 for char in vigenere_key], dtype=np.uint8)
+    writer = buffers.ByteWriter(out)
+    pending = np.empty(0, dtype=np.uint8)
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        phase = (start + np.arange(len(chunk))) % len(shifts)
+        upper = chunk & 0xDF
+        letter = (upper >= 65) & (upper <= 90) & (chunk < 128)
+        shifted = np.where(letter, (upper - 65 + shifts[phase]) % 26 + 65, chunk).astype(np.uint8)
+        shifted[shifted == ord("J")] = ord("I")
+        cleaned = np.concatenate((pending, shifted[~CLEANUP_DELETE_BYTES[shifted]]))
+        even = len(cleaned) - len(cleaned) % 2
+        pending = cleaned[even:]
+        writer.write(_cascade_pairs(stage, cleaned[:even]))
+    if len(pending):
+        writer.write(_cascade_pairs(stage, np.append(pending, np.uint8(ord("X")))))
+    return writer.result()
+
+
+# Заміна пар байтів диграмами таблиці етапу Playfair (як PlayfairStage._substitute)
+def _cascade_pairs(stage, cleaned):
+    positions = stage.positions[cleaned]
+    if (positions < 0).any():
+        missing = chr(cleaned[int(np.argmax(positions < 0))])
+        raise ValueError(f"Символу немає в таблиці Playfair: {missing!r}")
+    pairs = positions[0::2].astype(np.intp) * stage.size + positions[1::2]
+    return stage.digraph_codes[pairs].astype(np.uint8).ravel()
+
+
+# Каскадне шифрування тексту за один прохід (результат як у двокрокового варіанту)
+def cascade_encrypt(text, vigenere_key, playfair_key, chunk_size=STREAM_CHUNK_SIZE):
+    chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    return "".join(run_pipeline(cascade_stages(vigenere_key, playfair_key), chunks))
+
+
+# Потокове каскадне шифрування файлу з постійним використанням пам'яті
+def cascade_encrypt_file(input_filename, output_filename, stages, chunk_size=STREAM_CHUNK_SIZE):
+    # Відкриття виходу на запис обрізало б вхід ще до читання
+    if os.path.exists(output_filename) and os.path.samefile(input_filename, output_filename):
+        raise ValueError(f"Вхідний і вихідний файли збігаються: {output_filename}")
+    with open(input_filename, "r") as source, open(output_filename, "w") as destination:
+        chunks = iter(lambda: source.read(chunk_size), "")
+        for part in run_pipeline(stages, chunks):
+            destination.write(part)
+
+
+# Двокрокове каскадне шифрування (як в основному блоці) — еталон для cascade_encrypt;
+# порівняння швидкості обох варіантів — у benchmark.py
+def cascade_encrypt_two_step(text, vigenere_key, playfair_key):
+    return playfair_encrypt(vigenere_encrypt(text, vigenere_key), create_playfair_table(playfair_key))
+
+
 # Основний блок виконання
 if __name__ == "__main__":
     plaintext_filename = "plaintext.txt"
@@ -87,4 +360,4 @@ if __name__ == "__main__":
     playfair_table = create_playfair_table(playfair_key)
     playfair_encrypted = playfair_encrypt(vigenere_encrypted, playfair_table)
     playfair_encrypted += "."  # Додаємо крапку назад
-    print(f"Додатково зашифровано Playfair:\n{playfair_encrypted}")
\ No newline at end of file
+    print(f"Додатково зашифровано Playfair:\n{playfair_encrypted}")
@@ -0,0 +1,354 @@
+"""
+Набір тестів пропускної здатності для всіх шифрів і аналізаторів.
+
+Корпуси детерміновано генеруються з plaintext.txt (1KB, 1MB, 100MB, 1GB). Для кожної
+функції вимірюється швидкість (МБ/с), перцентилі затримки на малих повідомленнях і пікове
+використання пам'яті (RSS). Кожне вимірювання виконується в окремому процесі, щоб пікова
+пам'ять не накопичувалася між функціями. Результати записуються у JSON і за потреби
+порівнюються з базовим файлом.
+
+Приклади:
+    python benchmark.py --sizes 1KB,1MB --output bench.json
+    python benchmark.py --sizes 1KB,1MB --baseline bench.json --threshold 0.2
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from queue import Empty
+
+CORPUS_SOURCE = "plaintext.txt"
+CORPUS_DIR = "bench_corpora"
+
+SIZES = {
+    "1KB": 1 << 10,
+    "1MB": 1 << 20,
+    "100MB": 100 << 20,
+    "1GB": 1 << 30,
+}
+
+# Кількість повторів для малих повідомлень (для перцентилів затримки)
+LATENCY_ITERATIONS = 200
+LATENCY_SIZE_LIMIT = 64 << 10
+
+
+def _call(module, name, *args):
+    """
+    Створює функцію без аргументів, яка викликає module.name(text, *args).
+
+    Модуль імпортується в процесі вимірювання, тому час імпорту не потрапляє у вимір.
+    """
+    def prepare():
+        function = getattr(importlib.import_module(module), name)
+        return lambda text: function(text, *args)
+    return prepare
+
+
+def _encrypted(module, name, encrypt_module, encrypt_name, *args, encrypt_args=None, as_bytes=False):
+    """
+    Те саме, що _call, але спочатку шифрує корпус (для вимірювання розшифрування).
+
+    :param encrypt_args: аргументи шифрування, якщо вони відрізняються від args
+    :param as_bytes: передавати шифротекст як bytes (для функцій *_buffer)
+    """
+    encrypt_args = args if encrypt_args is None else encrypt_args
+
+    def prepare():
+        encrypt = getattr(importlib.import_module(encrypt_module), encrypt_name)
+        function = getattr(importlib.import_module(module), name)
+        cache = {}
+
+        def run(text):
+            if text not in cache:
+                cache.clear()
+                encrypted = encrypt(text, *encrypt_args)
+                cache[text] = encrypted.encode("utf-8") if as_bytes else encrypted
+            return function(cache[text], *args)
+        return run
+    return prepare
+
+
+# Назва -> (підготовка функції, максимальний розмір корпусу для цієї функції).
+# Еталонні посимвольні реалізації обмежені за розміром, щоб набір завершувався за розумний час.
+CASES = {
+    "vigenere_encrypt": (_call("1_1", "vigenere_encrypt", "CRYPTOGRAPHY"), 100 << 20),
+    "vigenere_decrypt": (_encrypted("1_1", "vigenere_decrypt", "1_1", "vigenere_encrypt", "CRYPTOGRAPHY"), 100 << 20),
+    "vigenere_encrypt_vectorized": (_call("1_1", "vigenere_encrypt_vectorized", "CRYPTOGRAPHY"), 1 << 30),
+    "vigenere_decrypt_vectorized": (_encrypted("1_1", "vigenere_decrypt_vectorized", "1_1", "vigenere_encrypt_vectorized",
+                                               "CRYPTOGRAPHY"), 1 << 30),
+    "encrypt_transposition": (_call("2_1", "encrypt_transposition", "SECRET"), 100 << 20),
+    "decrypt_transposition": (_encrypted("2_1", "decrypt_transposition", "2_1", "encrypt_transposition", "SECRET"), 100 << 20),
+    "encrypt_double_transposition": (_call("2_2", "encrypt_double_transposition", "SECRET", "CRYPTO"), 100 << 20),
+    "encrypt_with_plan": (_call("2_2", "encrypt_with_plan", "SECRET", "CRYPTO"), 1 << 30),
+    "decrypt_double_transposition": (_encrypted("2_2", "decrypt_double_transposition", "2_2",
+                                                "encrypt_double_transposition", "SECRET", "CRYPTO"), 100 << 20),
+    "decrypt_with_plan": (_encrypted("2_2", "decrypt_with_plan", "2_2", "encrypt_with_plan", "SECRET", "CRYPTO"), 1 << 30),
+    # DoubleTranspositionPlan.decrypt_into без перетворення у str
+    "decrypt_double_transposition_buffer": (_encrypted("2_2", "decrypt_double_transposition_buffer", "2_2",
+                                                       "encrypt_with_plan", "SECRET", "CRYPTO", as_bytes=True), 1 << 30),
+    "playfair_encrypt": (_call("3_1", "playfair_encrypt", "MATRIX"), 1 << 30),
+    "playfair_decrypt": (_encrypted("3_1", "playfair_decrypt", "3_1", "playfair_encrypt", "MATRIX"), 1 << 30),
+    "cascade_encrypt": (_call("3_2", "cascade_encrypt", "KEY", "CRYPTO"), 1 << 30),
+    "cascade_encrypt_two_step": (_call("3_2", "cascade_encrypt_two_step", "KEY", "CRYPTO"), 1 << 20),
+    "kasiski_examination": (_call("1_2", "kasiski_examination"), 1 << 20),
+    "kasiski_ranked": (_call("1_2", "kasiski_ranked"), 1 << 30),
+    "analyze_vigenere": (_call("1_2", "analyze_vigenere"), 100 << 20),
+    "friedman_test": (_call("1_2", "friedman_test"), 100 << 20),
+    "find_key": (_encrypted("1_2", "find_key", "1_1", "vigenere_encrypt_vectorized", 12,
+                            encrypt_args=("CRYPTOGRAPHY",)), 100 << 20),
+}
+
+# Найдовше очікування результату одного вимірювання, с
+CASE_TIMEOUT = 3600
+# Як часто перевіряти, чи процес вимірювання ще живий, с
+POLL_INTERVAL = 1.0
+
+
+def parse_size(name):
+    """
+    :param name: назва розміру з SIZES або кількість байтів
+    :return: розмір у байтах
+    """
+    return SIZES[name] if name in SIZES else int(name)
+
+
+def corpus_path(size):
+    """
+    Повертає шлях до детермінованого корпусу заданого розміру, створюючи його за потреби.
+
+    Корпус — це plaintext.txt, повторений до потрібної довжини (останнє повторення обрізається).
+
+    :param size: розмір у байтах
+    :return: шлях до файлу корпусу
+    """
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    path = os.path.join(CORPUS_DIR, f"corpus_{size}.txt")
+    if os.path.exists(path) and os.path.getsize(path) == size:
+        return path
+    with open(CORPUS_SOURCE, "rb") as file:
+        seed = file.read()
+    # Поділяємо повтори пробілом, щоб слова на межах не зливалися
+    seed = seed.rstrip() + b" "
+    block = seed * max(1, (4 << 20) // len(seed))
+    with open(path, "wb") as file:
+        written = 0
+        while written < size:
+            part = block[:size - written]
+            file.write(part)
+            written += len(part)
+    return path
+
+
+def _measure(case, path, queue):
+    """
+    Вимірювання в окремому процесі: швидкість, затримки, пікова пам'ять.
+
+    Виняток вимірювання передається в чергу як {"error": ...}, щоб батьківський процес
+    не чекав результату, якого не буде.
+    """
+    try:
+        queue.put(_measure_case(case, path))
+    except Exception as error:  # Помилку одного вимірювання повідомляємо батьківському процесу
+        queue.put({"error": f"{type(error).__name__}: {error}"})
+
+
+def _measure_case(case, path):
+    """
+    :param case: назва функції з CASES
+    :param path: шлях до корпусу
+    :return: словник з результатами вимірювання
+    """
+    prepare, _ = CASES[case]
+    function = prepare()
+    with open(path, "r") as file:
+        text = file.read()
+    size = len(text.encode("utf-8"))
+
+    # Прогрів (кеші, компіляція планів, підготовка шифротексту)
+    function(text[:LATENCY_SIZE_LIMIT] if size > LATENCY_SIZE_LIMIT else text)
+
+    result = {"bytes": size}
+    if size <= LATENCY_SIZE_LIMIT:
+        latencies = []
+        function(text)
+        for _ in range(LATENCY_ITERATIONS):
+            started = time.perf_counter()
+            function(text)
+            latencies.append(time.perf_counter() - started)
+        quantiles = statistics.quantiles(latencies, n=100)
+        result["latency_us"] = {
+            "p50": quantiles[49] * 1e6,
+            "p95": quantiles[94] * 1e6,
+            "p99": quantiles[98] * 1e6,
+        }
+        seconds = statistics.median(latencies)
+    else:
+        function(text)  # Прогрів для функцій розшифрування (шифротекст кешується)
+        started = time.perf_counter()
+        function(text)
+        seconds = time.perf_counter() - started
+
+    result["seconds"] = seconds
+    result["mb_s"] = size / 1e6 / seconds if seconds > 0 else float("inf")
+    # ru_maxrss у Linux — у кілобайтах, у macOS — у байтах
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["peak_rss_mb"] = peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+    return result
+
+
+def run_case(case, path, timeout=CASE_TIMEOUT):
+    """
+    Запускає одне вимірювання в новому процесі (spawn), щоб пікова пам'ять була незалежною.
+
+    Якщо вимірювання завершилося винятком, процес загинув (OOM, сигнал) або не вклався
+    в timeout, виникає RuntimeError замість нескінченного очікування.
+
+    :param case: назва функції з CASES
+    :param path: шлях до корпусу
+    :param timeout: найдовше очікування результату, с
+    :return: словник з результатами
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(case, path, queue))
+    process.start()
+    deadline = time.monotonic() + timeout
+    result = None
+    try:
+        while result is None:
+            alive = process.is_alive()
+            try:
+                result = queue.get(timeout=POLL_INTERVAL)
+            except Empty:
+                # Результат, надісланий перед завершенням, уже був би в черзі
+                if not alive:
+                    raise RuntimeError(f"{case}: процес вимірювання завершився з кодом {process.exitcode}")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{case}: вимірювання не завершилося за {timeout} с")
+    finally:
+        if result is None and process.is_alive():
+            process.kill()
+        process.join()
+    if "error" in result:
+        raise RuntimeError(f"{case}: {result['error']}")
+    if process.exitcode != 0:
+        raise RuntimeError(f"{case}: процес вимірювання завершився з кодом {process.exitcode}")
+    return result
+
+
+def run_benchmarks(sizes, cases=None, timeout=CASE_TIMEOUT):
+    """
+    Виконує всі вимірювання для заданих розмірів.
+
+    Невдале вимірювання записується як {"error": ...} і не зупиняє решту набору.
+
+    :param sizes: список назв розмірів (наприклад, ["1KB", "1MB"])
+    :param cases: список назв функцій (за замовчуванням — усі)
+    :param timeout: найдовше очікування одного вимірювання, с
+    :return: словник результатів {функція: {розмір: результат}}
+    """
+    results = {}
+    for size_name in sizes:
+        size = parse_size(size_name)
+        path = corpus_path(size)
+        for case in cases or CASES:
+            if size > CASES[case][1]:
+                continue
+            try:
+                result = run_case(case, path, timeout)
+            except RuntimeError as error:
+                results.setdefault(case, {})[size_name] = {"error": str(error)}
+                print(f"{case:36} {size_name:>6}: ERROR {error}", file=sys.stderr)
+                continue
+            results.setdefault(case, {})[size_name] = result
+            print(f"{case:36} {size_name:>6}: {result['mb_s']:10.2f} MB/s, "
+                  f"peak RSS {result['peak_rss_mb']:.1f} MB", file=sys.stderr)
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold, rss_threshold):
+    """
+    Порівнює результати з базовими та повертає список регресій.
+
+    Регресія — це падіння швидкості або зростання затримки p99 більше ніж на threshold,
+    або зростання пікової пам'яті більше ніж на rss_threshold (частки, наприклад 0.1 = 10%).
+    Невдале вимірювання завжди вважається регресією.
+
+    :param results: поточні результати
+    :param baseline: базові результати (той самий формат)
+    :param threshold: допустиме погіршення швидкості та затримки
+    :param rss_threshold: допустиме зростання пікової пам'яті
+    :return: список рядків з описом регресій
+    """
+    regressions = []
+    for case, by_size in results.items():
+        for size_name, current in by_size.items():
+            if "error" in current:
+                regressions.append(f"{case} {size_name}: {current['error']}")
+                continue
+            reference = baseline.get(case, {}).get(size_name)
+            if not reference or "error" in reference:
+                continue
+            if current["mb_s"] < reference["mb_s"] * (1 - threshold):
+                regressions.append(
+                    f"{case} {size_name}: {current['mb_s']:.2f} MB/s < {reference['mb_s']:.2f} MB/s"
+                )
+            if "latency_us" in current and "latency_us" in reference:
+                if current["latency_us"]["p99"] > reference["latency_us"]["p99"] * (1 + threshold):
+                    regressions.append(
+                        f"{case} {size_name}: p99 {current['latency_us']['p99']:.1f} us > "
+                        f"{reference['latency_us']['p99']:.1f} us"
+                    )
+            if current["peak_rss_mb"] > reference["peak_rss_mb"] * (1 + rss_threshold):
+                regressions.append(
+                    f"{case} {size_name}: peak RSS {current['peak_rss_mb']:.1f} MB > "
+                    f"{reference['peak_rss_mb']:.1f} MB"
+                )
+    return regressions
+
+
+def main(argv=None):
+    """
+    Точка входу: запуск набору, запис JSON і порівняння з базовим файлом.
+
+    :param argv: аргументи командного рядка
+    :return: код завершення (1 — якщо знайдено регресії або вимірювання не вдалося)
+    """
+    parser = argparse.ArgumentParser(description="Тести пропускної здатності шифрів")
+    parser.add_argument("--sizes", default="1KB,1MB", help="розміри корпусу через кому: " + ",".join(SIZES))
+    parser.add_argument("--cases", help="функції через кому (за замовчуванням — усі)")
+    parser.add_argument("--output", help="файл для запису результатів JSON")
+    parser.add_argument("--baseline", help="файл з базовими результатами для порівняння")
+    parser.add_argument("--threshold", type=float, default=0.1, help="допустиме погіршення швидкості/затримки")
+    parser.add_argument("--rss-threshold", type=float, default=0.2, help="допустиме зростання пікової пам'яті")
+    parser.add_argument("--timeout", type=float, default=CASE_TIMEOUT, help="найдовше очікування одного вимірювання, с")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes.split(","), args.cases.split(",") if args.cases else None, args.timeout)
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare_with_baseline(results, baseline, args.threshold, args.rss_threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    failed = any("error" in result for by_size in results.values() for result in by_size.values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
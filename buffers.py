@@ -0,0 +1,90 @@
+"""
+Допоміжні функції для API над об'єктами з буферним протоколом (bytes, bytearray,
+memoryview, mmap, масиви NumPy).
+
+Вхідний буфер подається як масив uint8 без копіювання, результат пишеться в буфер
+виклику (out) або в новий масив. Функції *_buffer модулів шифрів повертають масив uint8 —
+зріз out, у якому лежить результат. Якщо out відображає файл (mmap), масив треба звільнити
+(del) до закриття mmap.
+"""
+import numpy as np
+
+
+def as_byte_array(data):
+    """
+    Подає буфер як одновимірний масив uint8 без копіювання.
+
+    :param data: об'єкт з буферним протоколом або масив NumPy
+    :return: масив uint8 над тією самою пам'яттю
+    """
+    if isinstance(data, np.ndarray):
+        return data.reshape(-1).view(np.uint8)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def output_byte_array(out, size):
+    """
+    Масив для запису результату розміру size.
+
+    :param out: буфер для запису (доступний для запису) або None — виділити новий масив
+    :param size: розмір результату в байтах
+    :return: масив uint8 довжиною size (зріз out)
+    """
+    if out is None:
+        return np.empty(size, dtype=np.uint8)
+    array = as_byte_array(out)
+    if not array.flags.writeable:
+        raise ValueError("Буфер результату доступний лише для читання")
+    if len(array) < size:
+        raise ValueError(f"Буфер результату замалий: потрібно {size} байтів, є {len(array)}")
+    return array[:size]
+
+
+def separate_input(data, out):
+    """
+    Копіює вхідний масив, якщо він ділить пам'ять з буфером результату: перестановка
+    читає вхід не по порядку й не може виконуватися на місці.
+
+    :param data: вхідний масив
+    :param out: масив результату
+    :return: data або його копія
+    """
+    return data.copy() if np.may_share_memory(data, out) else data
+
+
+class ByteWriter:
+    """
+    Послідовний запис частин результату, довжина якого наперед невідома
+    (Playfair, каскад). Частини пишуться одразу в out або збираються для np.concatenate.
+    """
+
+    def __init__(self, out=None):
+        self.out = None
+        if out is not None:
+            self.out = as_byte_array(out)
+            if not self.out.flags.writeable:
+                raise ValueError("Буфер результату доступний лише для читання")
+        self.parts = []
+        self.size = 0
+
+    def write(self, part):
+        """
+        Дописує масив uint8 у кінець результату.
+
+        :param part: масив uint8
+        """
+        if self.out is None:
+            self.parts.append(part)
+        elif self.size + len(part) > len(self.out):
+            raise ValueError(f"Буфер результату замалий: потрібно щонайменше {self.size + len(part)} байтів")
+        else:
+            self.out[self.size:self.size + len(part)] = part
+        self.size += len(part)
+
+    def result(self):
+        """
+        :return: масив uint8 із записаним результатом (зріз out)
+        """
+        if self.out is not None:
+            return self.out[:self.size]
+        return np.concatenate(self.parts) if self.parts else np.empty(0, dtype=np.uint8)
@@ -0,0 +1,363 @@
+"""
+Єдиний інтерфейс командного рядка для всіх шифрів і аналізатора.
+
+Приклади:
+    python cli.py encrypt --cipher vigenere --key CRYPTOGRAPHY -i plaintext.txt -o encrypted.txt --stats
+    cat plaintext.txt | python cli.py encrypt --cipher playfair --key MATRIX > out.txt
+    python cli.py encrypt --cipher double-transposition --key SECRET --key2 CRYPTO -i in -o out --block-mode
+    python cli.py break --cipher vigenere -i encrypted.txt
+    python cli.py break --cipher transposition --max-key-length 12 -i encrypted.txt
+    python cli.py break --cipher double-transposition --max-key-length 8 --max-key2-length 8 -i encrypted.txt
+    python cli.py break --cipher playfair --time-budget 300 -i encrypted.txt
+"""
+import argparse
+import importlib
+import io
+import json
+import mmap
+import os
+import sys
+import time
+
+import numpy as np
+
+import ngram_fitness
+
+# Модулі завдань мають імена, що починаються з цифри, тому імпортуємо через importlib
+vigenere = importlib.import_module("1_1")
+vigenere_analysis = importlib.import_module("1_2")
+transposition = importlib.import_module("2_1")
+double_transposition = importlib.import_module("2_2")
+playfair = importlib.import_module("3_1")
+cascade = importlib.import_module("3_2")
+
+CIPHERS = ["vigenere", "transposition", "double-transposition", "playfair", "cascade"]
+# Шифри з блоковим форматом (--block-mode)
+BLOCK_CIPHERS = ["transposition", "double-transposition"]
+# Найбільша довжина ключа для зламу без --max-key-length: перебір перестановок росте
+# факторіально, тому для них межа значно менша, ніж для Віженера
+MAX_KEY_LENGTHS = {"vigenere": 40, "transposition": 12, "double-transposition": 10}
+
+
+class CountingReader(io.RawIOBase):
+    """
+    Обгортка двійкового потоку, що рахує прочитані байти (для --stats).
+    """
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = self.stream.readinto(buffer)
+        self.count += size or 0
+        return size
+
+
+def open_input(path):
+    """
+    Відкриває вхід: файл або stdin ("-") у двійковому режимі.
+
+    :param path: шлях до файлу або "-"
+    :return: двійковий потік
+    """
+    if path == "-":
+        return sys.stdin.buffer
+    return open(path, "rb")
+
+
+def open_output(path, input_path="-"):
+    """
+    Відкриває вихід: файл або stdout ("-") у двійковому режимі.
+
+    Вихід, що є тим самим файлом, що й вхід, не відкривається: відкриття на запис
+    обрізало б вхід ще до читання.
+
+    :param path: шлях до файлу або "-"
+    :param input_path: шлях до вхідного файлу або "-"
+    :return: двійковий потік
+    """
+    if path == "-":
+        return sys.stdout.buffer
+    if input_path != "-" and os.path.exists(path) and os.path.samefile(input_path, path):
+        raise SystemExit(f"Вхідний і вихідний файли збігаються: {path}")
+    return open(path, "wb")
+
+
+def read_all(source, use_mmap):
+    """
+    Зчитує весь вхід як буфер; для файлу з --mmap — без копіювання через mmap.
+
+    :param source: двійковий потік
+    :param use_mmap: чи використовувати mmap (лише для звичайних файлів)
+    :return: об'єкт з буферним протоколом (bytes або mmap)
+    """
+    if use_mmap and hasattr(source, "fileno") and source is not sys.stdin.buffer:
+        if os.fstat(source.fileno()).st_size:
+            return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        return b""
+    return source.read()
+
+
+def text_chunks(source, chunk_size):
+    """
+    Генератор текстових фрагментів з двійкового потоку (UTF-8, без перетворення кінців рядків).
+
+    :param source: двійковий потік
+    :param chunk_size: розмір фрагмента в символах
+    :return: генератор рядків
+    """
+    reader = io.TextIOWrapper(io.BufferedReader(source), encoding="utf-8", newline="")
+    try:
+        yield from iter(lambda: reader.read(chunk_size), "")
+    finally:
+        reader.detach()
+
+
+def run_vigenere(args, source, destination, decrypt):
+    """
+    Віженер: паралельна обробка файлів (--workers), mmap або потокова обробка.
+    """
+    chunk_size = args.chunk_size or vigenere.STREAM_CHUNK_SIZE
+    if args.workers and args.workers > 1 and args.input != "-" and args.output != "-":
+        destination.close()
+        vigenere.vigenere_file_parallel(
+            args.input, args.output, args.key, decrypt, args.workers, chunk_size=chunk_size
+        )
+        source.count += os.path.getsize(args.input)
+        return
+    if args.mmap and args.input != "-":
+        data = read_all(source.stream, True)
+        array = np.frombuffer(data, dtype=np.uint8)
+        key_index = 0
+        for start in range(0, len(array), chunk_size):
+            chunk = array[start:start + chunk_size]
+            result, key_index = vigenere.vigenere_shift_array(chunk, args.key, decrypt, key_index)
+            destination.write(result)
+        source.count += len(array)
+        del array, chunk
+        if isinstance(data, mmap.mmap):
+            data.close()
+        return
+    vigenere.vigenere_stream(source, destination, args.key, decrypt, chunk_size)
+
+
+def refuse_block_stream(prefix):
+    """
+    Зупиняє звичайне розшифрування перестановки, якщо вхід у блоковому форматі (--block-mode).
+
+    :param prefix: початок входу
+    """
+    if transposition.is_block_stream(prefix):
+        raise SystemExit("Вхід у блоковому форматі: розшифруйте з --block-mode і тим самим --chunk-size")
+
+
+def run_transposition(args, source, destination, decrypt):
+    """
+    Проста перестановка: блоковий формат (--block-mode) або весь текст через mmap.
+    """
+    if args.block_mode:
+        run = transposition.decrypt_transposition_blocks if decrypt else transposition.encrypt_transposition_blocks
+        run(source, destination, args.key, args.chunk_size or transposition.DEFAULT_BLOCK_SIZE, args.workers)
+        return
+    if args.input != "-" and args.output != "-":
+        if decrypt:
+            with open(args.input, "rb") as file:
+                refuse_block_stream(file.read(len(transposition.BLOCK_MAGIC)))
+        destination.close()
+        run = transposition.decrypt_transposition_file if decrypt else transposition.encrypt_transposition_file
+        run(args.input, args.output, args.key)
+        source.count += os.path.getsize(args.input)
+        return
+    data = np.frombuffer(read_all(source, args.mmap), dtype=np.uint8)
+    if decrypt:
+        refuse_block_stream(data)
+    run = transposition.transposition_decrypt_array if decrypt else transposition.transposition_encrypt_array
+    destination.write(run(data, args.key))
+
+
+def run_double_transposition(args, source, destination, decrypt):
+    """
+    Подвійна перестановка: блоковий формат (--block-mode) або весь текст через кешований план.
+    """
+    if not args.key2:
+        raise SystemExit("Для подвійної перестановки потрібен --key2")
+    if args.block_mode:
+        run = (double_transposition.decrypt_double_transposition_blocks if decrypt
+               else double_transposition.encrypt_double_transposition_blocks)
+        run(source, destination, args.key, args.key2, args.chunk_size or transposition.DEFAULT_BLOCK_SIZE,
+            args.workers)
+        return
+    data = read_all(source.stream if args.mmap else source, args.mmap)
+    if args.mmap:
+        source.count += len(data)
+    if decrypt:
+        refuse_block_stream(data)
+    run = double_transposition.decrypt_with_plan if decrypt else double_transposition.encrypt_with_plan
+    destination.write(run(data, args.key, args.key2))
+
+
+def run_playfair(args, source, destination, decrypt):
+    """
+    Playfair: потокова обробка фрагментами.
+    """
+    chunks = text_chunks(source, args.chunk_size or playfair.STREAM_CHUNK_SIZE)
+    for part in playfair.playfair_stream(chunks, args.key, decrypt):
+        destination.write(part.encode("utf-8"))
+
+
+def run_cascade(args, source, destination, decrypt):
+    """
+    Каскад Віженер -> Playfair з 3_2.py (лише шифрування): потоковий конвеєр етапів.
+    """
+    if decrypt:
+        raise SystemExit("Каскад 3_2.py підтримує лише шифрування")
+    if not args.key2:
+        raise SystemExit("Для каскаду потрібен --key2 (ключ Playfair)")
+    chunks = text_chunks(source, args.chunk_size or cascade.STREAM_CHUNK_SIZE)
+    for part in cascade.run_pipeline(cascade.cascade_stages(args.key, args.key2), chunks):
+        destination.write(part.encode("utf-8"))
+
+
+RUNNERS = {
+    "vigenere": run_vigenere,
+    "transposition": run_transposition,
+    "double-transposition": run_double_transposition,
+    "playfair": run_playfair,
+    "cascade": run_cascade,
+}
+
+
+def run_break(args, source):
+    """
+    Злам шифру без ключа; результат — JSON у stdout.
+    """
+    if args.cipher == "cascade":
+        raise SystemExit(f"Злам шифру {args.cipher} не підтримується")
+    data = read_all(source.stream if args.mmap else source, args.mmap)
+    if args.mmap:
+        source.count += len(data)
+    max_key_length = args.max_key_length or MAX_KEY_LENGTHS.get(args.cipher)
+    if args.cipher == "vigenere":
+        return vigenere_analysis.break_vigenere(bytes(data), max_key_length)
+    if args.cipher == "playfair":
+        return playfair.break_playfair(bytes(data).decode("utf-8"), workers=args.workers,
+                                       time_budget=args.time_budget, target=args.target,
+                                       table=playfair.playfair_quadgram_table(args.corpus))
+    table = ngram_fitness.load_quadgram_table(args.corpus, args.quadgram_table)
+    if args.cipher == "transposition":
+        return transposition.break_transposition(bytes(data).decode("utf-8"), max_key_length, args.workers,
+                                                 table=table)
+    return double_transposition.break_double_transposition(
+        bytes(data).decode("utf-8"), max_key_length, args.max_key2_length,
+        workers=args.workers, progress=report_progress, table=table,
+    )
+
+
+def report_progress(completed, total, candidates):
+    """
+    Виводить у stderr хід пошуку ключів і найкращого кандидата.
+
+    :param completed: кількість завершених завдань
+    :param total: кількість усіх завдань
+    :param candidates: найкращі кандидати (словники з ключами та оцінкою)
+    """
+    best = candidates[0]
+    print(f"[{completed}/{total}] key1={best['key1']} key2={best['key2']} score={best['score']:.1f}",
+          file=sys.stderr)
+
+
+def report_stats(byte_count, seconds):
+    """
+    Виводить у stderr кількість оброблених байтів і швидкість.
+
+    :param byte_count: кількість байтів входу
+    :param seconds: тривалість обробки
+    """
+    rate = byte_count / seconds if seconds > 0 else float("inf")
+    print(f"{byte_count} bytes in {seconds:.3f} s ({rate / 1e6:.2f} MB/s)", file=sys.stderr)
+
+
+def build_parser():
+    """
+    :return: парсер аргументів командного рядка
+    """
+    parser = argparse.ArgumentParser(description="Шифрування, розшифрування та злам класичних шифрів")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("encrypt", "decrypt", "break"):
+        command = commands.add_parser(name)
+        command.add_argument("--cipher", choices=CIPHERS, required=True)
+        if name != "break":
+            command.add_argument("--key", required=True, help="ключ (для каскаду — ключ Віженера)")
+            command.add_argument("--key2", help="другий ключ: key2 подвійної перестановки або ключ Playfair каскаду")
+        else:
+            command.add_argument("--max-key-length", type=int, default=None,
+                                 help="за замовчуванням: " + ", ".join(
+                                     f"{cipher} {length}" for cipher, length in MAX_KEY_LENGTHS.items()))
+            command.add_argument("--max-key2-length", type=int, default=10, help="(double-transposition)")
+            command.add_argument("--time-budget", type=float, default=None,
+                                 help="обмеження часу пошуку, с (playfair; за замовчуванням без обмеження). "
+                                      "Для ~2 КБ шифротексту на 1 CPU пошук зазвичай триває 20-120 с, "
+                                      "тому бюджет менше ~2 хв на процес ключ не гарантує")
+            command.add_argument("--target", type=float, default=playfair.ANNEALING_TARGET,
+                                 help="середня квадграмна оцінка для дострокової зупинки "
+                                      "(playfair, за замовчуванням %(default)s)")
+            command.add_argument("--corpus", default=None,
+                                 help="англійський корпус для квадграмної оцінки (за замовчуванням english_corpus.txt)")
+            command.add_argument("--quadgram-table", default=None,
+                                 help="файл скомпільованої таблиці квадграм (за замовчуванням у кеші користувача; "
+                                      "playfair будує власну таблицю з корпусу)")
+        command.add_argument("-i", "--input", default="-", help="вхідний файл або '-' для stdin")
+        command.add_argument("-o", "--output", default="-", help="вихідний файл або '-' для stdout")
+        command.add_argument("--mmap", action="store_true", help="читати вхідний файл через mmap")
+        command.add_argument("--workers", type=int, default=None, help="кількість процесів")
+        command.add_argument("--chunk-size", type=int, default=None,
+                             help="розмір фрагмента: у байтах для vigenere, у символах для playfair і cascade "
+                                  "(лише швидкодія, результат не змінює); "
+                                  "з --block-mode — розмір блоку, однаковий для шифрування й розшифрування")
+        if name != "break":
+            command.add_argument("--block-mode", action="store_true",
+                                 help="блоковий формат для transposition і double-transposition: кожен блок "
+                                      "шифрується окремо, потік має сигнатуру й заголовок довжини і НЕсумісний "
+                                      "зі звичайним шифротекстом")
+        command.add_argument("--stats", action="store_true", help="вивести швидкість обробки в stderr")
+    return parser
+
+
+def main(argv=None):
+    """
+    Точка входу командного рядка.
+
+    :param argv: список аргументів (за замовчуванням sys.argv[1:])
+    """
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    source = CountingReader(open_input(args.input))
+    try:
+        destination = open_output(args.output, args.input)
+        try:
+            if args.command != "break" and args.block_mode and args.cipher not in BLOCK_CIPHERS:
+                raise SystemExit("--block-mode підтримують лише transposition і double-transposition")
+            if args.command == "break":
+                result = run_break(args, source)
+                destination.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+            else:
+                RUNNERS[args.cipher](args, source, destination, args.command == "decrypt")
+        finally:
+            if not destination.closed:
+                destination.flush()
+                if destination is not sys.stdout.buffer:
+                    destination.close()
+    finally:
+        if source.stream is not sys.stdin.buffer:
+            source.stream.close()
+    if args.stats:
+        report_stats(source.count, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
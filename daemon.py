@@ -0,0 +1,262 @@
+"""
+Довготривалий локальний сервіс шифрування на Unix-сокеті (asyncio).
+
+Процес запускається один раз, тому імпорти модулів і скомпільовані ключі (LRU-кеші
+compile_vigenere_plan, compile_double_transposition_plan, compile_playfair_key)
+залишаються "теплими" між запитами. Малі повідомлення обробляються прямо в циклі подій,
+великі (від --offload-threshold байтів) — у пулі процесів.
+
+Протокол: кадр = заголовок FRAME (довжина JSON-заголовка, довжина даних), JSON-заголовок
+у UTF-8, дані. Запит: {"cipher": ..., "op": "encrypt" | "decrypt", "key": ..., "key2": ...},
+дані — текст у UTF-8. Відповідь: {"ok": true} і результат або {"ok": false, "error": ...}.
+Клієнт може надсилати запити один за одним, не чекаючи відповідей (конвеєр) —
+відповіді приходять у порядку запитів.
+
+Приклади:
+    python daemon.py --socket /tmp/ciphers.sock --workers 4
+    python -c "import daemon; print(daemon.DaemonClient('/tmp/ciphers.sock').request('vigenere', 'encrypt', 'KEY', 'hello'))"
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+
+vigenere = importlib.import_module("1_1")
+transposition = importlib.import_module("2_1")
+double_transposition = importlib.import_module("2_2")
+playfair = importlib.import_module("3_1")
+cascade = importlib.import_module("3_2")
+
+DEFAULT_SOCKET = "/tmp/goit-ciphers.sock"
+# Заголовок кадру: довжина JSON-заголовка і довжина даних (big-endian)
+FRAME = struct.Struct("!II")
+# Повідомлення від цього розміру (байтів) обробляються в пулі процесів
+OFFLOAD_THRESHOLD = 1 << 16
+# Найбільший допустимий кадр; більший кадр закриває з'єднання
+MAX_FRAME_SIZE = 1 << 30
+
+
+def _require_key2(key2):
+    if not key2:
+        raise ValueError("Потрібен key2")
+    return key2
+
+
+def _cascade_decrypt(text, key, key2):
+    raise ValueError("Каскад 3_2.py підтримує лише шифрування")
+
+
+# (шифр, операція) -> функція (текст, key, key2) -> текст
+HANDLERS = {
+    ("vigenere", "encrypt"): lambda text, key, key2: vigenere.vigenere_encrypt(text, key),
+    ("vigenere", "decrypt"): lambda text, key, key2: vigenere.vigenere_decrypt(text, key),
+    ("transposition", "encrypt"): lambda text, key, key2: transposition.encrypt_transposition(text, key),
+    ("transposition", "decrypt"): lambda text, key, key2: transposition.decrypt_transposition(text, key),
+    ("double-transposition", "encrypt"):
+        lambda text, key, key2: double_transposition.encrypt_with_plan(text, key, _require_key2(key2)),
+    ("double-transposition", "decrypt"):
+        lambda text, key, key2: double_transposition.decrypt_with_plan(text, key, _require_key2(key2)),
+    ("playfair", "encrypt"): lambda text, key, key2: playfair.playfair_encrypt(text, key),
+    ("playfair", "decrypt"): lambda text, key, key2: playfair.playfair_decrypt(text, key),
+    ("cascade", "encrypt"): lambda text, key, key2: cascade.cascade_encrypt(text, key, _require_key2(key2)),
+    ("cascade", "decrypt"): _cascade_decrypt,
+}
+
+
+def encode_frame(header, payload=b""):
+    """
+    Кодує кадр протоколу.
+
+    :param header: словник заголовка
+    :param payload: байти даних
+    :return: байти кадру
+    """
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return FRAME.pack(len(header), len(payload)) + header + payload
+
+
+def process_request(header, payload):
+    """
+    Виконує один запит (у циклі подій або в робочому процесі пулу).
+
+    Помилка запиту повертається клієнту у відповіді й не закриває з'єднання.
+
+    :param header: байти JSON-заголовка запиту
+    :param payload: байти даних запиту
+    :return: байти кадру відповіді
+    """
+    try:
+        request = json.loads(header)
+        handler = HANDLERS.get((request.get("cipher"), request.get("op")))
+        if handler is None:
+            raise ValueError(f"Невідомий шифр або операція: {request.get('cipher')} {request.get('op')}")
+        result = handler(bytes(payload).decode("utf-8"), request["key"], request.get("key2"))
+        return encode_frame({"ok": True}, result.encode("utf-8"))
+    except Exception as error:  # Помилка одного запиту не зупиняє сервіс
+        return encode_frame({"ok": False, "error": f"{type(error).__name__}: {error}"})
+
+
+async def _send_responses(responses, writer):
+    """
+    Записує відповіді в порядку запитів; буфер скидається, коли черга порожня.
+
+    :param responses: черга future з кадрами відповідей (None — кінець)
+    :param writer: asyncio.StreamWriter
+    """
+    while True:
+        response = await responses.get()
+        if response is None:
+            break
+        writer.write(await response)
+        if responses.empty():
+            await writer.drain()
+    await writer.drain()
+
+
+async def handle_connection(reader, writer, pool=None, offload_threshold=OFFLOAD_THRESHOLD):
+    """
+    Обслуговує одне постійне з'єднання з конвеєром запитів.
+
+    Кожен прочитаний запит одразу ставиться в чергу відповідей: малий виконується
+    в циклі подій, великий — у пулі процесів, тож читання наступних запитів не чекає.
+
+    :param reader: asyncio.StreamReader
+    :param writer: asyncio.StreamWriter
+    :param pool: ProcessPoolExecutor для великих повідомлень або None
+    :param offload_threshold: розмір даних, від якого запит іде в пул
+    """
+    loop = asyncio.get_running_loop()
+    responses = asyncio.Queue()
+    sender = asyncio.create_task(_send_responses(responses, writer))
+    try:
+        while True:
+            try:
+                header_length, payload_length = FRAME.unpack(await reader.readexactly(FRAME.size))
+            except asyncio.IncompleteReadError:
+                break
+            if header_length + payload_length > MAX_FRAME_SIZE:
+                break
+            body = await reader.readexactly(header_length + payload_length)
+            header, payload = body[:header_length], body[header_length:]
+            if pool is not None and payload_length >= offload_threshold:
+                response = loop.run_in_executor(pool, process_request, header, payload)
+            else:
+                response = loop.create_future()
+                response.set_result(process_request(header, payload))
+            responses.put_nowait(response)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        responses.put_nowait(None)
+        try:
+            await sender
+        except ConnectionError:
+            pass
+        writer.close()
+
+
+def _remove_stale_socket(path):
+    """
+    Видаляє файл сокета, що залишився від попереднього запуску (лише якщо це сокет).
+
+    :param path: шлях до сокета
+    """
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def serve(path=DEFAULT_SOCKET, workers=None, offload_threshold=OFFLOAD_THRESHOLD):
+    """
+    Запускає сервіс і обслуговує з'єднання до сигналу SIGINT або SIGTERM.
+
+    :param path: шлях до Unix-сокета (доступ лише для власника)
+    :param workers: кількість процесів пулу (0 — усе в циклі подій)
+    :param offload_threshold: розмір даних, від якого запит іде в пул
+    """
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, lambda: stop.done() or stop.set_result(None))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    _remove_stale_socket(path)
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: handle_connection(reader, writer, pool, offload_threshold), path
+    )
+    os.chmod(path, 0o600)
+    try:
+        async with server:
+            await stop
+    finally:
+        _remove_stale_socket(path)
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+class DaemonClient:
+    """
+    Синхронний клієнт сервісу з постійним з'єднанням.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.stream = self.socket.makefile("rb")
+
+    def close(self):
+        self.stream.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read_response(self):
+        header_length, payload_length = FRAME.unpack(self.stream.read(FRAME.size))
+        header = json.loads(self.stream.read(header_length))
+        payload = self.stream.read(payload_length)
+        if not header["ok"]:
+            raise RuntimeError(header["error"])
+        return payload.decode("utf-8")
+
+    def pipeline(self, requests):
+        """
+        Надсилає всі запити одним записом і читає відповіді.
+
+        :param requests: список кортежів (cipher, op, key, text[, key2])
+        :return: список результатів (рядків) у порядку запитів
+        """
+        frames = []
+        for cipher, op, key, text, *key2 in requests:
+            header = {"cipher": cipher, "op": op, "key": key, "key2": key2[0] if key2 else None}
+            frames.append(encode_frame(header, text.encode("utf-8")))
+        self.socket.sendall(b"".join(frames))
+        return [self._read_response() for _ in requests]
+
+    def request(self, cipher, op, key, text, key2=None):
+        """
+        Один запит і відповідь.
+
+        :return: результат (рядок)
+        """
+        return self.pipeline([(cipher, op, key, text, key2)])[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальний сервіс шифрування на Unix-сокеті")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="шлях до сокета")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів пулу (0 — без пулу)")
+    parser.add_argument("--offload-threshold", type=int, default=OFFLOAD_THRESHOLD,
+                        help="розмір повідомлення в байтах, від якого обробка йде в пул")
+    args = parser.parse_args()
+    asyncio.run(serve(args.socket, args.workers, args.offload_threshold))
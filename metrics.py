@@ -0,0 +1,334 @@
+"""
+Необов'язкове інструментування публічних функцій усіх шести модулів.
+
+Поки інструментування вимкнене, модулі не змінюються взагалі (нульові накладні витрати).
+enable() підміняє публічні функції модулів обгортками, що рахують виклики, оброблені
+символи та час за фазами (read — читання файлів, table — побудова таблиць і ключів,
+validate — перевірки на кшталт is_square_table, cipher — шифрування й аналіз, write — запис),
+а також збирає статистику LRU-кешів.
+disable() повертає оригінальні функції.
+
+Враховується лише поточний процес: виклики всередині робочих процесів пулу не потрапляють
+у статистику.
+
+Приклад:
+    import metrics
+    with metrics.profile_run() as run:
+        vigenere.vigenere_encrypt(text, "KEY")
+    print(metrics.export_json())
+    metrics.export_prometheus("/var/lib/node_exporter/ciphers.prom")
+"""
+import contextlib
+import functools
+import importlib
+import inspect
+import json
+import os
+import threading
+import time
+
+MODULES = ["1_1", "1_2", "2_1", "2_2", "3_1", "3_2"]
+PHASES = ["read", "table", "validate", "cipher", "write"]
+
+_lock = threading.Lock()
+_local = threading.local()
+_originals = {}
+_cache_baseline = {}
+_calls = {}
+_phase_seconds = dict.fromkeys(PHASES, 0.0)
+
+
+def classify_phase(name):
+    """
+    Визначає фазу за назвою функції.
+
+    :param name: назва функції
+    :return: одна з PHASES
+    """
+    if "read" in name:
+        return "read"
+    if "write" in name:
+        return "write"
+    if name.startswith("is_"):
+        return "validate"
+    if "table" in name or name.startswith("compile_") or name.startswith("get_permutation"):
+        return "table"
+    return "cipher"
+
+
+def _size(value):
+    """
+    :return: кількість символів/байтів для текстових і буферних значень, інакше 0
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    return getattr(value, "nbytes", 0) if hasattr(value, "dtype") else 0
+
+
+def _count_chars(phase, args, result):
+    """
+    Кількість оброблених символів: для читання — розмір результату, для запису — останній
+    аргумент (текст), для побудови таблиць і перевірок — 0, для решти — розмір текстового результату
+    або, якщо результат не текст (аналіз), першого аргументу.
+    """
+    if phase == "read":
+        return _size(result)
+    if phase == "write":
+        return _size(args[-1]) if args else 0
+    if phase in ("table", "validate"):
+        return 0
+    return _size(result) or (_size(args[0]) if args else 0)
+
+
+def _record(key, phase, chars, elapsed, own):
+    with _lock:
+        entry = _calls.setdefault(key, {"phase": phase, "calls": 0, "chars": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["chars"] += chars
+        entry["seconds"] += elapsed
+        _phase_seconds[phase] += own
+
+
+def _enter():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(0.0)
+    return stack
+
+
+def _leave(stack, elapsed):
+    """
+    Знімає рамку зі стеку викликів і повертає власний час функції (без вкладених викликів).
+    """
+    children = stack.pop()
+    if stack:
+        stack[-1] += elapsed
+    return elapsed - children
+
+
+def _wrap(module_name, name, function):
+    """
+    Створює обгортку, що вимірює виклики функції.
+
+    Вкладені інструментовані виклики віднімаються з часу фази зовнішньої функції, тому сума
+    часу фаз не рахує той самий інтервал двічі.
+    """
+    key = f"{module_name}.{name}"
+    phase = classify_phase(name)
+
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            iterator = function(*args, **kwargs)
+            chars = 0
+            elapsed = own = 0.0
+            try:
+                while True:
+                    stack = _enter()
+                    started = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        step = time.perf_counter() - started
+                        elapsed += step
+                        own += _leave(stack, step)
+                    chars += _size(item)
+                    yield item
+            finally:
+                _record(key, phase, chars, elapsed, own)
+        return generator_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = _enter()
+        started = time.perf_counter()
+        result = None
+        try:
+            result = function(*args, **kwargs)
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            own = _leave(stack, elapsed)
+            _record(key, phase, _count_chars(phase, args, result), elapsed, own)
+    return wrapper
+
+
+def _public_functions(module):
+    """
+    Публічні функції, визначені в самому модулі (без імпортованих, класів і LRU-кешів).
+    """
+    for name, value in vars(module).items():
+        if name.startswith("_") or not inspect.isfunction(value):
+            continue
+        if value.__module__ == module.__name__:
+            yield name, value
+
+
+def _caches(module):
+    """
+    LRU-кеші модуля (об'єкти з cache_info) за поточними іменами в модулі.
+    """
+    for name, value in vars(module).items():
+        if not name.startswith("_") and hasattr(value, "cache_info"):
+            yield f"{module.__name__}.{name}", value
+
+
+def is_enabled():
+    """
+    :return: True, якщо інструментування ввімкнене
+    """
+    return bool(_originals)
+
+
+def enable(modules=MODULES):
+    """
+    Вмикає інструментування: підміняє публічні функції модулів обгортками.
+
+    :param modules: список назв модулів
+    """
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        for name, function in list(_public_functions(module)):
+            if (module_name, name) in _originals:
+                continue
+            _originals[(module_name, name)] = function
+            setattr(module, name, _wrap(module_name, name, function))
+        for key, cache in _caches(module):
+            _cache_baseline[key] = (cache, cache.cache_info())
+
+
+def disable():
+    """
+    Вимикає інструментування та повертає оригінальні функції (зібрана статистика зберігається).
+    """
+    for (module_name, name), function in _originals.items():
+        setattr(importlib.import_module(module_name), name, function)
+    _originals.clear()
+
+
+def reset():
+    """
+    Скидає зібрану статистику; базовий рівень кешів фіксується заново.
+    """
+    with _lock:
+        _calls.clear()
+        for phase in PHASES:
+            _phase_seconds[phase] = 0.0
+        for key, (cache, _) in list(_cache_baseline.items()):
+            _cache_baseline[key] = (cache, cache.cache_info())
+
+
+def snapshot():
+    """
+    Повертає поточну статистику.
+
+    Для кешів — кількість влучань і промахів з моменту enable()/reset(); якщо кеш було
+    перестворено (configure_plan_cache), — повні значення нового кешу.
+
+    :return: словник з ключами functions, phases, caches
+    """
+    caches = {}
+    for module_name in sorted({module_name for module_name, _ in _originals}) or MODULES:
+        module = importlib.import_module(module_name)
+        for key, cache in _caches(module):
+            info = cache.cache_info()
+            hits, misses = info.hits, info.misses
+            baseline = _cache_baseline.get(key)
+            if baseline and baseline[0] is cache:
+                hits -= baseline[1].hits
+                misses -= baseline[1].misses
+            caches[key] = {"hits": hits, "misses": misses, "currsize": info.currsize, "maxsize": info.maxsize}
+    with _lock:
+        return {
+            "functions": {key: dict(entry) for key, entry in _calls.items()},
+            "phases": dict(_phase_seconds),
+            "caches": caches,
+        }
+
+
+def export_json(path=None):
+    """
+    Експортує статистику у JSON.
+
+    :param path: шлях до файлу (None — лише повернути рядок)
+    :return: рядок JSON
+    """
+    output = json.dumps(snapshot(), indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as file:
+            file.write(output + "\n")
+    return output
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def export_prometheus(path=None, prefix="cipher"):
+    """
+    Експортує статистику у текстовому форматі Prometheus (для textfile collector).
+
+    Файл записується атомарно (через тимчасовий файл і os.replace), щоб колектор не прочитав
+    його частково.
+
+    :param path: шлях до файлу .prom (None — лише повернути рядок)
+    :param prefix: префікс назв метрик
+    :return: рядок у форматі Prometheus
+    """
+    data = snapshot()
+    lines = []
+
+    def metric(name, help_text, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        for labels, value in samples:
+            label_text = ",".join(f'{label}="{_escape(text)}"' for label, text in labels)
+            lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+    functions = sorted(data["functions"].items())
+    labels = [(key, (("module", key.split(".")[0]), ("function", key.split(".")[1]), ("phase", entry["phase"])))
+              for key, entry in functions]
+    metric("calls_total", "Number of calls per function.",
+           [(label, entry["calls"]) for (_, label), (_, entry) in zip(labels, functions)])
+    metric("chars_total", "Characters processed per function.",
+           [(label, entry["chars"]) for (_, label), (_, entry) in zip(labels, functions)])
+    metric("seconds_total", "Wall time per function including nested calls.",
+           [(label, entry["seconds"]) for (_, label), (_, entry) in zip(labels, functions)])
+    metric("phase_seconds_total", "Wall time per phase excluding nested instrumented calls.",
+           [((("phase", phase),), seconds) for phase, seconds in data["phases"].items()])
+    caches = sorted(data["caches"].items())
+    metric("cache_hits_total", "LRU cache hits.", [((("cache", key),), info["hits"]) for key, info in caches])
+    metric("cache_misses_total", "LRU cache misses.", [((("cache", key),), info["misses"]) for key, info in caches])
+    output = "\n".join(lines) + "\n"
+
+    if path:
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            file.write(output)
+        os.replace(temporary, path)
+    return output
+
+
+@contextlib.contextmanager
+def profile_run(modules=MODULES):
+    """
+    Профілює один запуск: скидає статистику, вмикає інструментування на час блоку
+    і повертає словник, який після виходу з блоку містить snapshot().
+
+    :param modules: список назв модулів
+    """
+    was_enabled = is_enabled()
+    reset()
+    enable(modules)
+    result = {}
+    try:
+        yield result
+    finally:
+        result.update(snapshot())
+        if not was_enabled:
+            disable()
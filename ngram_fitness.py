@@ -0,0 +1,291 @@
+"""
+Оцінка "англійськості" тексту за квадграмами (для криптоаналізу шифрів перестановки та Playfair).
+
+Таблиця — щільний масив float32 розміру 26^4, де елемент з індексом ((a*26+b)*26+c)*26+d
+містить log10 P(d | abc). Ймовірність інтерпольована з частот 4-, 3-, 2- та 1-грам корпусу,
+тому навіть невеликий корпус дає ненульову оцінку для будь-якої квадграми.
+Оцінка тексту — сума значень таблиці для всіх квадграм з його літер.
+
+Корпус за замовчуванням — english_corpus.txt ("Alice's Adventures in Wonderland" і Конституція
+США, суспільне надбання), незалежний від plaintext.txt, який шифрують і ламають скрипти завдань.
+
+Скомпільована таблиця зберігається у двійковому файлі (заголовок і масив float32),
+який кожен процес відображає в пам'ять (mmap): сторінки спільні для всіх процесів через
+кеш ОС, тому робочі процеси не копіюють таблицю. Шляхи до корпусу й таблиці передає
+викликач; інакше вони беруться зі змінних середовища QUADGRAM_CORPUS і QUADGRAM_TABLE,
+а таблиця за замовчуванням лежить у кеші користувача ($XDG_CACHE_HOME або ~/.cache),
+а не поруч із модулем. Компіляція: python ngram_fitness.py [корпус] [файл таблиці]
+"""
+from functools import lru_cache
+import argparse
+import hashlib
+import os
+import struct
+
+import numpy as np
+
+ALPHABET_SIZE = 26
+QUADGRAM_COUNT = ALPHABET_SIZE ** 4
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "english_corpus.txt")
+# Змінні середовища зі шляхами до корпусу та файлу таблиці і підкаталог кешу користувача
+CORPUS_ENV = "QUADGRAM_CORPUS"
+TABLE_FILE_ENV = "QUADGRAM_TABLE"
+CACHE_SUBDIRECTORY = "goit-pnc-hw-02"
+
+# Заголовок файлу таблиці: сигнатура, версія, кількість елементів; дані вирівняні на 16 байтів
+TABLE_MAGIC = b"QGRM"
+TABLE_VERSION = 1
+TABLE_HEADER = struct.Struct("<4sII4x")
+
+# Скільки літер (рядків кандидатів * довжина) оцінювати за один крок score_batch
+BATCH_LETTERS = 1 << 22
+
+# Ваги інтерполяції для порядків 4, 3, 2, 1
+INTERPOLATION_WEIGHTS = (0.5, 0.3, 0.15, 0.05)
+
+# Таблиця перекодування байтів: A-Z/a-z -> 0..25, інші символи -> 26
+LETTER_CODES = np.full(256, ALPHABET_SIZE, dtype=np.uint8)
+LETTER_CODES[np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)] = np.arange(26)
+LETTER_CODES[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)] = np.arange(26)
+
+
+def text_to_codes(text):
+    """
+    Перетворює текст у масив кодів символів: літери -> 0..25, інші символи -> 26.
+
+    Для рядка кожен символ дає рівно один код (через UTF-32), тому позиції в масиві
+    збігаються з індексами символів.
+
+    :param text: рядок або bytes-подібний об'єкт
+    :return: масив uint8 тієї ж довжини
+    """
+    if isinstance(text, str):
+        points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        return LETTER_CODES[np.minimum(points, 255)]
+    return LETTER_CODES[np.frombuffer(text, dtype=np.uint8)]
+
+
+def letters_only(codes):
+    """
+    :param codes: масив кодів з text_to_codes
+    :return: масив лише літерних кодів (0..25)
+    """
+    return codes[codes < ALPHABET_SIZE]
+
+
+def quadgram_indices(letters):
+    """
+    Індекси квадграм у таблиці для послідовності літерних кодів.
+
+    :param letters: масив кодів 0..25
+    :return: масив int64 довжини len(letters) - 3
+    """
+    letters = letters.astype(np.int64)
+    return ((letters[:-3] * 26 + letters[1:-2]) * 26 + letters[2:-1]) * 26 + letters[3:]
+
+
+def build_quadgram_table(text, weights=INTERPOLATION_WEIGHTS):
+    """
+    Будує таблицю log10 P(d | abc) з корпусу з інтерполяцією порядків 4..1.
+
+    :param text: текст корпусу (рядок або bytes)
+    :param weights: ваги порядків 4, 3, 2, 1
+    :return: масив float32 розміру 26^4
+    """
+    letters = letters_only(text_to_codes(text)).astype(np.int64)
+    c1 = np.bincount(letters, minlength=26).astype(np.float64)
+    c2 = np.bincount(letters[:-1] * 26 + letters[1:], minlength=26 ** 2).astype(np.float64)
+    c3 = np.bincount((letters[:-2] * 26 + letters[1:-1]) * 26 + letters[2:], minlength=26 ** 3).astype(np.float64)
+    c4 = np.bincount(quadgram_indices(letters), minlength=QUADGRAM_COUNT).astype(np.float64)
+
+    def conditional(counts, context):
+        # counts[..., d] / context[...], 0 там, де контекст не зустрічався
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(context[..., None] > 0, counts / context[..., None], 0.0)
+
+    p4 = conditional(c4.reshape(26, 26, 26, 26), c3.reshape(26, 26, 26))
+    p3 = conditional(c3.reshape(26, 26, 26), c2.reshape(26, 26))[None]
+    p2 = conditional(c2.reshape(26, 26), c1)[None, None]
+    # Згладжування Лапласа для 1-грам гарантує ненульову ймовірність кожної літери
+    p1 = ((c1 + 1) / (c1.sum() + 26))[None, None, None]
+    w4, w3, w2, w1 = weights
+    probability = w4 * p4 + w3 * p3 + w2 * p2 + w1 * p1
+    return np.log10(probability).astype(np.float32).ravel()
+
+
+def default_corpus_path():
+    """
+    :return: шлях до корпусу: змінна середовища QUADGRAM_CORPUS або english_corpus.txt
+    """
+    return os.environ.get(CORPUS_ENV) or DEFAULT_CORPUS
+
+
+def default_table_path(corpus_path):
+    """
+    Шлях до файлу таблиці для корпусу: змінна середовища QUADGRAM_TABLE або файл у кеші
+    користувача, ім'я якого залежить від шляху до корпусу (різні корпуси не перезаписують
+    таблиці одне одного).
+
+    :param corpus_path: шлях до корпусу
+    :return: шлях до файлу таблиці
+    """
+    configured = os.environ.get(TABLE_FILE_ENV)
+    if configured:
+        return configured
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    digest = hashlib.sha1(os.path.abspath(corpus_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache, CACHE_SUBDIRECTORY, f"quadgrams-{digest}.bin")
+
+
+def compile_quadgram_file(corpus_path=None, table_path=None):
+    """
+    Компілює таблицю квадграм з корпусу у двійковий файл.
+
+    Запис іде у тимчасовий файл, який атомарно замінює цільовий, тому процеси,
+    що вже відобразили старий файл, його не бачать пошкодженим.
+
+    :param corpus_path: шлях до англійського тексту (None — default_corpus_path())
+    :param table_path: шлях до файлу таблиці (None — default_table_path())
+    :return: шлях до файлу таблиці
+    """
+    corpus_path = corpus_path or default_corpus_path()
+    table_path = table_path or default_table_path(corpus_path)
+    with open(corpus_path, "rb") as file:
+        table = build_quadgram_table(file.read())
+    os.makedirs(os.path.dirname(os.path.abspath(table_path)), exist_ok=True)
+    temporary_path = f"{table_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, QUADGRAM_COUNT))
+            file.write(table.astype("<f4").tobytes())
+        os.replace(temporary_path, table_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return table_path
+
+
+@lru_cache(maxsize=4)
+def open_quadgram_file(table_path):
+    """
+    Відображає файл таблиці в пам'ять (один раз на процес).
+
+    :param table_path: шлях до файлу з compile_quadgram_file
+    :return: масив float32 розміру 26^4 лише для читання; це звичайний ndarray над
+        відображенням (base — np.memmap), бо індексування memmap повільніше
+    """
+    with open(table_path, "rb") as file:
+        magic, version, count = TABLE_HEADER.unpack(file.read(TABLE_HEADER.size))
+    if magic != TABLE_MAGIC or version != TABLE_VERSION or count != QUADGRAM_COUNT:
+        raise ValueError(f"{table_path}: не файл таблиці квадграм")
+    mapped = np.memmap(table_path, dtype="<f4", mode="r", offset=TABLE_HEADER.size, shape=(count,))
+    return np.asarray(mapped)
+
+
+def load_quadgram_table(corpus_path=None, table_path=None):
+    """
+    Таблиця квадграм для корпусу: відображений у пам'ять файл, який (пере)компілюється,
+    якщо його немає або корпус новіший. Якщо файл записати неможливо, таблиця
+    будується в пам'яті процесу.
+
+    :param corpus_path: шлях до англійського тексту (None — default_corpus_path())
+    :param table_path: шлях до файлу таблиці (None — default_table_path())
+    :return: масив float32 розміру 26^4 (лише для читання)
+    """
+    corpus_path = corpus_path or default_corpus_path()
+    return _load_quadgram_table(corpus_path, table_path or default_table_path(corpus_path))
+
+
+@lru_cache(maxsize=4)
+def _load_quadgram_table(corpus_path, table_path):
+    try:
+        if (not os.path.exists(table_path)
+                or os.path.getmtime(table_path) < os.path.getmtime(corpus_path)):
+            compile_quadgram_file(corpus_path, table_path)
+        return open_quadgram_file(table_path)
+    except OSError:
+        with open(corpus_path, "rb") as file:
+            table = build_quadgram_table(file.read())
+        table.flags.writeable = False
+        return table
+
+
+def table_reference(table):
+    """
+    Посилання на таблицю для передачі в робочі процеси: для відображеної таблиці —
+    шлях до файлу (процес відобразить той самий файл), інакше — сам масив.
+
+    :param table: таблиця квадграм
+    :return: шлях або масив
+    """
+    if isinstance(table.base, np.memmap) and table.base.filename is not None:
+        return str(table.base.filename)
+    return table
+
+
+def resolve_table(reference):
+    """
+    Зворотне до table_reference: отримує таблицю в робочому процесі.
+
+    :param reference: шлях до файлу таблиці або масив
+    :return: таблиця квадграм
+    """
+    if isinstance(reference, str):
+        return open_quadgram_file(reference)
+    return reference
+
+
+def score_letters(letters, table):
+    """
+    :param letters: масив літерних кодів 0..25
+    :param table: таблиця квадграм
+    :return: сумарна оцінка (більше — схожіше на англійську)
+    """
+    if len(letters) < 4:
+        return 0.0
+    return float(table[quadgram_indices(letters)].sum())
+
+
+def score_batch(candidates, table):
+    """
+    Оцінює багато кандидатів-розшифрувань однакової довжини одним викликом.
+
+    Індекси квадграм для всіх рядків обчислюються векторно, великі пакети
+    обробляються частинами по BATCH_LETTERS літер.
+
+    :param candidates: масив (кількість кандидатів, довжина) літерних кодів 0..25
+    :param table: таблиця квадграм
+    :return: масив float64 оцінок, по одній на рядок
+    """
+    candidates = np.asarray(candidates)
+    count, length = candidates.shape
+    scores = np.zeros(count)
+    if length < 4:
+        return scores
+    step = max(1, BATCH_LETTERS // length)
+    for start in range(0, count, step):
+        letters = candidates[start:start + step].astype(np.int64)
+        indices = ((letters[:, :-3] * 26 + letters[:, 1:-2]) * 26 + letters[:, 2:-1]) * 26 + letters[:, 3:]
+        scores[start:start + step] = table[indices].sum(axis=1, dtype=np.float64)
+    return scores
+
+
+def score_text(text, table=None):
+    """
+    Оцінює текст (ігноруючи нелітерні символи).
+
+    :param text: рядок або bytes
+    :param table: таблиця квадграм (за замовчуванням — load_quadgram_table())
+    :return: сумарна оцінка
+    """
+    if table is None:
+        table = load_quadgram_table()
+    return score_letters(letters_only(text_to_codes(text)), table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Компіляція таблиці квадграм у двійковий файл")
+    parser.add_argument("corpus", nargs="?", default=None, help="англійський текст (за замовчуванням english_corpus.txt)")
+    parser.add_argument("output", nargs="?", default=None, help="файл таблиці (за замовчуванням у кеші користувача)")
+    args = parser.parse_args()
+    print(compile_quadgram_file(args.corpus, args.output))
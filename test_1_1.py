@@ -0,0 +1,182 @@
+"""
+Тести шифру Віженера (1_1.py): еквівалентність оптимізованих реалізацій
+посимвольному алгоритму за таблицею та повний цикл шифрування/розшифрування.
+"""
+import importlib
+import io
+import os
+
+import pytest
+
+vigenere = importlib.import_module("1_1")
+
+KEYS = ["CRYPTOGRAPHY", "key", "A", "LEMON"]
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+
+
+def reference_encrypt(text, key, decrypt=False):
+    """
+    Посимвольний алгоритм за таблицею Віженера (еталон для порівняння).
+    """
+    table = vigenere.generate_vigenere_table()
+    key = key.upper()
+    result = []
+    key_index = 0
+    for char in text:
+        if "A" <= char.upper() <= "Z":
+            row = ord(key[key_index % len(key)]) - 65
+            if decrypt:
+                converted = chr(table[row].index(char.upper()) + 65)
+            else:
+                converted = table[row][ord(char.upper()) - 65]
+            result.append(converted.lower() if char.islower() else converted)
+            key_index += 1
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_vectorized_matches_reference(plain_text, key):
+    encrypted = vigenere.vigenere_encrypt_vectorized(plain_text, key)
+    assert encrypted == reference_encrypt(plain_text, key)
+    assert vigenere.vigenere_decrypt_vectorized(encrypted, key) == plain_text
+
+
+def test_vectorized_keeps_bytes_type():
+    encrypted = vigenere.vigenere_encrypt_vectorized(b"Hello, World!", "KEY")
+    assert encrypted == reference_encrypt("Hello, World!", "KEY").encode("ascii")
+
+
+def test_vectorized_rejects_empty_key():
+    with pytest.raises(ValueError):
+        vigenere.vigenere_encrypt_vectorized("text", "")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_stream_matches_whole_text(plain_text, chunk_size):
+    data = plain_text.encode("ascii")
+    destination = io.BytesIO()
+    vigenere.vigenere_stream(io.BytesIO(data), destination, "CRYPTOGRAPHY", chunk_size=chunk_size)
+    assert destination.getvalue() == vigenere.vigenere_encrypt_vectorized(data, "CRYPTOGRAPHY")
+
+
+def test_file_streaming_round_trip(plain_text, tmp_path):
+    source, encrypted, decrypted = tmp_path / "plain.txt", tmp_path / "enc.txt", tmp_path / "dec.txt"
+    source.write_text(plain_text)
+    vigenere.encrypt_file_streaming(source, encrypted, "LEMON", chunk_size=100)
+    vigenere.decrypt_file_streaming(encrypted, decrypted, "LEMON", chunk_size=100)
+    assert encrypted.read_text() == reference_encrypt(plain_text, "LEMON")
+    assert decrypted.read_text() == plain_text
+
+
+def test_file_streaming_refuses_to_overwrite_input(tmp_path):
+    source = tmp_path / "plain.txt"
+    source.write_text("Hello, World")
+    for function in [vigenere.encrypt_file_streaming, vigenere.decrypt_file_streaming]:
+        with pytest.raises(ValueError):
+            function(source, source, "LEMON")
+        # Той самий файл за іншим шляхом
+        with pytest.raises(ValueError):
+            function(source, tmp_path / "." / "plain.txt", "LEMON")
+    assert source.read_text() == "Hello, World"
+
+
+@pytest.mark.parametrize("decrypt", [False, True])
+def test_parallel_shards_match_sequential(plain_text, tmp_path, decrypt):
+    source, result = tmp_path / "in.txt", tmp_path / "out.txt"
+    source.write_text(plain_text)
+    # Малі шарди, щоб межі шардів припадали всередину слів
+    vigenere.vigenere_file_parallel(source, result, "CRYPTOGRAPHY", decrypt=decrypt, workers=2,
+                                    shard_size=97, chunk_size=13)
+    assert result.read_text() == reference_encrypt(plain_text, "CRYPTOGRAPHY", decrypt)
+
+
+def test_parallel_empty_file(tmp_path):
+    source, result = tmp_path / "in.txt", tmp_path / "out.txt"
+    source.write_bytes(b"")
+    vigenere.vigenere_file_parallel(source, result, "KEY")
+    assert result.read_bytes() == b""
+
+
+def test_parallel_refuses_to_overwrite_input(tmp_path):
+    source = tmp_path / "in.txt"
+    source.write_text("Hello, World")
+    with pytest.raises(ValueError):
+        vigenere.vigenere_file_parallel(source, source, "KEY", workers=1)
+    assert source.read_text() == "Hello, World"
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_plan_matches_reference(plain_text, key):
+    encrypted = vigenere.vigenere_encrypt(plain_text, key)
+    assert encrypted == reference_encrypt(plain_text, key)
+    assert vigenere.vigenere_decrypt(encrypted, key) == plain_text
+
+
+def test_plan_key_index_continues_phase():
+    plan = vigenere.compile_vigenere_plan("LEMON")
+    whole = plan.encrypt("ATTACK AT DAWN")
+    assert plan.encrypt("ATTACK") + plan.encrypt(" AT DAWN", key_index=6) == whole
+    assert plan.encrypt(b"ATTACK") == whole[:6].encode("ascii")
+
+
+def test_plan_cache_reuses_compiled_plans():
+    vigenere.configure_plan_cache(2)
+    try:
+        vigenere.vigenere_encrypt("text", "KEY")
+        vigenere.vigenere_encrypt("more text", "KEY")
+        info = vigenere.plan_cache_info()
+        assert (info["hits"], info["misses"], info["maxsize"]) == (1, 1, 2)
+    finally:
+        vigenere.configure_plan_cache(vigenere.PLAN_CACHE_SIZE)
+
+
+def test_plan_only_for_ascii_text_and_letter_keys():
+    assert vigenere.can_use_plan("Hello, World", "KEY")
+    assert not vigenere.can_use_plan("Привіт, World", "KEY")
+    assert not vigenere.can_use_plan("Hello", "KEY1")
+    assert not vigenere.can_use_plan(b"Hello", "KEY")
+
+
+@pytest.mark.parametrize("decrypt", [False, True])
+def test_batch_matches_single_messages(plain_text, decrypt):
+    messages = ["", "Hello, World!", plain_text[:777], "no letters? 123", plain_text]
+    transform = vigenere.vigenere_decrypt_vectorized if decrypt else vigenere.vigenere_encrypt_vectorized
+    expected = [transform(message, key) for message, key in zip(messages, KEYS + ["KEY"])]
+    assert vigenere.vigenere_batch(messages, KEYS + ["KEY"], decrypt) == expected
+    # Одне повідомлення з багатьма ключами і один ключ для багатьох повідомлень
+    assert vigenere.vigenere_batch(plain_text, KEYS, decrypt) == [transform(plain_text, key) for key in KEYS]
+    assert vigenere.vigenere_batch(messages, "KEY", decrypt) == [transform(message, "KEY") for message in messages]
+
+
+def test_batch_as_buffer_and_bytes():
+    messages = [b"Hello", b"", b"World!"]
+    assert vigenere.vigenere_batch(messages, "KEY") == [vigenere.vigenere_encrypt_vectorized(m, "KEY") for m in messages]
+    data, offsets = vigenere.vigenere_batch(messages, "KEY", as_buffer=True)
+    assert offsets.tolist() == [0, 5, 5, 11]
+    assert data == b"".join(vigenere.vigenere_encrypt_vectorized(m, "KEY") for m in messages)
+    with pytest.raises(ValueError):
+        vigenere.vigenere_batch(messages, ["A", "B"])
+
+
+def test_buffer_matches_vectorized_and_works_in_place(plain_text):
+    data = plain_text.encode("ascii")
+    expected = vigenere.vigenere_encrypt_vectorized(data, "CRYPTOGRAPHY")
+    assert vigenere.vigenere_encrypt_buffer(memoryview(data), "CRYPTOGRAPHY").tobytes() == expected
+    buffer = bytearray(data)
+    result = vigenere.vigenere_encrypt_buffer(buffer, "CRYPTOGRAPHY", out=buffer)
+    assert bytes(buffer) == expected and len(result) == len(data)
+    vigenere.vigenere_decrypt_buffer(buffer, "CRYPTOGRAPHY", out=buffer)
+    assert bytes(buffer) == data
+    # Фаза ключа продовжується з key_index, як для другої половини тексту
+    half = len(data) // 2
+    letters = sum(65 <= (byte & 0xDF) <= 90 for byte in data[:half])
+    tail = vigenere.vigenere_encrypt_buffer(data[half:], "CRYPTOGRAPHY", key_index=letters)
+    assert tail.tobytes() == expected[half:]
@@ -0,0 +1,168 @@
+"""
+Тести криптоаналізу шифру Віженера (1_2.py) на зашифрованому plaintext.txt.
+"""
+import importlib
+import io
+import json
+import os
+
+import pytest
+
+vigenere = importlib.import_module("1_1")
+analysis = importlib.import_module("1_2")
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+KEY = "CRYPTOGRAPHY"
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+@pytest.fixture(scope="module")
+def cipher_text(plain_text):
+    return vigenere.vigenere_encrypt(plain_text, KEY)
+
+
+def reference_kasiski(letters, ngram_length, max_key_length):
+    """
+    Частки відстаней між сусідніми повтореннями n-грам, кратних кожній довжині (перебором).
+    """
+    positions = {}
+    distances = []
+    for i in range(len(letters) - ngram_length + 1):
+        ngram = letters[i:i + ngram_length]
+        if ngram in positions:
+            distances.append(i - positions[ngram])
+        positions[ngram] = i
+    return {
+        key_length: sum(distance % key_length == 0 for distance in distances) / len(distances)
+        for key_length in range(2, max_key_length + 1)
+    }
+
+
+@pytest.mark.parametrize("ngram_length", [3, 4])
+def test_kasiski_ranked_matches_reference(cipher_text, ngram_length):
+    letters = "".join(char for char in cipher_text.upper() if "A" <= char <= "Z")
+    expected = reference_kasiski(letters, ngram_length, 40)
+    ranked = analysis.kasiski_ranked(cipher_text, ngram_length)
+    assert dict(ranked) == pytest.approx({length: share for length, share in expected.items() if share > 0})
+    shares = [share for _, share in ranked]
+    assert shares == sorted(shares, reverse=True)
+
+
+def test_kasiski_ranked_finds_key_length(cipher_text):
+    # Кратні довжини ключа мають ті самі відстані, тому серед довжин > 6 першою йде 12
+    ranked = [length for length, _ in analysis.kasiski_ranked(cipher_text) if length > 6]
+    assert ranked[0] == len(KEY)
+
+
+def test_kasiski_ranked_without_repeats():
+    assert analysis.kasiski_ranked("ABCDEFG") == []
+    with pytest.raises(ValueError):
+        analysis.kasiski_ranked("ABCDEFG", ngram_length=1)
+
+
+def test_ic_sweep_matches_per_length_histograms(cipher_text):
+    codes = analysis.text_to_letter_codes(cipher_text).astype("int64")
+    expected = [analysis.average_column_ic(analysis.column_histograms(codes, length)) for length in range(1, 41)]
+    assert analysis.ic_sweep(cipher_text, 40) == pytest.approx(expected, abs=1e-12)
+
+
+def test_ic_sweep_spans_several_chunks(cipher_text, monkeypatch):
+    whole = analysis.ic_sweep(cipher_text, 30)
+    monkeypatch.setattr(analysis, "IC_SWEEP_CHUNK", 100)
+    assert analysis.ic_sweep(cipher_text, 30) == pytest.approx(whole, abs=1e-12)
+
+
+@pytest.mark.parametrize("key", [KEY, "LEMON", "KEY"])
+def test_analyze_vigenere_recovers_period_not_multiples(plain_text, key):
+    results = analysis.analyze_vigenere(vigenere.vigenere_encrypt(plain_text, key))
+    key_length, _, found = results[0]
+    assert (key_length, found) == (len(key), key)
+    # Кратні періоду зводяться до нього й не займають інших місць
+    assert all(length % len(key) for length, _, _ in results[1:])
+
+
+def test_break_vigenere_on_sample(cipher_text):
+    result = analysis.break_vigenere(cipher_text)
+    assert (result["key"], result["key_length"]) == (KEY, len(KEY))
+
+
+def test_run_batch_reports_bad_lines_and_continues(plain_text, tmp_path):
+    source = tmp_path / "batch.jsonl"
+    source.write_text("\n".join([
+        json.dumps({"id": "good", "text": vigenere.vigenere_encrypt(plain_text, "LEMON")}),
+        "{not json",
+        "",
+        json.dumps({"id": "no-text"}),
+        json.dumps({"text": vigenere.vigenere_encrypt(plain_text, KEY)}),
+    ]) + "\n")
+    output = io.StringIO()
+    assert analysis.run_batch(str(source), output, workers=1) == 4
+    records = {record["id"]: record for record in map(json.loads, output.getvalue().splitlines())}
+    assert records["good"]["key"] == "LEMON"
+    assert records[5]["key"] == KEY
+    assert records[2]["line"] == 2 and "error" in records[2]
+    assert records[4]["line"] == 4 and "error" in records[4]
+
+
+def test_run_batch_directory(plain_text, tmp_path):
+    (tmp_path / "a.txt").write_text(vigenere.vigenere_encrypt(plain_text, "KEY"))
+    (tmp_path / "b.txt").write_text("")
+    output = io.StringIO()
+    assert analysis.run_batch(str(tmp_path), output, workers=1) == 2
+    records = {record["id"]: record for record in map(json.loads, output.getvalue().splitlines())}
+    assert records["a.txt"]["key"] == "KEY"
+    assert "error" in records["b.txt"]
+
+
+
+def test_incremental_analyzer_matches_whole_text(cipher_text):
+    analyzer = analysis.IncrementalKeyLengthAnalyzer(max_key_length=20)
+    for start in range(0, len(cipher_text), 333):
+        analyzer.feed(cipher_text[start:start + 333])
+    assert analyzer.column_ics() == pytest.approx(analysis.ic_sweep(cipher_text, 20), abs=1e-12)
+    assert analyzer.estimate()[0][0] == len(KEY)
+
+
+def test_estimate_key_length_stream_stops_early(plain_text):
+    long_text = vigenere.vigenere_encrypt(plain_text * 20, KEY)
+    ranking, letters = analysis.estimate_key_length_stream(io.StringIO(long_text), chunk_size=512)
+    assert ranking[0][0] == len(KEY)
+    assert letters < len(long_text) // 2
+
+
+def test_shared_column_histograms_match_direct(cipher_text):
+    codes = analysis.text_to_letter_codes(cipher_text).astype("int64")
+    lengths = [12, 6, 4, 5, 7, 1]
+    for limit in [analysis.SHARED_COUNTS_LIMIT, 12]:
+        histograms = analysis.shared_column_histograms(codes, lengths, limit)
+        assert sorted(histograms) == sorted(lengths)
+        for length in lengths:
+            assert (histograms[length] == analysis.column_histograms(codes, length)).all()
+
+
+def test_minimal_period():
+    assert analysis.minimal_period("ABCABC") == "ABC"
+    assert analysis.minimal_period("AAAA") == "A"
+    assert analysis.minimal_period("ABCAB") == "ABCAB"
+    assert analysis.minimal_period("") == ""
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_key_lengths_on_sample(cipher_text, workers):
+    ranked = analysis.verify_key_lengths(cipher_text, workers=workers)
+    assert ranked[0][:2] == (len(KEY), KEY)
+    # Кратні довжини зведені до найкоротшого періоду
+    assert len({key for _, key, _ in ranked}) == len(ranked)
+    assert [score for _, _, score in ranked] == sorted((score for _, _, score in ranked), reverse=True)
+
+
+def test_vigenere_decrypt_buffer(plain_text, cipher_text):
+    out = bytearray(len(cipher_text))
+    result = analysis.vigenere_decrypt_buffer(cipher_text.encode("ascii"), KEY, out)
+    assert result.tobytes() == bytes(out) == plain_text.encode("ascii")
+    assert analysis.vigenere_decrypt(cipher_text, KEY) == plain_text
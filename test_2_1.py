@@ -0,0 +1,120 @@
+"""
+Тести простої перестановки (2_1.py): еквівалентність реалізацій на масивах, файлах,
+блоках і буферах посимвольному алгоритму з матрицею.
+"""
+import importlib
+import io
+import os
+
+import numpy as np
+import pytest
+
+transposition = importlib.import_module("2_1")
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+KEYWORDS = ["SECRET", "CRYPTOGRA", "KEY", "A"]
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+def as_array(text):
+    return np.frombuffer(text.encode("ascii"), dtype=np.uint8).copy()
+
+
+@pytest.mark.parametrize("keyword", KEYWORDS)
+@pytest.mark.parametrize("length", [None, 1, 5, 6, 7])
+def test_array_matches_matrix(plain_text, keyword, length):
+    text = plain_text if length is None else plain_text[:length]
+    expected = transposition.encrypt_transposition(text, keyword)
+    encrypted = transposition.transposition_encrypt_array(as_array(text), keyword)
+    assert encrypted.tobytes().decode("ascii") == expected
+    decrypted = transposition.transposition_decrypt_array(encrypted, keyword)
+    assert decrypted.tobytes().decode("ascii") == transposition.decrypt_transposition(expected, keyword)
+
+
+def test_file_round_trip(plain_text, tmp_path):
+    source, encrypted, decrypted = tmp_path / "plain.txt", tmp_path / "enc.txt", tmp_path / "dec.txt"
+    source.write_text(plain_text)
+    transposition.encrypt_transposition_file(source, encrypted, "SECRET")
+    transposition.decrypt_transposition_file(encrypted, decrypted, "SECRET")
+    assert encrypted.read_text() == transposition.encrypt_transposition(plain_text, "SECRET")
+    assert decrypted.read_text() == plain_text
+
+
+def test_file_empty(tmp_path):
+    source, encrypted = tmp_path / "plain.txt", tmp_path / "enc.txt"
+    source.write_bytes(b"")
+    transposition.encrypt_transposition_file(source, encrypted, "SECRET")
+    assert encrypted.read_bytes() == b""
+
+
+def test_file_refuses_to_overwrite_input(tmp_path):
+    source = tmp_path / "plain.txt"
+    source.write_text("Hello, World")
+    for function in [transposition.encrypt_transposition_file, transposition.decrypt_transposition_file]:
+        with pytest.raises(ValueError):
+            function(source, tmp_path / "." / "plain.txt", "SECRET")
+    assert source.read_text() == "Hello, World"
+
+
+@pytest.mark.parametrize("block_size", [6, 50, 1 << 20])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_blocks_round_trip(plain_text, block_size, workers):
+    data = plain_text.encode("ascii")
+    encrypted = io.BytesIO()
+    transposition.encrypt_transposition_blocks(io.BytesIO(data), encrypted, "SECRET", block_size, workers)
+    assert transposition.is_block_stream(encrypted.getvalue())
+    decrypted = io.BytesIO()
+    transposition.decrypt_transposition_blocks(io.BytesIO(encrypted.getvalue()), decrypted, "SECRET",
+                                               block_size, workers)
+    assert decrypted.getvalue() == data
+
+
+def test_blocks_keep_trailing_padding_character():
+    # Заголовок довжини зберігає й кінцеві '@' відкритого тексту
+    encrypted = io.BytesIO()
+    transposition.encrypt_transposition_blocks(io.BytesIO(b"MAIL@"), encrypted, "SECRET", 12)
+    decrypted = io.BytesIO()
+    transposition.decrypt_transposition_blocks(io.BytesIO(encrypted.getvalue()), decrypted, "SECRET", 12)
+    assert decrypted.getvalue() == b"MAIL@"
+
+
+def test_blocks_refuse_plain_ciphertext():
+    plain_cipher = transposition.encrypt_transposition("ATTACK AT DAWN", "SECRET").encode("ascii")
+    assert not transposition.is_block_stream(plain_cipher)
+    with pytest.raises(ValueError):
+        transposition.decrypt_transposition_blocks(io.BytesIO(plain_cipher), io.BytesIO(), "SECRET")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_break_transposition_on_sample(plain_text, workers):
+    ciphertext = transposition.encrypt_transposition(plain_text, "SECRET")
+    result = transposition.break_transposition(ciphertext, max_width=8, workers=workers)
+    assert result["width"] == 6
+    assert transposition.get_permutation_order(result["keyword"]) == transposition.get_permutation_order("SECRET")
+    assert result["plaintext"] == plain_text
+
+
+@pytest.mark.parametrize("keyword", KEYWORDS)
+def test_buffer_matches_text_and_allows_aliasing(plain_text, keyword):
+    data = plain_text.encode("ascii")
+    expected = transposition.encrypt_transposition(plain_text, keyword).encode("ascii")
+    assert transposition.encrypt_transposition_buffer(data, keyword).tobytes() == expected
+    # Результат пишеться в той самий буфер, де лежить вхід
+    buffer = bytearray(len(expected))
+    buffer[:len(data)] = data
+    transposition.encrypt_transposition_buffer(memoryview(buffer)[:len(data)], keyword, out=buffer)
+    assert bytes(buffer) == expected
+    result = transposition.decrypt_transposition_buffer(buffer, keyword, out=buffer)
+    assert result.tobytes() == data
+
+
+def test_buffer_rejects_small_or_read_only_output():
+    with pytest.raises(ValueError):
+        transposition.encrypt_transposition_buffer(b"ATTACK AT DAWN", "SECRET", out=bytearray(14))
+    with pytest.raises(ValueError):
+        transposition.encrypt_transposition_buffer(b"ATTACK", "SECRET", out=bytes(6))
@@ -0,0 +1,83 @@
+"""
+Тести подвійної перестановки (2_2.py): кешовані плани, блоки та буфери проти
+посимвольного алгоритму з матрицями.
+"""
+import importlib
+import io
+import os
+
+import pytest
+
+double = importlib.import_module("2_2")
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+KEY_PAIRS = [("SECRET", "CRYPTO"), ("KEY", "LONGERKEY"), ("CRYPTOGRA", "AB"), ("A", "B")]
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("key1, key2", KEY_PAIRS)
+@pytest.mark.parametrize("length", [None, 1, 6, 7, 100])
+def test_plan_matches_matrix(plain_text, key1, key2, length):
+    text = plain_text if length is None else plain_text[:length]
+    expected = double.encrypt_double_transposition(text, key1, key2)
+    assert double.encrypt_with_plan(text, key1, key2) == expected
+    assert double.encrypt_with_plan(text.encode("ascii"), key1, key2) == expected.encode("ascii")
+    assert double.decrypt_with_plan(expected, key1, key2) == double.decrypt_double_transposition(expected, key1, key2)
+    assert double.decrypt_with_plan(expected, key1, key2) == text
+
+
+def test_plan_cache_reuses_plans_for_same_shape():
+    double.configure_plan_cache(4)
+    try:
+        double.encrypt_with_plan("ATTACK AT DAWN", "SECRET", "CRYPTO")
+        double.encrypt_with_plan("RETREAT AT TEN", "SECRET", "CRYPTO")
+        info = double.plan_cache_info()
+        assert (info["hits"], info["misses"]) == (1, 1)
+    finally:
+        double.configure_plan_cache(double.PLAN_CACHE_SIZE)
+
+
+def test_plan_rejects_wrong_length():
+    plan = double.compile_double_transposition_plan("SECRET", "CRYPTO", 3)
+    with pytest.raises(ValueError):
+        plan.decrypt("TOO SHORT")
+
+
+@pytest.mark.parametrize("block_size", [6, 100, 1 << 20])
+def test_blocks_round_trip(plain_text, block_size):
+    data = plain_text.encode("ascii")
+    encrypted = io.BytesIO()
+    double.encrypt_double_transposition_blocks(io.BytesIO(data), encrypted, "SECRET", "CRYPTO", block_size, 1)
+    decrypted = io.BytesIO()
+    double.decrypt_double_transposition_blocks(io.BytesIO(encrypted.getvalue()), decrypted, "SECRET", "CRYPTO",
+                                               block_size, 1)
+    assert decrypted.getvalue() == data
+
+
+def test_break_double_transposition_on_sample(plain_text):
+    ciphertext = double.encrypt_double_transposition(plain_text, "SECRET", "CRYPTO")
+    reports = []
+    result = double.break_double_transposition(ciphertext, max_key1_length=6, max_key2_length=6, workers=1,
+                                               progress=lambda done, total, best: reports.append((done, total)))
+    assert result["plaintext"] == plain_text
+    assert len(result["key1"]) == 6 and len(result["key2"]) == 6
+    assert reports[-1][0] == reports[-1][1] == len(reports)
+    assert len(result["candidates"]) == double.DOUBLE_TOP
+
+
+@pytest.mark.parametrize("key1, key2", KEY_PAIRS)
+def test_buffer_matches_plan_and_allows_aliasing(plain_text, key1, key2):
+    data = plain_text.encode("ascii")
+    expected = double.encrypt_with_plan(plain_text, key1, key2).encode("ascii")
+    assert double.encrypt_double_transposition_buffer(data, key1, key2).tobytes() == expected
+    buffer = bytearray(len(expected))
+    buffer[:len(data)] = data
+    double.encrypt_double_transposition_buffer(memoryview(buffer)[:len(data)], key1, key2, out=buffer)
+    assert bytes(buffer) == expected
+    result = double.decrypt_double_transposition_buffer(buffer, key1, key2, out=buffer)
+    assert result.tobytes() == data
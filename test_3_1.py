@@ -0,0 +1,189 @@
+"""
+Тести шифру Playfair (3_1.py): скомпільовані ключі, потоки, пакети та буфери
+проти посимвольного алгоритму split_text / transform_pair.
+"""
+import importlib
+import os
+
+import numpy as np
+import pytest
+
+import ngram_fitness
+
+playfair = importlib.import_module("3_1")
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+KEYWORDS = ["MATRIX", "PLAYFAIR", "KEYWORD", ""]
+SAMPLES = [
+    "",
+    "A",
+    "Hello, World!",
+    "balloon",
+    "jazz JAM jj",
+    "AAAA BBB",
+    "ends with a space ",
+    "x marks the spot",
+]
+
+
+def reference_playfair(text, keyword, decrypt=False):
+    """
+    Посимвольний алгоритм: пари split_text і перетворення transform_pair.
+    """
+    cipher_table = playfair.generate_cipher_table(keyword)
+    result = ""
+    for pair in playfair.split_text(text) if text else []:
+        if len(pair) == 1 or pair[0] not in cipher_table or pair[1] not in cipher_table:
+            result += pair
+        else:
+            result += playfair.transform_pair(cipher_table, pair[0], pair[1], -1 if decrypt else 1)
+    return result.replace("X", "") if decrypt else result
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("keyword", KEYWORDS)
+def test_compiled_key_matches_reference(plain_text, keyword):
+    for text in SAMPLES + [plain_text]:
+        encrypted = playfair.playfair_encrypt(text, keyword)
+        assert encrypted == reference_playfair(text, keyword)
+        assert playfair.playfair_decrypt(encrypted, keyword) == reference_playfair(encrypted, keyword, True)
+
+
+def test_compiled_key_is_cached():
+    assert playfair.compile_playfair_key("MATRIX") is playfair.compile_playfair_key("MATRIX")
+
+
+# Слова без роздільників довші за вікно векторизованої обробки, з подвоєними літерами
+LETTER_RUN = "QQ" + "ABCDEFGHIKLMNOPRSTUVWYZ" * 50 + "BALLOON" * 20 + "LLL" * 30
+
+
+@pytest.mark.parametrize("chunk_size", [7, 8, 64, 1000])
+@pytest.mark.parametrize("passes", [1, playfair.MAX_PAIRING_PASSES])
+def test_letter_runs_longer_than_vector_chunk(monkeypatch, chunk_size, passes):
+    monkeypatch.setattr(playfair, "VECTOR_CHUNK_SIZE", chunk_size)
+    monkeypatch.setattr(playfair, "MAX_PAIRING_PASSES", passes)
+    for text in [LETTER_RUN, LETTER_RUN + " tail", "word " + LETTER_RUN]:
+        encrypted = playfair.playfair_encrypt(text, "MATRIX")
+        assert encrypted == reference_playfair(text, "MATRIX")
+        assert playfair.playfair_decrypt(encrypted, "MATRIX") == reference_playfair(encrypted, "MATRIX", True)
+
+
+def test_letter_run_longer_than_default_vector_chunk():
+    text = "QQ" + "ABCDEFGHIKLMNOPRSTUVWYZ" * (playfair.VECTOR_CHUNK_SIZE // 23 + 100)
+    assert playfair.playfair_encrypt(text, "MATRIX") == reference_playfair(text, "MATRIX")
+
+
+def test_square_table_check():
+    assert playfair.is_square_table(playfair.generate_cipher_table("MATRIX"))
+    # Малі літери та J не дають квадрат 5x5 — для них працює посимвольний алгоритм
+    assert not playfair.is_square_table(playfair.generate_cipher_table("jam"))
+    assert not playfair.is_square_table(playfair.generate_cipher_table("JAM"))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 64])
+@pytest.mark.parametrize("decrypt", [False, True])
+def test_stream_matches_whole_text(plain_text, chunk_size, decrypt):
+    text = playfair.playfair_encrypt(plain_text, "MATRIX") if decrypt else plain_text
+    for sample in SAMPLES + [text]:
+        chunks = (sample[start:start + chunk_size] for start in range(0, len(sample), chunk_size))
+        streamed = "".join(playfair.playfair_stream(chunks, "MATRIX", decrypt))
+        transform = playfair.playfair_decrypt if decrypt else playfair.playfair_encrypt
+        assert streamed == transform(sample, "MATRIX")
+
+
+def test_file_stream_round_trip(plain_text, tmp_path):
+    source, encrypted, decrypted = tmp_path / "plain.txt", tmp_path / "enc.txt", tmp_path / "dec.txt"
+    source.write_text(plain_text)
+    playfair.playfair_file_stream(source, encrypted, "MATRIX", chunk_size=100)
+    playfair.playfair_file_stream(encrypted, decrypted, "MATRIX", decrypt=True, chunk_size=77)
+    assert encrypted.read_text() == playfair.playfair_encrypt(plain_text, "MATRIX")
+    assert decrypted.read_text() == playfair.playfair_decrypt(encrypted.read_text(), "MATRIX")
+
+
+def test_file_stream_refuses_to_overwrite_input(tmp_path):
+    source = tmp_path / "plain.txt"
+    source.write_text("Hello, World")
+    with pytest.raises(ValueError):
+        playfair.playfair_file_stream(source, tmp_path / "." / "plain.txt", "MATRIX")
+    assert source.read_text() == "Hello, World"
+
+
+@pytest.mark.parametrize("decrypt", [False, True])
+def test_batch_matches_single_messages(plain_text, decrypt):
+    transform = playfair.playfair_decrypt if decrypt else playfair.playfair_encrypt
+    # Не-ASCII повідомлення йде посимвольним шляхом, решта — векторним
+    messages = SAMPLES + [plain_text, "café au lait"]
+    keywords = (KEYWORDS * 3)[:len(messages)]
+    expected = [transform(message, keyword) for message, keyword in zip(messages, keywords)]
+    assert playfair.playfair_batch(messages, keywords, decrypt) == expected
+    assert playfair.playfair_batch(plain_text, KEYWORDS, decrypt) == [transform(plain_text, k) for k in KEYWORDS]
+    data, offsets = playfair.playfair_batch(messages, keywords, decrypt, as_buffer=True)
+    assert data.decode("utf-8") == "".join(expected)
+    assert offsets[-1] == len(data)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1 << 20])
+def test_buffer_matches_text(plain_text, monkeypatch, chunk_size):
+    monkeypatch.setattr(playfair, "VECTOR_CHUNK_SIZE", chunk_size)
+    # Довгий ряд подвоєних літер обробляється запасним посимвольним шляхом
+    for text in SAMPLES + [plain_text, "word " + "L" * 40 + " end"]:
+        data = text.encode("ascii")
+        out = bytearray(2 * len(data) + 1)
+        encrypted = playfair.playfair_encrypt_buffer(data, "MATRIX", out)
+        assert encrypted.tobytes() == playfair.playfair_encrypt(text, "MATRIX").encode("ascii")
+        assert bytes(out[:len(encrypted)]) == encrypted.tobytes()
+        decrypted = playfair.playfair_decrypt_buffer(encrypted.tobytes(), "MATRIX")
+        assert decrypted.tobytes() == playfair.playfair_decrypt(encrypted.tobytes().decode("ascii"), "MATRIX").encode("ascii")
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64])
+def test_buffer_letter_runs_longer_than_vector_chunk(monkeypatch, chunk_size):
+    monkeypatch.setattr(playfair, "VECTOR_CHUNK_SIZE", chunk_size)
+    for text in [LETTER_RUN, "word " + LETTER_RUN.lower() + " tail"]:
+        encrypted = playfair.playfair_encrypt_buffer(text.encode("ascii"), "MATRIX")
+        assert encrypted.tobytes() == playfair.playfair_encrypt(text, "MATRIX").encode("ascii")
+        decrypted = playfair.playfair_decrypt_buffer(encrypted, "MATRIX")
+        assert decrypted.tobytes() == playfair.playfair_decrypt(encrypted.tobytes().decode("ascii"), "MATRIX").encode("ascii")
+
+
+def test_buffer_letter_run_longer_than_default_vector_chunk():
+    text = "QQ" + "ABCDEFGHIKLMNOPRSTUVWYZ" * (playfair.VECTOR_CHUNK_SIZE // 23 + 100)
+    out = bytearray(2 * len(text) + 1)
+    encrypted = playfair.playfair_encrypt_buffer(text.encode("ascii"), "MATRIX", out)
+    assert encrypted.tobytes() == reference_playfair(text, "MATRIX").encode("ascii")
+
+
+def test_buffer_rejects_bad_key_and_small_output():
+    with pytest.raises(ValueError):
+        playfair.playfair_encrypt_buffer(b"text", "jam")
+    with pytest.raises(ValueError):
+        playfair.playfair_encrypt_buffer(b"Hello, World", "MATRIX", out=bytearray(4))
+
+
+# Запуск відпалу з цим зерном знаходить ключ MATRIX для plaintext.txt за частку секунди
+# (у середньому успішний приблизно кожен десятий запуск, див. break_playfair)
+SUCCESSFUL_SEED = 259
+
+
+def test_quadgram_table_scores_true_key_above_target(plain_text):
+    table = playfair.playfair_quadgram_table()
+    assert not table.flags.writeable and playfair.playfair_quadgram_table() is table
+    ciphertext = playfair.playfair_encrypt(plain_text, "MATRIX")
+    # Розшифрування справжнім ключем (з уставленими X) оцінюється вище за ANNEALING_TARGET
+    square = np.array([ord(letter) - 65 for letter in playfair.generate_cipher_table("MATRIX")])
+    cipher = playfair.cipher_letter_codes(ciphertext)
+    per_quadgram = ngram_fitness.score_letters(playfair.decrypt_codes(cipher, square), table) / (len(cipher) - 3)
+    assert per_quadgram > playfair.ANNEALING_TARGET
+
+
+@pytest.mark.parametrize("workers, restarts, seed", [(1, 1, SUCCESSFUL_SEED), (2, 2, SUCCESSFUL_SEED // 2)])
+def test_break_playfair_on_sample(plain_text, workers, restarts, seed):
+    ciphertext = playfair.playfair_encrypt(plain_text, "MATRIX")
+    result = playfair.break_playfair(ciphertext, restarts=restarts, workers=workers, seed=seed, time_budget=60)
+    assert result["plaintext"] == playfair.playfair_decrypt(ciphertext, "MATRIX")
+    assert result["score"] / (len(playfair.cipher_letter_codes(ciphertext)) - 3) >= playfair.ANNEALING_TARGET
@@ -0,0 +1,59 @@
+"""
+Тести каскаду Віженер -> Playfair (3_2.py): однопрохідний конвеєр і буферний варіант
+проти двокрокового шифрування з основного блоку.
+"""
+import importlib
+import os
+
+import pytest
+
+cascade = importlib.import_module("3_2")
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+SAMPLES = ["", "A", "ab", "Hello, World", "It's a well-known fact."]
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1 << 16])
+def test_fused_matches_two_step(plain_text, chunk_size):
+    for text in SAMPLES + [plain_text]:
+        expected = cascade.cascade_encrypt_two_step(text, "KEY", "CRYPTO")
+        assert cascade.cascade_encrypt(text, "KEY", "CRYPTO", chunk_size=chunk_size) == expected
+
+
+def test_file_matches_two_step(plain_text, tmp_path):
+    source, encrypted = tmp_path / "plain.txt", tmp_path / "enc.txt"
+    source.write_text(plain_text)
+    cascade.cascade_encrypt_file(source, encrypted, cascade.cascade_stages("KEY", "CRYPTO"), chunk_size=3)
+    assert encrypted.read_text() == cascade.cascade_encrypt_two_step(plain_text, "KEY", "CRYPTO")
+
+
+def test_file_refuses_to_overwrite_input(tmp_path):
+    source = tmp_path / "plain.txt"
+    source.write_text("Hello, World")
+    with pytest.raises(ValueError):
+        cascade.cascade_encrypt_file(source, tmp_path / "." / "plain.txt", cascade.cascade_stages("KEY", "CRYPTO"))
+    assert source.read_text() == "Hello, World"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_buffer_matches_two_step(plain_text, chunk_size):
+    for text in SAMPLES + [plain_text]:
+        data = text.encode("ascii")
+        out = bytearray(len(data) + 1)
+        result = cascade.cascade_encrypt_buffer(memoryview(data), "KEY", "CRYPTO", out, chunk_size=chunk_size)
+        assert result.tobytes() == cascade.cascade_encrypt_two_step(text, "KEY", "CRYPTO").encode("ascii")
+    with pytest.raises(ValueError):
+        cascade.cascade_encrypt_buffer(plain_text.encode("ascii"), "KEY", "CRYPTO", out=bytearray(10))
+
+
+def test_buffer_letters_only_input_longer_than_vector_chunk():
+    # Після очищення каскаду лишаються самі літери; подвоєні літери не порушують пар
+    text = "QQ" + "ABCDEFGHIKLMNOPRSTUVWYZ" * ((1 << 20) // 23 + 100)
+    result = cascade.cascade_encrypt_buffer(text.encode("ascii"), "KEY", "CRYPTO")
+    assert result.tobytes() == cascade.cascade_encrypt_two_step(text, "KEY", "CRYPTO").encode("ascii")
@@ -0,0 +1,74 @@
+"""
+Тести набору вимірювань (benchmark.py): корпуси, порівняння з базовим файлом
+і одне реальне вимірювання в окремому процесі.
+"""
+import os
+
+import pytest
+
+import benchmark
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+
+
+@pytest.fixture
+def corpus_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "CORPUS_DIR", str(tmp_path))
+    monkeypatch.setattr(benchmark, "CORPUS_SOURCE", PLAIN_TEXT_FILE)
+    return tmp_path
+
+
+def test_parse_size():
+    assert benchmark.parse_size("1MB") == 1 << 20
+    assert benchmark.parse_size("1234") == 1234
+
+
+@pytest.mark.parametrize("size", [1 << 10, 10000])
+def test_corpus_path_is_deterministic(corpus_dir, size):
+    path = benchmark.corpus_path(size)
+    assert os.path.getsize(path) == size
+    with open(path, "rb") as file, open(PLAIN_TEXT_FILE, "rb") as source:
+        assert file.read(100) == source.read(100)
+    assert benchmark.corpus_path(size) == path
+
+
+def test_compare_with_baseline_reports_regressions():
+    baseline = {"case": {"1KB": {"mb_s": 100.0, "peak_rss_mb": 50.0, "latency_us": {"p99": 10.0}}}}
+    same = {"case": {"1KB": {"mb_s": 95.0, "peak_rss_mb": 55.0, "latency_us": {"p99": 10.5}}}}
+    assert benchmark.compare_with_baseline(same, baseline, 0.1, 0.2) == []
+    worse = {"case": {"1KB": {"mb_s": 50.0, "peak_rss_mb": 80.0, "latency_us": {"p99": 20.0}}}}
+    assert len(benchmark.compare_with_baseline(worse, baseline, 0.1, 0.2)) == 3
+    assert benchmark.compare_with_baseline({"other": same["case"]}, baseline, 0.1, 0.2) == []
+    failed = {"case": {"1KB": {"error": "MemoryError: "}}}
+    assert benchmark.compare_with_baseline(failed, baseline, 0.1, 0.2) == ["case 1KB: MemoryError: "]
+
+
+def test_every_case_prepares(corpus_dir):
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        text = file.read(500)
+    for prepare, _ in benchmark.CASES.values():
+        prepare()(text)
+    # Розшифрування вимірюється на шифротексті того самого корпусу
+    for case in ["vigenere_decrypt_vectorized", "decrypt_double_transposition", "decrypt_with_plan"]:
+        assert benchmark.CASES[case][0]()(text) == text
+    assert bytes(benchmark.CASES["decrypt_double_transposition_buffer"][0]()(text)) == text.encode("utf-8")
+
+
+def test_run_case_in_subprocess(corpus_dir):
+    result = benchmark.run_case("vigenere_encrypt_vectorized", benchmark.corpus_path(1 << 10))
+    assert result["bytes"] == 1 << 10
+    assert result["mb_s"] > 0 and result["peak_rss_mb"] > 0
+    assert set(result["latency_us"]) == {"p50", "p95", "p99"}
+
+
+def test_run_case_reports_child_errors(corpus_dir):
+    with pytest.raises(RuntimeError, match="FileNotFoundError"):
+        benchmark.run_case("vigenere_encrypt_vectorized", str(corpus_dir / "missing.txt"))
+
+
+def test_run_benchmarks_records_errors(corpus_dir, monkeypatch):
+    def fail(case, path, timeout):
+        raise RuntimeError(f"{case}: процес вимірювання завершився з кодом -9")
+    monkeypatch.setattr(benchmark, "run_case", fail)
+    results = benchmark.run_benchmarks(["1KB"], ["friedman_test"])
+    assert results == {"friedman_test": {"1KB": {"error": "friedman_test: процес вимірювання завершився з кодом -9"}}}
@@ -0,0 +1,64 @@
+"""
+Тести допоміжних функцій буферного API (buffers.py).
+"""
+import mmap
+
+import numpy as np
+import pytest
+
+import buffers
+
+
+def test_as_byte_array_does_not_copy():
+    data = bytearray(b"abcdef")
+    array = buffers.as_byte_array(memoryview(data)[1:4])
+    array[0] = ord("X")
+    assert data == b"aXcdef"
+    words = np.arange(3, dtype=np.uint16)
+    assert buffers.as_byte_array(words).tobytes() == words.tobytes()
+
+
+def test_output_byte_array():
+    assert len(buffers.output_byte_array(None, 5)) == 5
+    out = bytearray(10)
+    buffers.output_byte_array(out, 4)[:] = 1
+    assert out == b"\x01" * 4 + b"\x00" * 6
+    with pytest.raises(ValueError):
+        buffers.output_byte_array(bytes(10), 4)
+    with pytest.raises(ValueError):
+        buffers.output_byte_array(out, 11)
+
+
+def test_separate_input_copies_only_shared_memory():
+    data = np.arange(10, dtype=np.uint8)
+    assert buffers.separate_input(data, np.empty(10, dtype=np.uint8)) is data
+    copy = buffers.separate_input(data[2:], data[:5])
+    assert copy is not data and not np.may_share_memory(copy, data)
+
+
+def test_byte_writer_with_and_without_out():
+    parts = [np.frombuffer(b"ab", dtype=np.uint8), np.frombuffer(b"cde", dtype=np.uint8)]
+    writer = buffers.ByteWriter()
+    assert len(writer.result()) == 0
+    for part in parts:
+        writer.write(part)
+    assert writer.result().tobytes() == b"abcde"
+
+    with mmap.mmap(-1, 8) as mapped:
+        writer = buffers.ByteWriter(mapped)
+        for part in parts:
+            writer.write(part)
+        result = writer.result()
+        assert result.tobytes() == mapped[:5] == b"abcde"
+        # Масиви над mmap звільняються до його закриття
+        del result, writer
+
+    writer = buffers.ByteWriter(bytearray(4))
+    writer.write(parts[0])
+    with pytest.raises(ValueError):
+        writer.write(parts[1])
+
+
+def test_byte_writer_rejects_read_only_out():
+    with pytest.raises(ValueError):
+        buffers.ByteWriter(b"read only")
@@ -0,0 +1,123 @@
+"""
+Тести командного рядка (cli.py): результат кожного режиму збігається з функціями модулів.
+"""
+import importlib
+import os
+
+import pytest
+
+import cli
+
+vigenere = importlib.import_module("1_1")
+vigenere_analysis = importlib.import_module("1_2")
+transposition = importlib.import_module("2_1")
+double_transposition = importlib.import_module("2_2")
+playfair = importlib.import_module("3_1")
+cascade = importlib.import_module("3_2")
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+@pytest.fixture
+def plain_file(plain_text, tmp_path):
+    path = tmp_path / "plain.txt"
+    path.write_text(plain_text)
+    return path
+
+
+def run(tmp_path, command, source, *options):
+    """
+    Запускає cli.main для файлу source і повертає вміст вихідного файлу.
+    """
+    output = tmp_path / f"{command}-{len(list(tmp_path.iterdir()))}.out"
+    cli.main([command, *options, "-i", str(source), "-o", str(output)])
+    return output
+
+
+@pytest.mark.parametrize("options", [[], ["--mmap"], ["--workers", "2"], ["--chunk-size", "7"]])
+def test_vigenere_round_trip(plain_text, plain_file, tmp_path, options):
+    encrypted = run(tmp_path, "encrypt", plain_file, "--cipher", "vigenere", "--key", "CRYPTOGRAPHY", *options)
+    assert encrypted.read_text() == vigenere.vigenere_encrypt(plain_text, "CRYPTOGRAPHY")
+    decrypted = run(tmp_path, "decrypt", encrypted, "--cipher", "vigenere", "--key", "CRYPTOGRAPHY", *options)
+    assert decrypted.read_text() == plain_text
+
+
+@pytest.mark.parametrize("options", [[], ["--workers", "2"]])
+def test_stats_count_input_bytes(plain_file, tmp_path, capsys, options):
+    run(tmp_path, "encrypt", plain_file, "--cipher", "vigenere", "--key", "KEY", "--stats", *options)
+    assert capsys.readouterr().err.startswith(f"{os.path.getsize(plain_file)} bytes")
+
+
+@pytest.mark.parametrize("options", [[], ["--mmap"]])
+def test_transposition_round_trip(plain_text, plain_file, tmp_path, options):
+    encrypted = run(tmp_path, "encrypt", plain_file, "--cipher", "transposition", "--key", "SECRET", *options)
+    assert encrypted.read_text() == transposition.encrypt_transposition(plain_text, "SECRET")
+    decrypted = run(tmp_path, "decrypt", encrypted, "--cipher", "transposition", "--key", "SECRET", *options)
+    assert decrypted.read_text() == plain_text
+
+
+def test_double_transposition_round_trip(plain_text, plain_file, tmp_path):
+    keys = ["--cipher", "double-transposition", "--key", "SECRET", "--key2", "CRYPTO"]
+    encrypted = run(tmp_path, "encrypt", plain_file, *keys)
+    assert encrypted.read_text() == double_transposition.encrypt_double_transposition(plain_text, "SECRET", "CRYPTO")
+    assert run(tmp_path, "decrypt", encrypted, *keys).read_text() == plain_text
+
+
+@pytest.mark.parametrize("cipher_options", [
+    ["--cipher", "transposition", "--key", "SECRET"],
+    ["--cipher", "double-transposition", "--key", "SECRET", "--key2", "CRYPTO"],
+])
+def test_block_mode_is_explicit(plain_text, plain_file, tmp_path, cipher_options):
+    block = ["--block-mode", "--chunk-size", "60"]
+    encrypted = run(tmp_path, "encrypt", plain_file, *cipher_options, *block)
+    assert transposition.is_block_stream(encrypted.read_bytes())
+    assert run(tmp_path, "decrypt", encrypted, *cipher_options, *block).read_text() == plain_text
+    # Без --block-mode блоковий потік не розшифровується як звичайний шифротекст
+    with pytest.raises(SystemExit):
+        run(tmp_path, "decrypt", encrypted, *cipher_options)
+    # --chunk-size без --block-mode не змінює формат
+    plain_cipher = run(tmp_path, "encrypt", plain_file, *cipher_options, "--chunk-size", "60")
+    assert not transposition.is_block_stream(plain_cipher.read_bytes())
+
+
+def test_block_mode_rejected_for_other_ciphers(plain_file, tmp_path):
+    with pytest.raises(SystemExit):
+        run(tmp_path, "encrypt", plain_file, "--cipher", "vigenere", "--key", "KEY", "--block-mode")
+
+
+def test_playfair_and_cascade(plain_text, plain_file, tmp_path):
+    encrypted = run(tmp_path, "encrypt", plain_file, "--cipher", "playfair", "--key", "MATRIX", "--chunk-size", "5")
+    assert encrypted.read_text() == playfair.playfair_encrypt(plain_text, "MATRIX")
+    decrypted = run(tmp_path, "decrypt", encrypted, "--cipher", "playfair", "--key", "MATRIX")
+    assert decrypted.read_text() == playfair.playfair_decrypt(encrypted.read_text(), "MATRIX")
+    chained = run(tmp_path, "encrypt", plain_file, "--cipher", "cascade", "--key", "KEY", "--key2", "CRYPTO")
+    assert chained.read_text() == cascade.cascade_encrypt_two_step(plain_text, "KEY", "CRYPTO")
+
+
+@pytest.mark.parametrize("cipher", ["vigenere", "transposition", "playfair"])
+def test_refuses_to_overwrite_input(plain_text, plain_file, tmp_path, cipher):
+    with pytest.raises(SystemExit):
+        cli.main(["encrypt", "--cipher", cipher, "--key", "KEY", "--workers", "2",
+                  "-i", str(plain_file), "-o", str(tmp_path / "." / "plain.txt")])
+    assert plain_file.read_text() == plain_text
+
+
+@pytest.mark.parametrize("cipher, module, function, expected", [
+    ("vigenere", vigenere_analysis, "break_vigenere", 40),
+    ("transposition", transposition, "break_transposition", 12),
+    ("double-transposition", double_transposition, "break_double_transposition", 10),
+])
+def test_break_max_key_length_default_per_cipher(plain_file, tmp_path, monkeypatch, cipher, module, function,
+                                                  expected):
+    calls = []
+    monkeypatch.setattr(module, function, lambda text, max_key_length, *args, **kwargs: calls.append(max_key_length))
+    monkeypatch.setattr(cli.ngram_fitness, "load_quadgram_table", lambda *args: None)
+    run(tmp_path, "break", plain_file, "--cipher", cipher)
+    run(tmp_path, "break", plain_file, "--cipher", cipher, "--max-key-length", "7")
+    assert calls == [expected, 7]
@@ -0,0 +1,93 @@
+"""
+Тести локального сервісу (daemon.py): кадри протоколу, обробка запитів і справжній
+сервіс в окремому процесі з конвеєром запитів.
+"""
+import importlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+import daemon
+
+vigenere = importlib.import_module("1_1")
+double_transposition = importlib.import_module("2_2")
+playfair = importlib.import_module("3_1")
+cascade = importlib.import_module("3_2")
+
+DAEMON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "daemon.py")
+
+
+def parse_frame(frame):
+    header_length, payload_length = daemon.FRAME.unpack(frame[:daemon.FRAME.size])
+    body = frame[daemon.FRAME.size:]
+    assert len(body) == header_length + payload_length
+    return json.loads(body[:header_length]), body[header_length:]
+
+
+def test_encode_frame_round_trip():
+    header, payload = parse_frame(daemon.encode_frame({"op": "encrypt"}, b"data"))
+    assert header == {"op": "encrypt"} and payload == b"data"
+
+
+@pytest.mark.parametrize("cipher, op, key, key2, expected", [
+    ("vigenere", "encrypt", "KEY", None, vigenere.vigenere_encrypt("Hello, World", "KEY")),
+    ("double-transposition", "encrypt", "SECRET", "CRYPTO",
+     double_transposition.encrypt_double_transposition("Hello, World", "SECRET", "CRYPTO")),
+    ("playfair", "encrypt", "MATRIX", None, playfair.playfair_encrypt("Hello, World", "MATRIX")),
+    ("cascade", "encrypt", "KEY", "CRYPTO", cascade.cascade_encrypt_two_step("Hello, World", "KEY", "CRYPTO")),
+])
+def test_process_request(cipher, op, key, key2, expected):
+    request = json.dumps({"cipher": cipher, "op": op, "key": key, "key2": key2}).encode("utf-8")
+    header, payload = parse_frame(daemon.process_request(request, b"Hello, World"))
+    assert header == {"ok": True} and payload.decode("utf-8") == expected
+
+
+@pytest.mark.parametrize("request_header", [
+    b"not json",
+    b'{"cipher": "enigma", "op": "encrypt", "key": "K"}',
+    b'{"cipher": "double-transposition", "op": "encrypt", "key": "K"}',
+    b'{"cipher": "cascade", "op": "decrypt", "key": "K", "key2": "L"}',
+])
+def test_process_request_reports_errors(request_header):
+    header, payload = parse_frame(daemon.process_request(request_header, b"text"))
+    assert header["ok"] is False and header["error"] and payload == b""
+
+
+@pytest.fixture
+def service(tmp_path):
+    path = str(tmp_path / "ciphers.sock")
+    process = subprocess.Popen([sys.executable, DAEMON_FILE, "--socket", path, "--workers", "1",
+                                "--offload-threshold", "100"], cwd=os.path.dirname(DAEMON_FILE))
+    deadline = time.monotonic() + 30
+    while not os.path.exists(path):
+        assert process.poll() is None and time.monotonic() < deadline
+        time.sleep(0.05)
+    yield path
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=30) == 0
+    assert not os.path.exists(path)
+
+
+def test_client_pipeline(service):
+    long_text = "Attack at dawn. " * 20
+    double_cipher = double_transposition.encrypt_double_transposition("Hello, World", "SECRET", "CRYPTO")
+    with daemon.DaemonClient(service) as client:
+        results = client.pipeline([
+            ("vigenere", "encrypt", "KEY", long_text),
+            ("playfair", "encrypt", "MATRIX", "Hello, World"),
+            ("double-transposition", "decrypt", "SECRET", double_cipher, "CRYPTO"),
+        ])
+        assert results == [
+            vigenere.vigenere_encrypt(long_text, "KEY"),
+            playfair.playfair_encrypt("Hello, World", "MATRIX"),
+            "Hello, World",
+        ]
+        # Помилка запиту не закриває з'єднання
+        with pytest.raises(RuntimeError):
+            client.request("cascade", "decrypt", "KEY", "text", "CRYPTO")
+        assert client.request("vigenere", "decrypt", "KEY", results[0]) == long_text
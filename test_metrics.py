@@ -0,0 +1,55 @@
+"""
+Тести необов'язкового інструментування (metrics.py).
+"""
+import importlib
+import json
+
+import metrics
+
+vigenere = importlib.import_module("1_1")
+
+
+def test_profile_run_counts_calls_and_restores_functions():
+    original = vigenere.vigenere_encrypt
+    with metrics.profile_run(["1_1"]) as run:
+        assert vigenere.vigenere_encrypt is not original
+        encrypted = vigenere.vigenere_encrypt("Hello, World", "KEY")
+        vigenere.vigenere_encrypt("Hello, World", "KEY")
+    assert vigenere.vigenere_encrypt is original
+    assert not metrics.is_enabled()
+    # Обгортка не змінює результат
+    assert encrypted == original("Hello, World", "KEY")
+
+    entry = run["functions"]["1_1.vigenere_encrypt"]
+    assert (entry["phase"], entry["calls"], entry["chars"]) == ("cipher", 2, 24)
+    assert run["caches"]["1_1.compile_vigenere_plan"]["hits"] >= 1
+    assert run["phases"]["cipher"] > 0
+
+
+def test_nested_calls_are_not_counted_twice(tmp_path):
+    path = tmp_path / "plain.txt"
+    path.write_text("Hello, World")
+    with metrics.profile_run(["1_1"]) as run:
+        vigenere.encrypt_file_streaming(str(path), str(tmp_path / "out.txt"), "KEY")
+    total = run["functions"]["1_1.encrypt_file_streaming"]["seconds"]
+    assert sum(run["phases"].values()) <= total + 1e-3
+
+
+def test_classify_phase():
+    assert metrics.classify_phase("read_plain_text") == "read"
+    assert metrics.classify_phase("write_encrypted_text") == "write"
+    assert metrics.classify_phase("generate_vigenere_table") == "table"
+    assert metrics.classify_phase("compile_playfair_key") == "table"
+    assert metrics.classify_phase("is_square_table") == "validate"
+    assert metrics.classify_phase("is_block_stream") == "validate"
+    assert metrics.classify_phase("vigenere_encrypt") == "cipher"
+
+
+def test_exports(tmp_path):
+    with metrics.profile_run(["1_1"]):
+        vigenere.vigenere_encrypt("abc", "KEY")
+    data = json.loads(metrics.export_json(str(tmp_path / "metrics.json")))
+    assert data["functions"]["1_1.vigenere_encrypt"]["calls"] == 1
+    prometheus = metrics.export_prometheus(str(tmp_path / "metrics.prom"))
+    assert 'cipher_calls_total{module="1_1",function="vigenere_encrypt",phase="cipher"} 1' in prometheus
+    assert (tmp_path / "metrics.prom").read_text() == prometheus
@@ -0,0 +1,96 @@
+"""
+Тести квадграмної таблиці (ngram_fitness.py): побудова, файл у пам'яті, передача
+в робочі процеси та оцінювання текстів.
+"""
+import os
+
+import numpy as np
+import pytest
+
+import ngram_fitness
+
+PLAIN_TEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plaintext.txt")
+
+
+@pytest.fixture(scope="module")
+def plain_text():
+    with open(PLAIN_TEXT_FILE, "r") as file:
+        return file.read()
+
+
+@pytest.fixture
+def corpus(tmp_path, plain_text):
+    path = tmp_path / "corpus.txt"
+    path.write_text(plain_text)
+    return str(path)
+
+
+def test_codes_and_indices():
+    codes = ngram_fitness.text_to_codes("Ab, z!")
+    assert codes.tolist() == [0, 1, 26, 26, 25, 26]
+    letters = ngram_fitness.letters_only(codes)
+    assert letters.tolist() == [0, 1, 25]
+    indices = ngram_fitness.quadgram_indices(np.array([0, 1, 2, 3, 4]))
+    assert indices.tolist() == [((0 * 26 + 1) * 26 + 2) * 26 + 3, ((1 * 26 + 2) * 26 + 3) * 26 + 4]
+
+
+def test_table_is_conditional_distribution(plain_text):
+    table = ngram_fitness.build_quadgram_table(plain_text)
+    assert table.shape == (ngram_fitness.QUADGRAM_COUNT,) and table.dtype == np.float32
+    assert np.isfinite(table).all()
+    # Для контекстів abc з корпусу ймовірності P(d | abc) складаються майже в 1
+    # (n-грами на кінці корпусу не мають продовження)
+    letters = ngram_fitness.letters_only(ngram_fitness.text_to_codes(plain_text)).astype(np.int64)
+    contexts = np.unique((letters[:-3] * 26 + letters[1:-2]) * 26 + letters[2:-1])
+    totals = (10.0 ** table.astype(np.float64)).reshape(-1, 26)[contexts].sum(axis=1)
+    assert (totals <= 1 + 1e-5).all()
+    assert np.median(totals) == pytest.approx(1.0, rel=1e-5)
+
+
+def test_compiled_file_matches_table(corpus, tmp_path, plain_text):
+    table_path = ngram_fitness.compile_quadgram_file(corpus, str(tmp_path / "table.bin"))
+    mapped = ngram_fitness.open_quadgram_file(table_path)
+    np.testing.assert_array_equal(mapped, ngram_fitness.build_quadgram_table(plain_text))
+    assert not mapped.flags.writeable
+    # Відображену таблицю робочі процеси відкривають за шляхом до того самого файлу
+    reference = ngram_fitness.table_reference(mapped)
+    assert reference == table_path
+    assert ngram_fitness.resolve_table(reference) is mapped
+    in_memory = ngram_fitness.build_quadgram_table(plain_text)
+    assert ngram_fitness.table_reference(in_memory) is in_memory
+    assert ngram_fitness.resolve_table(in_memory) is in_memory
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        ngram_fitness.open_quadgram_file(str(path))
+
+
+def test_load_compiles_missing_file(corpus, tmp_path):
+    table_path = str(tmp_path / "cache" / "table.bin")
+    table = ngram_fitness.load_quadgram_table(corpus, table_path)
+    assert os.path.exists(table_path)
+    assert ngram_fitness.table_reference(table) == table_path
+    assert ngram_fitness.load_quadgram_table(corpus, table_path) is table
+
+
+def test_default_table_path_depends_on_corpus(monkeypatch, tmp_path):
+    monkeypatch.delenv(ngram_fitness.TABLE_FILE_ENV, raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    first = ngram_fitness.default_table_path("first.txt")
+    assert first.startswith(str(tmp_path)) and first != ngram_fitness.default_table_path("second.txt")
+    monkeypatch.setenv(ngram_fitness.TABLE_FILE_ENV, "custom.bin")
+    assert ngram_fitness.default_table_path("first.txt") == "custom.bin"
+
+
+def test_scores(plain_text):
+    table = ngram_fitness.build_quadgram_table(plain_text)
+    english = ngram_fitness.score_text("the quick brown fox jumps over the lazy dog", table)
+    shuffled = ngram_fitness.score_text("eht kciuq nworb xof spmuj revo eht yzal god", table)
+    assert english > shuffled
+    assert ngram_fitness.score_text("abc", table) == 0.0
+    letters = ngram_fitness.letters_only(ngram_fitness.text_to_codes(plain_text))[:400].reshape(4, 100)
+    expected = [ngram_fitness.score_letters(row, table) for row in letters]
+    np.testing.assert_allclose(ngram_fitness.score_batch(letters, table), expected, rtol=1e-6)